@@ -1,8 +1,9 @@
-import ccxt
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
-import pandas as pd
 import requests
+from candle_store import get_candles
+from chart_render import figure_template, show_chart
+from candlestick import plot_candles
 
 # ExchangeRate-API를 통해 USD/KRW 환율 가져오기
 def get_usd_to_krw():
@@ -15,20 +16,13 @@ def get_usd_to_krw():
     else:
         raise Exception("Failed to fetch exchange rate")
 
-# 바이낸스 API 연결
-exchange = ccxt.binance()
-
 # 리플(XRP)의 USDT 거래쌍 심볼
 symbol = 'XRP/USDT'
 
-# 일봉(1d) 간격으로 최근 100개의 캔들 데이터 가져오기
+# 일봉(1d) 간격으로 최근 100개의 캔들 데이터 가져오기 (로컬 캔들 저장소, 새 봉만 바이낸스에서 받아옴)
 timeframe = '1d'
 limit = 100
-ohlcv = exchange.fetch_ohlcv(symbol, timeframe, limit=limit)
-
-# 데이터를 DataFrame으로 변환
-df = pd.DataFrame(ohlcv, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
-df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')  # 타임스탬프를 날짜 형식으로 변환
+df = get_candles('binance', symbol, timeframe, limit)  # timestamp는 날짜 형식 (UTC)
 
 # USD/KRW 환율 가져오기
 usd_to_krw = get_usd_to_krw()
@@ -40,16 +34,11 @@ df['low_krw'] = df['low'] * usd_to_krw
 df['close_krw'] = df['close'] * usd_to_krw
 
 # 캔들차트 그리기
-fig, ax = plt.subplots(figsize=(12, 6))
+fig, ax = figure_template('candles', figsize=(12, 6))
 
-# 캔들스틱 데이터 설정
-for i in range(len(df)):
-    color = 'green' if df['close_krw'][i] > df['open_krw'][i] else 'red'  # 상승(초록), 하락(빨강)
-    ax.plot([df['timestamp'][i], df['timestamp'][i]], [df['low_krw'][i], df['high_krw'][i]], color=color, linewidth=1)
-    ax.add_patch(plt.Rectangle((df['timestamp'][i] - pd.Timedelta(hours=12), df['open_krw'][i]), 
-                               pd.Timedelta(hours=24), 
-                               df['close_krw'][i] - df['open_krw'][i], 
-                               facecolor=color, edgecolor='black'))
+# 캔들스틱 그리기 (상승 초록 / 하락 빨강, 24시간 폭 - 몸통/꼬리 각각 collection 하나)
+plot_candles(ax, df['timestamp'], df['open_krw'], df['high_krw'], df['low_krw'], df['close_krw'],
+             width=1.0, up_color='green', down_color='red', flat_color='red', edgecolor='black')
 
 # 그래프 설정
 ax.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m-%d'))
@@ -60,5 +49,5 @@ plt.xticks(rotation=45)
 plt.grid(True)
 plt.tight_layout()
 
-# 그래프 출력
-plt.show()
\ No newline at end of file
+# 그래프 출력 (화면이 없으면 파일로 저장)
+show_chart('binance_xrp_candles', fig)
@@ -1,60 +1,31 @@
-import ccxt
-import requests
 import matplotlib.pyplot as plt
 import pandas as pd
 from datetime import datetime, timedelta
 import os
 import time
-from yahoo_fin import stock_info as si
-from forex_python.converter import CurrencyRates
-
-# ✅ 환율 데이터 가져오기 (forex-python 사용)
-def get_usd_to_krw_history(start_date, end_date):
-    c = CurrencyRates()
-    dates = pd.date_range(start_date, end_date)
-    rates = [c.get_rate('USD', 'KRW', date) for date in dates]
-    df = pd.DataFrame({'timestamp': dates, 'usd_to_krw': rates})
-    df.set_index('timestamp', inplace=True)
-    return df
-
-# ✅ Binance에서 XRP 가격 가져오기 (재시도 로직 추가)
-def get_xrp_binance(retries=3, delay=2):
+from fx_rates import get_usd_to_krw_history  # ✅ 환율은 로컬 저장소에서 (빠진 구간만 한 번에 받음)
+from candle_store import TIMEFRAME_MS
+from market_data import load_candles
+from time_align import align_series, candle_series, daily_series
+from chart_render import figure_template, show_chart
+
+# ✅ Binance에서 XRP 가격 가져오기 (재시도 로직 추가, USDT 기준 / timestamp: UTC 봉 시작)
+def get_xrp_binance(timeframe='1d', limit=100, retries=3, delay=2):
     for i in range(retries):
         try:
-            exchange = ccxt.binance()
             symbol = 'XRP/USDT'
-            timeframe = '1d'
-            limit = 100
-            ohlcv = exchange.fetch_ohlcv(symbol, timeframe, limit=limit)
-            df = pd.DataFrame(ohlcv, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
-            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms').dt.date
-
-            # 환율 데이터 가져오기
-            start_date = df['timestamp'].min() - timedelta(days=1)
-            end_date = df['timestamp'].max() + timedelta(days=1)
-            exchange_rates = get_usd_to_krw_history(start_date, end_date)
-
-            # 날짜별 환율 적용
-            df = df.merge(exchange_rates, left_on='timestamp', right_index=True, how='left')
-            df['close'] = df['close'] * df['usd_to_krw']  # USDT → KRW 변환
-
+            df = load_candles('binance', symbol, timeframe, limit)  # ✅ 로컬 캔들 저장소 (빠진 구간만 받아옴, 1000개 넘으면 페이지로)
             return df[['timestamp', 'close']]
         except Exception as e:
             if i == retries - 1:
                 raise Exception(f"Failed to fetch Binance data after {retries} retries: {e}")
             time.sleep(delay)
 
-# ✅ Upbit에서 XRP 가격 가져오기 (재시도 로직 추가)
-def get_xrp_upbit(retries=3, delay=2):
+# ✅ Upbit에서 XRP 가격 가져오기 (재시도 로직 추가, KRW 기준 / timestamp: UTC 봉 시작)
+def get_xrp_upbit(timeframe='1d', limit=100, retries=3, delay=2):
     for i in range(retries):
         try:
-            url = "https://api.upbit.com/v1/candles/days"
-            params = {"market": "KRW-XRP", "count": 100}
-            response = requests.get(url, params=params)
-            data = response.json()
-            df = pd.DataFrame(data)
-            df['timestamp'] = pd.to_datetime(df['candle_date_time_kst']).dt.date
-            df.rename(columns={'trade_price': 'close'}, inplace=True)
+            df = load_candles('upbit', 'KRW-XRP', timeframe, limit)  # ✅ 로컬 캔들 저장소 (200개 넘으면 페이지로)
             return df[['timestamp', 'close']]
         except Exception as e:
             if i == retries - 1:
@@ -62,43 +33,40 @@ def get_xrp_upbit(retries=3, delay=2):
             time.sleep(delay)
 
 # ✅ 김프(Korea Premium) 계산
-def calculate_korea_premium():
-    binance_data = get_xrp_binance()
-    upbit_data = get_xrp_upbit()
-
-    # ✅ 두 데이터 병합 (timestamp 기준)
-    merged_data = pd.merge(binance_data, upbit_data, on='timestamp', how='inner', suffixes=('_binance', '_upbit'))
-
-    # ✅ 김프 계산
+# 두 거래소 봉(일봉은 UTC 00:00 = KST 09:00 시작)과 환율(KST 날짜)을 한 격자에 정렬
+# fill: 'drop'이면 양쪽 다 있는 봉만, 'interpolate'면 빈 봉을 시간 비례로 채움
+def calculate_korea_premium(fill='drop', timeframe='1d', limit=100):
+    binance_data = get_xrp_binance(timeframe, limit)
+    upbit_data = get_xrp_upbit(timeframe, limit)
+
+    # 환율 데이터 가져오기 (KST 날짜 기준, 앞뒤로 하루씩 여유)
+    kst_dates = (binance_data['timestamp'] + pd.Timedelta(hours=9)).dt.date
+    exchange_rates = get_usd_to_krw_history(kst_dates.min() - timedelta(days=1), kst_dates.max() + timedelta(days=1))
+
+    # ✅ 세 시리즈를 한 번에 정렬 (환율은 휴일 등 빈 날에 직전 값 사용, 분봉/시간봉도 그날 KST 자정 환율)
+    merged_data = align_series({
+        'close_binance': candle_series(binance_data),
+        'close_upbit': candle_series(upbit_data),
+        'usd_to_krw': daily_series(exchange_rates['usd_to_krw']),
+    }, freq=pd.Timedelta(milliseconds=TIMEFRAME_MS[timeframe]), tolerance={'usd_to_krw': pd.Timedelta(days=1)},
+        fill={'close_binance': fill, 'close_upbit': fill, 'usd_to_krw': 'ffill'},
+        anchor=['close_binance', 'close_upbit'], how='intersection')
+    merged_data = merged_data.reset_index()
+    merged_data['timestamp'] = merged_data['timestamp'].dt.tz_localize(None)  # KST 시각
+
+    # ✅ 김프 계산 (Binance USDT → KRW 변환 후)
+    merged_data['close_binance'] = merged_data['close_binance'] * merged_data['usd_to_krw']
     merged_data['premium'] = ((merged_data['close_upbit'] - merged_data['close_binance']) / merged_data['close_binance']) * 100
 
-    return merged_data[['timestamp', 'close_binance', 'close_upbit', 'premium']]
+    return merged_data[['timestamp', 'close_binance', 'close_upbit', 'usd_to_krw', 'premium']]
 
 # ✅ 차트 그리기
 def plot_xrp_charts():
-    binance_data = calculate_korea_premium()
-    upbit_data = get_xrp_upbit()
-
-    # 환율 데이터 가져오기
-    usd_to_krw_data = get_usd_to_krw_history(binance_data['timestamp'].min(), binance_data['timestamp'].max())
-
-    # Binance 데이터와 환율 데이터 병합 (날짜 기준)
-    merged_data = pd.merge(binance_data, usd_to_krw_data, left_on='timestamp', right_index=True, how='outer')
-
-    # Upbit 데이터 병합
-    merged_data = pd.merge(merged_data, upbit_data, on='timestamp', how='outer')
-
-    # NaN 값 보간 (선형 보간)
-    merged_data['close_binance'] = merged_data['close_binance'].interpolate()
-    merged_data['premium'] = merged_data['premium'].interpolate()
-    merged_data['usd_to_krw'] = merged_data['usd_to_krw'].interpolate()
-    merged_data['close_upbit'] = merged_data['close_upbit'].interpolate()
-
-    # 날짜 정렬
-    merged_data.sort_values('timestamp', inplace=True)
+    # 빈 날은 선형 보간 (정렬 엔진에서 한 번에)
+    merged_data = calculate_korea_premium(fill='interpolate')
 
     # 차트 그리기
-    fig, axes = plt.subplots(4, 1, figsize=(12, 16), sharex=True)
+    fig, axes = figure_template('xrp_panels', lambda fig: fig.subplots(4, 1, sharex=True), figsize=(12, 16))
 
     # Binance XRP 가격 차트
     axes[0].plot(merged_data['timestamp'], merged_data['close_binance'], label='Binance XRP/KRW', color='blue', marker='o', linestyle='-')
@@ -131,7 +99,7 @@ def plot_xrp_charts():
 
     plt.xticks(rotation=45)
     plt.tight_layout()
-    plt.show()
+    show_chart('xrp_exchange_comparison', fig)
 
 # ✅ 실행
 plot_xrp_charts()
\ No newline at end of file
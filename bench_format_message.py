@@ -0,0 +1,46 @@
+import re
+import sys
+import time
+from log_corpus import load_messages
+from message_formatter import MessageNormalizer
+
+
+# 🔹 기존 telegram.py의 format_message (비교 기준)
+def legacy_format_message(text, remove_urls=False):
+    if remove_urls:
+        text = re.sub(r'https?:\/\/(?:[\w\-]+\.)+[a-zA-Z]{2,}(?:\s*\.\s*\w+)*(?:\/[\w\-\/\.\?\=\#\&\%\~]*)?', '', text)
+        text = re.sub(r'\s+\.\s+', '.', text)
+    text = re.sub(r'([.!?])', r'\1\n', text)
+    text = re.sub(r'\s+', ' ', text).strip()
+    return text
+
+
+# 🔹 코퍼스 전체를 여러 번 돌려 메시지당 평균 시간(µs) 측정
+def measure(func, texts, repeat=20):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in texts:
+            func(text)
+        best = min(best, time.perf_counter() - start)
+    return best / len(texts) * 1e6
+
+
+def main(log_path="telegram_bot.log"):
+    texts = [message.text for message in load_messages(log_path)]
+    if not texts:
+        print(f"메시지가 없습니다: {log_path}")
+        return
+    print(f"코퍼스: {len(texts)}개 메시지 ({log_path})")
+
+    for remove_urls in (False, True):
+        normalizer = MessageNormalizer(remove_urls=remove_urls)
+        same = sum(normalizer(text) == legacy_format_message(text, remove_urls) for text in texts)
+        legacy_us = measure(lambda text: legacy_format_message(text, remove_urls), texts)
+        new_us = measure(normalizer, texts)
+        print(f"REMOVE_URLS={remove_urls}: 기존 {legacy_us:.2f}µs / 새 정리기 {new_us:.2f}µs "
+              f"(x{legacy_us / new_us:.2f}), 결과 일치 {same}/{len(texts)}")
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
@@ -0,0 +1,264 @@
+import os
+import time
+import ccxt
+import requests
+import numpy as np
+import pandas as pd
+
+# ✅ 캔들 저장 폴더 (거래소_마켓_봉/조각번호.npz, 컬럼별 배열)
+CANDLE_DIR = "candles"
+# 파일 하나에 담는 봉 수 (1분봉이면 약 35일, 일봉이면 전부 한 파일) - 새 봉이 들어오면 마지막 조각만 다시 씀
+CANDLE_CHUNK_BARS = 50_000
+CANDLE_COLUMNS = ["timestamp", "open", "high", "low", "close", "volume"]
+
+# ✅ 봉 길이 (ms)
+TIMEFRAME_MS = {
+    "1m": 60_000,
+    "3m": 180_000,
+    "5m": 300_000,
+    "15m": 900_000,
+    "30m": 1_800_000,
+    "1h": 3_600_000,
+    "4h": 14_400_000,
+    "1d": 86_400_000,
+}
+
+# ✅ 업비트 캔들 API (봉 → 경로), 요청당 최대 200개 (to 이전 봉, 더 오래된 봉은 to를 옮겨 가며 페이지로)
+UPBIT_CANDLE_URL = "https://api.upbit.com/v1/candles/"
+UPBIT_CANDLE_PATHS = {
+    "1m": "minutes/1",
+    "3m": "minutes/3",
+    "5m": "minutes/5",
+    "15m": "minutes/15",
+    "30m": "minutes/30",
+    "1h": "minutes/60",
+    "4h": "minutes/240",
+    "1d": "days",
+}
+UPBIT_MAX_COUNT = 200
+# ✅ 바이낸스는 요청당 최대 1000개 (startTime / endTime으로 페이지)
+BINANCE_KLINES_URL = "https://api.binance.com/api/v3/klines"
+BINANCE_MAX_COUNT = 1000
+
+# 같은 캔들을 이 시간(초) 안에 다시 요청하면 파일/메모리에서만 읽음
+CANDLE_REFRESH_INTERVAL = 60
+
+
+# ✅ 업비트 응답(JSON 목록) → 캔들 표
+def upbit_candles_frame(data):
+    if not data:
+        return empty_candles()
+    df = pd.DataFrame(data)
+    # 봉 시작 시각 (UTC) → ms
+    timestamp = pd.to_datetime(df['candle_date_time_utc']).astype("datetime64[ms]").astype("int64")
+    return pd.DataFrame({
+        "timestamp": timestamp,
+        "open": df['opening_price'],
+        "high": df['high_price'],
+        "low": df['low_price'],
+        "close": df['trade_price'],
+        "volume": df['candle_acc_trade_volume'],
+    }).sort_values("timestamp", ignore_index=True)
+
+
+# ✅ 바이낸스 응답([[시각, 시가, 고가, 저가, 종가, 거래량, ...], ...]) → 캔들 표
+def binance_candles_frame(rows):
+    if not rows:
+        return empty_candles()
+    df = pd.DataFrame([row[:6] for row in rows], columns=CANDLE_COLUMNS)
+    return df.astype({column: "int64" if column == "timestamp" else "float64" for column in CANDLE_COLUMNS})
+
+
+def upbit_candle_request(market, timeframe, count, to_ms=None):
+    params = {"market": market, "count": min(count, UPBIT_MAX_COUNT)}
+    if to_ms is not None:
+        params["to"] = pd.Timestamp(to_ms, unit="ms").strftime("%Y-%m-%dT%H:%M:%SZ")
+    return UPBIT_CANDLE_URL + UPBIT_CANDLE_PATHS[timeframe], params
+
+
+# ✅ [start_ms, end_ms) 구간 업비트 요청 목록 (200개씩, 뒤에서부터 - 페이지끼리 독립이라 동시에 보내도 됨)
+def upbit_candle_pages(market, timeframe, start_ms, end_ms):
+    step = TIMEFRAME_MS[timeframe]
+    now_ms = int(time.time() * 1000)
+    pages = []
+    page_end = end_ms
+    while page_end > start_ms:
+        count = min(UPBIT_MAX_COUNT, -(-(page_end - start_ms) // step))
+        # 아직 안 끝난 구간은 to 없이 (최신 봉부터)
+        pages.append(upbit_candle_request(market, timeframe, count, page_end if page_end <= now_ms else None))
+        page_end -= count * step
+    return pages
+
+
+# ✅ [start_ms, end_ms) 구간 바이낸스 요청 목록 (1000개씩)
+def binance_candle_pages(symbol, timeframe, start_ms, end_ms):
+    step = TIMEFRAME_MS[timeframe] * BINANCE_MAX_COUNT
+    return [
+        {"symbol": symbol.replace("/", ""), "interval": timeframe, "startTime": page_start,
+         "endTime": min(page_start + step, end_ms) - 1, "limit": BINANCE_MAX_COUNT}
+        for page_start in range(start_ms, end_ms, step)
+    ]
+
+
+def concat_candles(frames):
+    frames = [df for df in frames if len(df)]
+    return pd.concat(frames, ignore_index=True) if frames else empty_candles()
+
+
+# ✅ 업비트 캔들 가져오기 ([start_ms, end_ms) 구간, 200개씩 페이지)
+def fetch_upbit_candles(market, timeframe, start_ms, end_ms):
+    frames = []
+    for url, params in upbit_candle_pages(market, timeframe, start_ms, end_ms):
+        response = requests.get(url, params=params)
+        response.raise_for_status()
+        frames.append(upbit_candles_frame(response.json()))
+    return concat_candles(frames)
+
+
+# ✅ 바이낸스 캔들 가져오기 (ccxt, [start_ms, end_ms) 구간, 1000개씩 페이지)
+def fetch_binance_candles(symbol, timeframe, start_ms, end_ms):
+    exchange = ccxt.binance()
+    frames = []
+    for params in binance_candle_pages(symbol, timeframe, start_ms, end_ms):
+        rows = exchange.fetch_ohlcv(symbol, timeframe, since=params["startTime"], limit=BINANCE_MAX_COUNT,
+                                    params={"endTime": params["endTime"]})
+        frames.append(binance_candles_frame(rows))
+    return concat_candles(frames)
+
+
+CANDLE_FETCHERS = {
+    "upbit": fetch_upbit_candles,
+    "binance": fetch_binance_candles,
+}
+
+
+def empty_candles():
+    return pd.DataFrame({column: np.array([], dtype="int64" if column == "timestamp" else "float64")
+                         for column in CANDLE_COLUMNS})
+
+
+# ✅ 로컬 캔들 저장소
+# (거래소, 마켓, 봉)마다 폴더 하나에 CANDLE_CHUNK_BARS 봉 단위 조각 파일(컬럼별 배열: timestamp ms, open, high, low, close, volume)로 저장하고,
+# 빠진 구간(저장된 첫 봉 이전 / 마지막 봉 이후)만 받아 이어 붙인다 (마지막 봉은 진행 중일 수 있어 다시 받아 덮어씀).
+class CandleStore:
+    def __init__(self, directory=CANDLE_DIR, refresh_interval=CANDLE_REFRESH_INTERVAL, chunk_bars=CANDLE_CHUNK_BARS):
+        self.directory = directory
+        self.refresh_interval = refresh_interval
+        self.chunk_bars = chunk_bars
+        self.frames = {}
+        self.refreshed_at = {}
+        # 이미 과거 구간을 요청해 본 시작 시각 (상장 전 구간을 매번 다시 요청하지 않도록)
+        self.backfilled_from = {}
+
+    def path(self, exchange, market, timeframe):
+        name = f"{exchange}_{market}_{timeframe}".replace("/", "-")
+        return os.path.join(self.directory, name)
+
+    def chunk_span(self, timeframe):
+        return TIMEFRAME_MS[timeframe] * self.chunk_bars
+
+    def load(self, exchange, market, timeframe):
+        key = (exchange, market, timeframe)
+        if key in self.frames:
+            return self.frames[key]
+        path = self.path(*key)
+        if os.path.exists(f"{path}.npz") and not os.path.isdir(path):
+            # 예전 형식 (파일 하나) → 조각으로 옮김 (받은 시각은 원래 파일 시각 그대로 - 옮겼다고 새 데이터로 보지 않음)
+            mtime = os.path.getmtime(f"{path}.npz")
+            with np.load(f"{path}.npz") as data:
+                df = pd.DataFrame({column: data[column] for column in CANDLE_COLUMNS})
+            self.save(exchange, market, timeframe, df)
+            for name in os.listdir(path):
+                os.utime(os.path.join(path, name), (mtime, mtime))
+            self.refreshed_at[key] = mtime
+            os.remove(f"{path}.npz")
+            return df
+        # 조각 파일(<조각 번호>.npz)만 - .DS_Store / 쓰다 만 .tmp 등은 건너뜀
+        names = [name for name in os.listdir(path) if name.endswith(".npz") and name[:-4].isdigit()] \
+            if os.path.isdir(path) else []
+        names.sort(key=lambda name: int(name[:-4]))
+        if names:
+            frames = []
+            for name in names:
+                with np.load(os.path.join(path, name)) as data:
+                    frames.append(pd.DataFrame({column: data[column] for column in CANDLE_COLUMNS}))
+            df = pd.concat(frames, ignore_index=True)
+            self.refreshed_at[key] = os.path.getmtime(os.path.join(path, names[-1]))
+        else:
+            df = empty_candles()
+        self.frames[key] = df
+        return df
+
+    # ✅ 저장 (changed_ms: 바뀐 봉 시각 - 그 봉이 든 조각만 다시 씀, 없으면 전부)
+    def save(self, exchange, market, timeframe, df, changed_ms=None):
+        path = self.path(exchange, market, timeframe)
+        os.makedirs(path, exist_ok=True)
+        timestamps = df['timestamp'].to_numpy()
+        chunk_ids = timestamps // self.chunk_span(timeframe)
+        changed = np.unique(chunk_ids if changed_ms is None else np.asarray(changed_ms) // self.chunk_span(timeframe))
+        bounds = np.searchsorted(chunk_ids, np.stack([changed, changed + 1]))
+        for chunk_id, start, end in zip(changed, bounds[0], bounds[1]):
+            chunk_path = os.path.join(path, f"{chunk_id}.npz")
+            tmp_path = f"{chunk_path}.tmp"
+            with open(tmp_path, "wb") as f:
+                np.savez(f, **{column: df[column].to_numpy()[start:end] for column in CANDLE_COLUMNS})
+            os.replace(tmp_path, chunk_path)
+        key = (exchange, market, timeframe)
+        self.frames[key] = df
+        self.refreshed_at[key] = time.time()
+
+    # ✅ 받아야 할 구간 [(start_ms, end_ms), ...] (비어 있으면 저장된 것만으로 충분)
+    # 최근 count개 봉 = 현재 진행 중인 봉까지 count칸
+    def missing_ranges(self, exchange, market, timeframe, count):
+        key = (exchange, market, timeframe)
+        stored = self.load(*key)
+        step = TIMEFRAME_MS[timeframe]
+        now_ms = int(time.time() * 1000)
+        end = now_ms // step * step + step
+        start = end - count * step
+        if not len(stored):
+            self.backfilled_from[key] = start
+            return [(start, end)]
+        ranges = []
+        first, last = int(stored['timestamp'].iloc[0]), int(stored['timestamp'].iloc[-1])
+        if start < first and start < self.backfilled_from.get(key, first):
+            self.backfilled_from[key] = start
+            ranges.append((start, first))
+        if time.time() - self.refreshed_at.get(key, 0.0) >= self.refresh_interval:
+            ranges.append((last, end))
+        return ranges
+
+    # ✅ 받아온 봉을 이어 붙여 저장 (같은 시각은 새 값으로 덮어씀, 바뀐 조각만 다시 씀)
+    def merge(self, exchange, market, timeframe, fetched):
+        stored = self.load(exchange, market, timeframe)
+        df = pd.concat([stored, fetched], ignore_index=True)
+        df = df.drop_duplicates("timestamp", keep="last").sort_values("timestamp", ignore_index=True)
+        df = df.astype({column: "int64" if column == "timestamp" else "float64" for column in CANDLE_COLUMNS})
+        self.save(exchange, market, timeframe, df, changed_ms=fetched['timestamp'].to_numpy(dtype="int64"))
+        return df
+
+    # ✅ 빠진 구간만 받아서 저장
+    def update(self, exchange, market, timeframe, count):
+        ranges = self.missing_ranges(exchange, market, timeframe, count)
+        if not ranges:
+            return self.load(exchange, market, timeframe)
+        fetched = concat_candles([CANDLE_FETCHERS[exchange](market, timeframe, start, end) for start, end in ranges])
+        return self.merge(exchange, market, timeframe, fetched)
+
+    # ✅ 저장된 표 → 최근 count개 (timestamp ms → 날짜 형식)
+    def view(self, df, count):
+        df = df.tail(count).reset_index(drop=True).copy()
+        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+        return df
+
+    # ✅ 최근 count개 봉 (timestamp: UTC 봉 시작 시각)
+    def get(self, exchange, market, timeframe="1d", count=100):
+        return self.view(self.update(exchange, market, timeframe, count), count)
+
+
+# ✅ 프로세스 전체에서 같이 쓰는 저장소
+candle_store = CandleStore()
+
+
+def get_candles(exchange, market, timeframe="1d", count=100):
+    return candle_store.get(exchange, market, timeframe, count)
@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+import matplotlib.dates as mdates
+from matplotlib.colors import to_rgba_array
+from matplotlib.collections import LineCollection, PolyCollection
+
+# ✅ 캔들 색 (양봉 / 음봉 / 보합)
+UP_COLOR = "#66FF66"
+DOWN_COLOR = "#FF6347"
+FLAT_COLOR = "#FFD700"
+BODY_WIDTH = 0.8  # 봉 간격 대비 몸통 폭
+
+
+# 🔹 꼬리 여러 개를 선 하나로 (low → high, 봉 사이는 NaN으로 끊음)
+def _wick_path(x, lows, highs):
+    xs = np.repeat(x, 3)
+    xs[2::3] = np.nan
+    ys = np.column_stack((lows, highs, np.full(len(x), np.nan))).ravel()
+    return np.column_stack((xs, ys))
+
+
+# ✅ 캔들스틱 (몸통은 PolyCollection 하나, 꼬리는 LineCollection 하나 - 봉 수와 상관없이 artist 2개)
+# times: 봉 시각 (Series / DatetimeIndex / datetime64 배열), 가격은 같은 길이의 배열
+# width: 몸통 폭 (일 단위, 없으면 봉 간격 중앙값 x BODY_WIDTH) / wick_color가 없으면 몸통과 같은 색
+def plot_candles(ax, times, opens, highs, lows, closes, width=None, up_color=UP_COLOR, down_color=DOWN_COLOR,
+                 flat_color=FLAT_COLOR, wick_color=None, edgecolor=None, alpha=1.0, linewidth=1):
+    x = mdates.date2num(pd.DatetimeIndex(times).tz_localize(None).to_numpy())
+    opens, highs, lows, closes = (np.asarray(values, dtype="float64") for values in (opens, highs, lows, closes))
+    if width is None:
+        width = float(np.median(np.diff(x))) * BODY_WIDTH if len(x) > 1 else BODY_WIDTH
+
+    # 색은 RGBA로 한 번만 바꾸고 봉마다 0(보합) / 1(양봉) / 2(음봉) 번호로 한 번에 고름
+    kinds = np.sign(closes - opens).astype("int64") % 3
+    palette = to_rgba_array([flat_color, up_color, down_color])
+    colors = palette[kinds]
+
+    left, right = x - width / 2, x + width / 2
+    bodies = np.stack([np.column_stack(corner) for corner in
+                       ((left, opens), (left, closes), (right, closes), (right, opens))], axis=1)
+
+    # 꼬리는 색마다 선 하나 - 봉마다 Path를 만들지 않음
+    if wick_color is not None:
+        groups = [(np.ones(len(x), dtype=bool), wick_color)]
+    else:
+        groups = [(kinds == kind, color) for kind, color in enumerate(palette)]
+    wicks, wick_colors = [], []
+    for mask, color in groups:
+        if mask.any():
+            wicks.append(_wick_path(x[mask], lows[mask], highs[mask]))
+            wick_colors.append(color)
+
+    wick_lines = LineCollection(wicks, colors=wick_colors, linewidths=linewidth)
+    body_polys = PolyCollection(bodies, facecolors=colors, edgecolors=colors if edgecolor is None else edgecolor,
+                                linewidths=linewidth if edgecolor is not None else 0, alpha=alpha)
+    ax.add_collection(wick_lines)
+    ax.add_collection(body_polys)
+
+    # x축은 숫자(날짜)로 두고 날짜 눈금만 붙임 (축에 날짜 단위를 걸면 그릴 때 Path마다 단위 변환을 함)
+    if not ax.xaxis.have_units():
+        locator = mdates.AutoDateLocator()
+        ax.xaxis.set_major_locator(locator)
+        ax.xaxis.set_major_formatter(mdates.AutoDateFormatter(locator))
+    ax.autoscale_view()
+    return body_polys, wick_lines
@@ -0,0 +1,24 @@
+# 🔹 모니터링할 채널 ID
+MONITOR_CHANNELS = [-1001219894832, -1001202540487, -1001363666182, -1001606488817, -1001386345244]
+
+# 🔹 채널 출처 매핑
+CHANNEL_SOURCE_MAP = {
+    -1001219894832: "Upbit",
+    -1001202540487: "Bithumb",
+    -1001363666182: "블록미디어",
+    -1001606488817: "블루밍비트",
+    -1001386345244: "코인니스"
+}
+
+UNKNOWN_SOURCE = "알 수 없음"
+
+# 🔹 필터링 키워드
+FILTER_KEYWORDS = ["코인", "체인", "거래", "입출금", "마켓추가", "거래지원"]
+
+# 🔹 채널별 필터링 키워드 (지정하지 않은 채널은 FILTER_KEYWORDS 사용)
+CHANNEL_FILTER_KEYWORDS = {}
+
+
+# 🔹 채널 ID → 출처 이름
+def source_for(chat_id):
+    return CHANNEL_SOURCE_MAP.get(chat_id, UNKNOWN_SOURCE)
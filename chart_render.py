@@ -0,0 +1,126 @@
+import os
+import sys
+import time
+import runpy
+import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import matplotlib
+import matplotlib.pyplot as plt
+
+# ✅ 화면 없이 파일로 저장할 때 (환경 변수 CHART_OUTPUT_DIR가 있거나 백엔드가 Agg이면)
+OUTPUT_DIR_ENV = "CHART_OUTPUT_DIR"
+FORMATS_ENV = "CHART_FORMATS"
+RENDER_DIR = "charts"
+RENDER_FORMATS = ["png"]
+RENDER_DPI = 100
+
+# ✅ 일괄 렌더링할 차트 스크립트 / 프로세스 수
+REPORT_SCRIPTS = ["final.py", "Piechart.py", "PiechartMon.py", "upbit.py", "Binance.py", "koreaprimium.py",
+                  "Upbitbithumbcomp.py"]
+RENDER_WORKERS = 4
+
+# 프로세스 안에서 다시 쓰는 그림 틀 (key → (fig, axes)) / 이번 프로세스에서 저장한 파일
+_templates = {}
+saved_files = []
+
+
+def headless():
+    return bool(os.getenv(OUTPUT_DIR_ENV)) or matplotlib.get_backend().lower() == "agg"
+
+
+# ✅ 그림 틀 (figsize + 축 배치)
+# 화면 없이 저장할 때는 key별로 한 번만 만들고, 다음부터는 축만 비워서 다시 씀 (GridSpec / subplot 다시 만들지 않음)
+# build(fig) → 축 (없으면 축 하나) / 반환: (fig, 축), 첫 번째 축이 plt 현재 축
+def figure_template(key, build=None, figsize=None):
+    if headless() and key in _templates:
+        fig, axes = _templates[key]
+        for ax in fig.axes:
+            ax.cla()
+    else:
+        fig = plt.figure(figsize=figsize)
+        axes = build(fig) if build else fig.add_subplot()
+        if headless():
+            _templates[key] = (fig, axes)
+    plt.figure(fig.number)
+    plt.sca(fig.axes[0])
+    return fig, axes
+
+
+# ✅ 차트 출력 (화면이 있으면 plt.show(), 없으면 출력 폴더에 name.png / name.svg 저장)
+def show_chart(name, fig=None):
+    fig = fig or plt.gcf()
+    if not headless():
+        plt.show()
+        return []
+    output_dir = os.getenv(OUTPUT_DIR_ENV) or RENDER_DIR
+    formats = (os.getenv(FORMATS_ENV) or ",".join(RENDER_FORMATS)).split(",")
+    os.makedirs(output_dir, exist_ok=True)
+    paths = []
+    for fmt in formats:
+        path = os.path.join(output_dir, f"{name}.{fmt}")
+        fig.savefig(path, format=fmt, dpi=RENDER_DPI)
+        paths.append(path)
+    saved_files.extend(paths)
+    # 그림 틀은 다음 차트에서 다시 쓰므로 닫지 않음
+    if not any(fig is template for template, _ in _templates.values()):
+        plt.close(fig)
+    print(f"🖼️ {', '.join(paths)}")
+    return paths
+
+
+def _init_worker(output_dir, formats):
+    os.environ[OUTPUT_DIR_ENV] = output_dir
+    os.environ[FORMATS_ENV] = ",".join(formats)
+    matplotlib.use("Agg")
+
+
+# 🔹 워커 프로세스에서 스크립트 하나 실행 (스크립트 폴더 기준 상대 경로)
+def render_script(script):
+    # 스크립트는 chart_render를 모듈로 import하므로 그쪽 목록을 읽음 (__main__ 쪽 목록과 다름)
+    import chart_render
+    script = os.path.abspath(script)
+    os.chdir(os.path.dirname(script))
+    if os.path.dirname(script) not in sys.path:
+        sys.path.insert(0, os.path.dirname(script))
+    del chart_render.saved_files[:]
+    start = time.perf_counter()
+    try:
+        runpy.run_path(script, run_name="__main__")
+        error = None
+    except BaseException as e:
+        error = repr(e)
+    return os.path.basename(script), list(chart_render.saved_files), time.perf_counter() - start, error
+
+
+# ✅ 여러 스크립트를 프로세스 풀에서 동시에 렌더링
+def render_all(scripts=REPORT_SCRIPTS, output_dir=RENDER_DIR, formats=RENDER_FORMATS, workers=RENDER_WORKERS):
+    output_dir = os.path.abspath(output_dir)
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=min(workers, len(scripts)) or 1, mp_context=context,
+                             initializer=_init_worker, initargs=(output_dir, list(formats))) as pool:
+        return list(pool.map(render_script, scripts))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="차트 스크립트를 화면 없이 파일로 일괄 렌더링")
+    parser.add_argument("scripts", nargs="*", default=REPORT_SCRIPTS, help="렌더링할 스크립트 (기본: 전체 리포트)")
+    parser.add_argument("--out", default=RENDER_DIR, help="출력 폴더")
+    parser.add_argument("--format", nargs="+", default=RENDER_FORMATS, choices=["png", "svg", "pdf"], help="파일 형식")
+    parser.add_argument("--workers", type=int, default=RENDER_WORKERS, help="프로세스 수")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    results = render_all(args.scripts, args.out, args.format, args.workers)
+    for script, files, elapsed, error in results:
+        if error:
+            print(f"❌ {script} ({elapsed:.2f}초): {error}")
+        else:
+            print(f"✅ {script} ({elapsed:.2f}초): {len(files)}개 파일")
+    print(f"전체 {time.perf_counter() - start:.2f}초 → {os.path.abspath(args.out)}")
+    if any(error for *_, error in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+import re
+import time
+import hashlib
+import logging
+from collections import deque, namedtuple
+
+# 🔹 지문 계산 전에 지울 부분 (URL, 문장부호/공백/이모지 등)
+URL_REGEX = re.compile(r'https?://\S+')
+NON_WORD_REGEX = re.compile(r'[\W_]+')
+
+DedupResult = namedtuple("DedupResult", ["duplicate", "kind", "original_source", "distance"])
+
+
+# 🔹 지문용 텍스트 정규화
+def normalize_for_fingerprint(text):
+    text = URL_REGEX.sub("", text.lower())
+    return NON_WORD_REGEX.sub("", text)
+
+
+# 🔹 64비트 SimHash (문자 3-gram 기준, 한국어는 띄어쓰기가 달라도 비슷한 값이 나옴)
+def simhash(text, ngram=3):
+    shingles = {text[i:i + ngram] for i in range(max(len(text) - ngram + 1, 1))}
+    # 각 3-gram 해시를 비트 문자열로 펼쳐서 비트 위치별 1의 개수를 셈 (다수결)
+    bits = [format(int.from_bytes(hashlib.blake2b(s.encode(), digest_size=8).digest(), "big"), "064b") for s in shingles]
+    half = len(bits) / 2
+    return int("".join("1" if column.count("1") > half else "0" for column in zip(*bits)), 2)
+
+
+class _Entry:
+    __slots__ = ("created_at", "exact", "fingerprint", "sources")
+
+    def __init__(self, created_at, exact, fingerprint, source):
+        self.created_at = created_at
+        self.exact = exact
+        self.fingerprint = fingerprint
+        self.sources = [source]
+
+
+# 🔹 채널 간 중복 공지 제거기
+# 정확히 같은 내용은 해시로, 거의 같은 내용은 SimHash 해밍 거리로 찾는다.
+# SimHash는 (max_distance + 1)개 구간으로 나눠 색인하므로 전체를 비교하지 않는다.
+# (해밍 거리가 max_distance 이하이면 적어도 한 구간은 완전히 같음)
+# window 초가 지난 공지는 색인에서 빠진다.
+class NoticeDeduplicator:
+    def __init__(self, window=600, max_distance=3, clock=time.monotonic):
+        self.window = window
+        self.max_distance = max_distance
+        self.clock = clock
+        self.bands = max_distance + 1
+        self.band_bits = 64 // self.bands
+        self._entries = deque()
+        self._exact = {}
+        self._band_index = {}
+        self.duplicates = 0
+
+    def _band_keys(self, fingerprint):
+        mask = (1 << self.band_bits) - 1
+        return [(band, fingerprint >> (band * self.band_bits) & mask) for band in range(self.bands)]
+
+    def _evict(self, now):
+        while self._entries and now - self._entries[0].created_at > self.window:
+            entry = self._entries.popleft()
+            if self._exact.get(entry.exact) is entry:
+                del self._exact[entry.exact]
+            for key in self._band_keys(entry.fingerprint):
+                bucket = self._band_index.get(key)
+                if bucket is not None:
+                    bucket.discard(entry)
+                    if not bucket:
+                        del self._band_index[key]
+
+    def _find_near(self, fingerprint):
+        best, best_distance = None, None
+        for key in self._band_keys(fingerprint):
+            for entry in self._band_index.get(key, ()):
+                distance = bin(entry.fingerprint ^ fingerprint).count("1")
+                if distance <= self.max_distance and (best is None or distance < best_distance):
+                    best, best_distance = entry, distance
+        return best, best_distance
+
+    # 🔹 중복 검사 + 새 공지는 색인에 등록
+    # 중복이면 처음 받은 공지에 출처만 합쳐 기록하고 duplicate=True를 돌려준다.
+    def check(self, text, source=None):
+        now = self.clock()
+        self._evict(now)
+
+        normalized = normalize_for_fingerprint(text)
+        exact = hashlib.sha1(normalized.encode()).hexdigest()
+
+        entry = self._exact.get(exact)
+        if entry is not None:
+            return self._merge(entry, "exact", 0, source)
+
+        fingerprint = simhash(normalized)
+        entry, distance = self._find_near(fingerprint)
+        if entry is not None:
+            return self._merge(entry, "near", distance, source)
+
+        entry = _Entry(now, exact, fingerprint, source)
+        self._entries.append(entry)
+        self._exact[exact] = entry
+        for key in self._band_keys(fingerprint):
+            self._band_index.setdefault(key, set()).add(entry)
+        return DedupResult(False, None, None, None)
+
+    def _merge(self, entry, kind, distance, source):
+        self.duplicates += 1
+        if source not in entry.sources:
+            entry.sources.append(source)
+        logging.info(f"♻️ 중복 공지 ({kind}, 거리 {distance}) - 최초 출처: {entry.sources[0]}, 전체 출처: {entry.sources}")
+        return DedupResult(True, kind, entry.sources[0], distance)
+
+    def __len__(self):
+        return len(self._entries)
@@ -2,59 +2,56 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import matplotlib.ticker as mticker
 import matplotlib.gridspec as gridspec
-
-# Read CSV files
-df_upbit = pd.read_csv('upbit-trading-volume-1-year.csv')
-df_bithumb = pd.read_csv('bithumb-trading-volume-1-year.csv')
-
-# Convert date format
-df_upbit['snapped_at'] = pd.to_datetime(df_upbit['snapped_at'])
-df_bithumb['snapped_at'] = pd.to_datetime(df_bithumb['snapped_at'])
-
-# Define the latest date and calculate monthly start dates
-latest_date = df_upbit['snapped_at'].max()
+from volume_csv import load_volume_csv
+from volume_periods import volume_matrix, period_stats
+from volume_share import plot_volume_lines, plot_share_pie
+from chart_render import figure_template, show_chart
+
+# Exchanges to compare (name -> CSV, all volumes in the same currency)
+# Add more exchanges here, e.g. 'Coinone': 'coinone-trading-volume-1-year.csv'
+EXCHANGE_FILES = {
+    'Upbit': 'upbit-trading-volume-1-year.csv',
+    'Bithumb': 'bithumb-trading-volume-1-year.csv',
+}
+
+# Read CSV files (fixed-format timestamps, cached as .npz next to the CSV after the first run)
+frames = {name: load_volume_csv(path) for name, path in EXCHANGE_FILES.items()}
+
+# Align all exchanges on one time index (time x exchange matrix)
+volumes = volume_matrix(frames)
+index, names, matrix = volumes.index, list(volumes.columns), volumes.to_numpy()
+
+# Define the latest date and the start of the 12 monthly periods
+latest_date = index.max()
 one_year_ago = latest_date - pd.DateOffset(years=1)
 
-# Generate a list of month start dates
-month_starts = [one_year_ago + pd.DateOffset(months=i) for i in range(12)]
-month_labels = [date.strftime('%b %Y') for date in month_starts]  # Format as "Jan 2024", etc.
+# Average trading volume per month, counted from one year ago (one pass over all exchanges)
+monthly = period_stats(volumes, 'month', anchor=one_year_ago, count=12)
+month_labels = [date.strftime('%b %Y') for date in monthly.index]  # Format as "Jan 2024", etc.
 
-# Store average monthly trading volume
-upbit_avg_months = []
-bithumb_avg_months = []
-
-# Calculate average trading volume per month
-for i in range(12):
-    start_date = month_starts[i]
-    end_date = start_date + pd.DateOffset(months=1)
-
-    df_upbit_month = df_upbit[(df_upbit['snapped_at'] >= start_date) & (df_upbit['snapped_at'] < end_date)]
-    df_bithumb_month = df_bithumb[(df_bithumb['snapped_at'] >= start_date) & (df_bithumb['snapped_at'] < end_date)]
+# Custom colors
+palette = {'Upbit': '#e74c3c', 'Bithumb': '#3498db'}  # Upbit (Red), Bithumb (Blue)
 
-    upbit_avg = df_upbit_month['volume'].mean()
-    bithumb_avg = df_bithumb_month['volume'].mean()
 
-    upbit_avg_months.append(upbit_avg)
-    bithumb_avg_months.append(bithumb_avg)
+# Create a figure with GridSpec (1 row for line chart, 3 rows for pie charts)
+def build_report_layout(fig):
+    gs = gridspec.GridSpec(5, 4, figure=fig, height_ratios=[1.8, 1, 1, 1, 0.3])  # More balanced spacing
+    line_ax = fig.add_subplot(gs[0, :])  # Spanning all columns
+    pie_axes = [fig.add_subplot(gs[(i // 4) + 1, i % 4]) for i in range(12)]  # 3 rows, 4 columns
+    desc_ax = fig.add_subplot(gs[4, :])  # Last row for description
+    return line_ax, pie_axes, desc_ax
 
-# Custom colors
-colors = ['#e74c3c', '#3498db']  # Upbit (Red), Bithumb (Blue)
 
-# Create a figure with GridSpec (1 row for line chart, 3 rows for pie charts)
-fig = plt.figure(figsize=(18, 18))
-gs = gridspec.GridSpec(5, 4, figure=fig, height_ratios=[1.8, 1, 1, 1, 0.3])  # More balanced spacing
+# Layout is built once and reused when rendering headless
+fig, (ax1, pie_axes, ax_desc) = figure_template('volume_report', build_report_layout, figsize=(18, 18))
 
 # --- Line Chart (First Row) ---
-ax1 = fig.add_subplot(gs[0, :])  # Spanning all columns
 
-# Upbit Trading Volume (Red, Circle Markers)
-ax1.plot(df_upbit['snapped_at'], df_upbit['volume'], marker='o', markersize=3, linestyle='-', linewidth=1.5, alpha=0.8, color=colors[0], label='Upbit')
-
-# Bithumb Trading Volume (Blue, Square Markers)
-ax1.plot(df_bithumb['snapped_at'], df_bithumb['volume'], marker='s', markersize=3, linestyle='-', linewidth=1.5, alpha=0.8, color=colors[1], label='Bithumb')
+# Trading Volume (one line per exchange)
+plot_volume_lines(ax1, index, names, matrix, palette)
 
 # Chart Title & Labels
-ax1.set_title('Upbit vs Bithumb 1-Year Trading Volume', fontsize=18, fontweight='bold', pad=15)
+ax1.set_title(f"{' vs '.join(names)} 1-Year Trading Volume", fontsize=18, fontweight='bold', pad=15)
 ax1.set_xlabel('Date', fontsize=13)
 ax1.set_ylabel('Trading Volume (Billion $)', fontsize=13)
 
@@ -71,16 +68,10 @@ ax1.grid(True, linestyle='--', alpha=0.6)
 ax1.legend(fontsize=12, loc='upper left', frameon=True, edgecolor='gray')
 
 # --- Pie Charts (3x4 Grid) ---
-for i in range(12):
-    ax = fig.add_subplot(gs[(i // 4) + 1, i % 4])  # 3 rows, 4 columns
-    sizes = [upbit_avg_months[i], bithumb_avg_months[i]]
-    explode = [0.05 if upbit_avg_months[i] > bithumb_avg_months[i] else 0, 0.05 if bithumb_avg_months[i] > upbit_avg_months[i] else 0]
-
-    ax.pie(sizes, labels=['Upbit', 'Bithumb'], autopct='%1.1f%%', colors=colors, startangle=140, explode=explode, shadow=True, wedgeprops={'edgecolor': 'black'})
-    ax.set_title(month_labels[i], fontsize=13, fontweight='bold')
+for i, ax in enumerate(pie_axes):
+    plot_share_pie(ax, monthly['mean'].iloc[i].to_numpy(), names, month_labels[i], palette)
 
 # --- Explanation Text Below Pie Charts ---
-ax_desc = fig.add_subplot(gs[4, :])  # Last row for description
 ax_desc.axis("off")  # Hide axis
 
 explanation = (
@@ -93,6 +84,6 @@ ax_desc.text(0.5, 0.5, explanation, ha="center", va="center", fontsize=13, wrap=
 # Adjust layout
 plt.tight_layout(rect=[0, 0.03, 1, 0.95])
 
-# Show combined figure
-plt.show()
+# Show combined figure (saved to CHART_OUTPUT_DIR when headless)
+show_chart('volume_report', fig)
   
\ No newline at end of file
@@ -0,0 +1,144 @@
+import os
+import time
+import pandas as pd
+from datetime import date, datetime, timedelta
+from yahoo_fin import stock_info as si
+
+# ✅ USD/KRW 환율 저장 파일 (날짜, usd_to_krw - usd_to_krw_100_days.csv와 같은 형식)
+FX_RATES_PATH = "usd_to_krw.csv"
+# 처음 만들 때 가져올 기존 파일 (change.py가 만들던 100일치)
+FX_SEED_PATH = "usd_to_krw_100_days.csv"
+FX_SYMBOL = "USDKRW=X"
+# ✅ Yahoo 차트 API (yahoo_fin이 내부에서 쓰는 것과 같음, 비동기 수집용)
+YAHOO_CHART_URL = f"https://query1.finance.yahoo.com/v8/finance/chart/{FX_SYMBOL}"
+# 마지막 날 환율은 장중 값일 수 있으므로, 이 시간(초)이 지나면 마지막 날부터 다시 받음
+FX_REFRESH_INTERVAL = 3600
+
+
+def to_date(value):
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return pd.Timestamp(value).date()
+
+
+# ✅ 기간 환율을 한 번에 가져오기 (Yahoo Finance, 거래일만 있음)
+def fetch_usd_to_krw_range(start_date, end_date):
+    try:
+        # end_date는 포함하지 않으므로 하루 더함
+        df = si.get_data(FX_SYMBOL, start_date=start_date, end_date=end_date + timedelta(days=1))
+    except KeyError:
+        # 주말/휴일만 있는 구간은 응답에 timestamp가 없음
+        return pd.Series(dtype="float64", name="usd_to_krw", index=pd.DatetimeIndex([]))
+    except Exception as e:
+        raise Exception(f"Failed to fetch historical exchange rates: {e}")
+    rates = df["close"].dropna()
+    rates.index = pd.to_datetime(rates.index).normalize()
+    rates.name = "usd_to_krw"
+    return rates
+
+
+def yahoo_chart_request(start_date, end_date):
+    start = pd.Timestamp(start_date).tz_localize("UTC")
+    end = pd.Timestamp(end_date + timedelta(days=1)).tz_localize("UTC")
+    return YAHOO_CHART_URL, {"period1": int(start.timestamp()), "period2": int(end.timestamp()), "interval": "1d"}
+
+
+# ✅ Yahoo 차트 응답 → 날짜별 종가
+def yahoo_chart_rates(data):
+    result = data["chart"]["result"][0]
+    if "timestamp" not in result:
+        return pd.Series(dtype="float64", name="usd_to_krw", index=pd.DatetimeIndex([]))
+    index = pd.to_datetime(result["timestamp"], unit="s").normalize()
+    rates = pd.Series(result["indicators"]["quote"][0]["close"], index=index, dtype="float64", name="usd_to_krw")
+    return rates.dropna()
+
+
+# ✅ USD/KRW 환율 저장소
+# 저장된 구간 밖(앞/뒤)만 한 번의 요청으로 받아 파일에 이어 붙이고, 나머지는 파일에서 읽는다.
+class FxRateStore:
+    def __init__(self, path=FX_RATES_PATH, seed_path=FX_SEED_PATH, refresh_interval=FX_REFRESH_INTERVAL):
+        self.path = path
+        self.seed_path = seed_path
+        self.refresh_interval = refresh_interval
+        self.rates = None
+        self.refreshed_at = 0.0
+
+    def load(self):
+        for path in (self.path, self.seed_path):
+            if path and os.path.exists(path):
+                df = pd.read_csv(path, index_col=0, parse_dates=True)
+                self.rates = df["usd_to_krw"].astype("float64").sort_index()
+                self.rates.index.name = None
+                self.refreshed_at = os.path.getmtime(path) if path == self.path else 0.0
+                return
+        self.rates = pd.Series(dtype="float64", name="usd_to_krw", index=pd.DatetimeIndex([]))
+
+    def save(self):
+        tmp_path = f"{self.path}.tmp"
+        self.rates.to_frame("usd_to_krw").to_csv(tmp_path, index=True, date_format="%Y-%m-%d")
+        os.replace(tmp_path, self.path)
+        self.refreshed_at = time.time()
+
+    # ✅ 받아야 할 구간 [(시작일, 종료일), ...]
+    def missing_ranges(self, start_date, end_date):
+        if self.rates is None:
+            self.load()
+        start_date, end_date = to_date(start_date), to_date(end_date)
+        if self.rates.empty:
+            return [(start_date, end_date)]
+        missing = []
+        first, last = self.rates.index[0].date(), self.rates.index[-1].date()
+        if start_date < first:
+            missing.append((start_date, first - timedelta(days=1)))
+        # 마지막 날은 장중 값일 수 있으므로 마지막 날부터 다시 받음 (오늘 값이 이미 있어도 refresh_interval마다)
+        if end_date >= last and time.time() - self.refreshed_at > self.refresh_interval:
+            missing.append((last, end_date))
+        return missing
+
+    # ✅ 받아온 환율을 합쳐 저장
+    def merge(self, fetched):
+        rates = pd.concat([self.rates] + list(fetched))
+        self.rates = rates[~rates.index.duplicated(keep="last")].sort_index()
+        self.save()
+
+    # ✅ 빠진 구간만 받아서 저장
+    def update(self, start_date, end_date):
+        missing = self.missing_ranges(start_date, end_date)
+        if missing:
+            self.merge(fetch_usd_to_krw_range(fetch_start, fetch_end) for fetch_start, fetch_end in missing)
+
+    # ✅ 저장된 환율 → 기간 환율 표
+    def view(self, start_date, end_date):
+        start_date, end_date = to_date(start_date), to_date(end_date)
+        days = pd.date_range(start_date, end_date)
+        # 시작일 이전의 마지막 거래일도 포함해야 앞쪽 주말이 채워짐
+        rates = self.rates.reindex(self.rates.index.union(days)).ffill().bfill().reindex(days)
+        return pd.DataFrame({"usd_to_krw": rates.to_numpy()}, index=days.date)
+
+    # ✅ 기간 환율 (매일 한 줄, 주말/휴일은 직전 거래일 환율)
+    # index: datetime.date, column: usd_to_krw
+    def history(self, start_date, end_date):
+        self.update(start_date, end_date)
+        return self.view(start_date, end_date)
+
+    # ✅ 가장 최근 환율
+    def latest(self):
+        today = date.today()
+        self.update(today - timedelta(days=7), today)
+        if self.rates.empty:
+            raise Exception("Failed to fetch exchange rate: no data")
+        return float(self.rates.iloc[-1])
+
+
+# ✅ 프로세스 전체에서 같이 쓰는 저장소
+fx_store = FxRateStore()
+
+
+def get_usd_to_krw_history(start_date, end_date):
+    return fx_store.history(start_date, end_date)
+
+
+def get_usd_to_krw():
+    return fx_store.latest()
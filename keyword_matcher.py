@@ -0,0 +1,96 @@
+from collections import deque
+
+
+# 🔹 키워드 정규화 (소문자 + 공백 제거)
+def normalize_keyword(keyword):
+    return "".join(keyword.lower().split())
+
+
+# 🔹 Aho-Corasick 키워드 매처
+# 시작할 때 한 번만 오토마톤을 만들고, 메시지마다 텍스트 길이에 비례하는 한 번의 스캔으로 검사한다.
+# 기존 필터와 같이 대소문자와 공백을 무시하고, 매칭 위치는 원문 기준 인덱스로 돌려준다.
+class KeywordMatcher:
+    def __init__(self, keywords):
+        # 중복 키워드 제거 (순서 유지)
+        self.keywords = [k for k in dict.fromkeys(normalize_keyword(k) for k in keywords) if k]
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]
+        for keyword in self.keywords:
+            self._add(keyword)
+        self._build()
+
+    def _add(self, keyword):
+        state = 0
+        for ch in keyword:
+            next_state = self._goto[state].get(ch)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+                self._goto[state][ch] = next_state
+            state = next_state
+        self._output[state].append(keyword)
+
+    def _build(self):
+        # BFS로 실패 링크 계산 (루트의 자식은 실패 링크가 루트)
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(ch, 0)
+                # 실패 링크 쪽 출력까지 합쳐서 스캔 중 추가 탐색이 없게 함
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def _scan(self, text):
+        goto, fail, output = self._goto, self._fail, self._output
+        state = 0
+        # positions[k] = 정규화된 k번째 문자의 원문 인덱스
+        positions = []
+        for index, raw in enumerate(text):
+            if raw.isspace():
+                continue
+            for ch in raw.lower():
+                positions.append(index)
+                while state and ch not in goto[state]:
+                    state = fail[state]
+                state = goto[state].get(ch, 0)
+                for keyword in output[state]:
+                    start = positions[len(positions) - len(keyword)]
+                    yield keyword, start, index + 1
+
+    # 🔹 매칭된 키워드와 위치 목록 [(keyword, start, end), ...]
+    def find(self, text):
+        return list(self._scan(text))
+
+    # 🔹 하나라도 매칭되면 바로 True
+    def matches(self, text):
+        for _ in self._scan(text):
+            return True
+        return False
+
+    # 🔹 매칭된 키워드 (중복 없이, 처음 나온 순서)
+    def matched_keywords(self, text):
+        return list(dict.fromkeys(keyword for keyword, _, _ in self._scan(text)))
+
+
+# 🔹 채널별 키워드 매처
+# 채널에 따로 지정된 키워드가 없으면 기본 키워드 매처를 사용한다.
+class ChannelKeywordMatcher:
+    def __init__(self, default_keywords, channel_keywords=None):
+        self.default = KeywordMatcher(default_keywords)
+        self.channels = {chat_id: KeywordMatcher(keywords) for chat_id, keywords in (channel_keywords or {}).items()}
+
+    def for_channel(self, chat_id):
+        return self.channels.get(chat_id, self.default)
+
+    def find(self, chat_id, text):
+        return self.for_channel(chat_id).find(text)
+
+    def matches(self, chat_id, text):
+        return self.for_channel(chat_id).matches(text)
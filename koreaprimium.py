@@ -1,50 +1,31 @@
-import ccxt
-import requests
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
 import pandas as pd
 from datetime import datetime
-import os
 import time
-
-# ✅ USD → KRW 환율 가져오기
-def get_usd_to_krw():
-    api_key = os.getenv("EXCHANGE_RATE_API_KEY")  # 환경 변수에서 API 키 가져오기
-    url = f"https://v6.exchangerate-api.com/v6/{api_key}/latest/USD"
-    try:
-        response = requests.get(url)
-        response.raise_for_status()
-        data = response.json()
-        return data['conversion_rates']['KRW']
-    except Exception as e:
-        raise Exception(f"Failed to fetch exchange rate: {e}")
+from candle_store import TIMEFRAME_MS
+from market_data import load_candles, load_premium_inputs
+from time_align import align_series, candle_series, daily_series
+from chart_render import figure_template, show_chart
 
 # ✅ Binance에서 XRP 가격 가져오기 (USDT 기준)
-def get_xrp_binance():
-    exchange = ccxt.binance()
+# timeframe: '1m', '5m', '1h', '1d' 등 (candle_store.TIMEFRAME_MS) / limit이 한 번 요청 한도보다 크면 페이지로 나눠 동시에 받음
+def get_xrp_binance(timeframe='1d', limit=100):
     symbol = 'XRP/USDT'
-    timeframe = '1d'
-    limit = 100
     try:
-        ohlcv = exchange.fetch_ohlcv(symbol, timeframe, limit=limit)
-        df = pd.DataFrame(ohlcv, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
-        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+        df = load_candles('binance', symbol, timeframe, limit)  # ✅ 로컬 캔들 저장소 (빠진 구간만 받아옴)
         df['timestamp'] = df['timestamp'] + pd.Timedelta(hours=9)  # UTC → KST 변환
         return df
     except Exception as e:
         raise Exception(f"Failed to fetch Binance data: {e}")
 
 # ✅ Upbit에서 XRP 가격 가져오기 (KRW 기준)
-def get_xrp_upbit(retries=3, delay=2):
+def get_xrp_upbit(timeframe='1d', limit=100, retries=3, delay=2):
     for i in range(retries):
         try:
-            url = "https://api.upbit.com/v1/candles/days"
-            params = {"market": "KRW-XRP", "count": 100}
-            response = requests.get(url, params=params)
-            data = response.json()
-            df = pd.DataFrame(data)
-            df['timestamp'] = pd.to_datetime(df['candle_date_time_kst'])
-            df.rename(columns={'trade_price': 'close'}, inplace=True)  # 'trade_price' → 'close' 변경
+            df = load_candles('upbit', 'KRW-XRP', timeframe, limit)  # ✅ 로컬 캔들 저장소 (빠진 구간만 받아옴)
+            df['timestamp'] = df['timestamp'] + pd.Timedelta(hours=9)  # UTC → KST (candle_date_time_kst와 같음)
+            df.rename(columns={'volume': 'candle_acc_trade_volume'}, inplace=True)
             return df[['timestamp', 'open', 'high', 'low', 'close', 'candle_acc_trade_volume']]
         except Exception as e:
             if i == retries - 1:
@@ -52,20 +33,25 @@ def get_xrp_upbit(retries=3, delay=2):
             time.sleep(delay)
 
 # ✅ 김프(Korea Premium) 계산
-def calculate_korea_premium():
-    usd_to_krw = get_usd_to_krw()
-    binance_data = get_xrp_binance()[['timestamp', 'close']]
-    upbit_data = get_xrp_upbit()[['timestamp', 'close']]
-
-    # ✅ timestamp를 날짜 단위로 변환
-    binance_data['timestamp'] = binance_data['timestamp'].dt.date
-    upbit_data['timestamp'] = upbit_data['timestamp'].dt.date
+def calculate_korea_premium(timeframe='1d', limit=100):
+    # ✅ 바이낸스 / 업비트 / 환율을 동시에 가져오기 (market_data, 걸리는 시간 = 가장 느린 소스)
+    binance_data, upbit_data, usd_to_krw, elapsed = load_premium_inputs('XRP/USDT', 'KRW-XRP', timeframe, limit)
+    print(f"데이터 수집: {elapsed:.2f}초")
 
-    # ✅ 두 데이터 병합 (timestamp 기준)
-    merged_data = pd.merge(binance_data, upbit_data, on='timestamp', how='inner', suffixes=('_binance', '_upbit'))
+    # ✅ 두 거래소 종가 + 날짜별 환율을 한 격자(봉 시작 시각, 일봉은 UTC 00:00 = KST 09:00)에 정렬
+    # 환율 날짜는 KST 날짜로 보고, 휴일 등 빈 날은 직전 환율 사용 (분봉/시간봉도 그날 KST 자정 환율, 허용 오차 1일)
+    merged_data = align_series({
+        'close_binance': candle_series(binance_data),
+        'close_upbit': candle_series(upbit_data),
+        'usd_to_krw': daily_series(usd_to_krw['usd_to_krw']),
+    }, freq=pd.Timedelta(milliseconds=TIMEFRAME_MS[timeframe]), tolerance={'usd_to_krw': pd.Timedelta(days=1)},
+        fill={'close_binance': 'drop', 'close_upbit': 'drop', 'usd_to_krw': 'ffill'},
+        anchor=['close_binance', 'close_upbit'], how='intersection')
+    merged_data = merged_data.reset_index()
+    merged_data['timestamp'] = merged_data['timestamp'].dt.tz_localize(None)  # KST 시각
 
     # ✅ Binance 가격을 원화로 변환 후 김프 계산
-    merged_data['binance_price_krw'] = merged_data['close_binance'] * usd_to_krw
+    merged_data['binance_price_krw'] = merged_data['close_binance'] * merged_data['usd_to_krw']
     merged_data['premium'] = ((merged_data['close_upbit'] - merged_data['binance_price_krw']) / merged_data['binance_price_krw']) * 100
 
     return merged_data[['timestamp', 'premium']]
@@ -74,7 +60,7 @@ def calculate_korea_premium():
 def plot_binance_xrp_candles():
     binance_data = get_xrp_binance()
 
-    plt.figure(figsize=(12, 6))
+    figure_template('line_chart', figsize=(12, 6))
     plt.plot(binance_data['timestamp'], binance_data['close'], label='Binance XRP/USDT', color='blue', marker='o', linestyle='-')
     plt.xlabel("Date")
     plt.ylabel("Price (USDT)")
@@ -84,13 +70,13 @@ def plot_binance_xrp_candles():
     plt.xticks(rotation=45)
     plt.gca().xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m-%d'))
     plt.gca().xaxis.set_major_locator(mdates.DayLocator(interval=5))
-    plt.show()
+    show_chart('binance_xrp')
 
 # ✅ Upbit XRP 캔들차트 그리기
 def plot_upbit_xrp_candles():
     upbit_data = get_xrp_upbit()
 
-    plt.figure(figsize=(12, 6))
+    figure_template('line_chart', figsize=(12, 6))
     plt.plot(upbit_data['timestamp'], upbit_data['close'], label='Upbit XRP/KRW', color='red', marker='o', linestyle='-')
     plt.xlabel("Date")
     plt.ylabel("Price (KRW)")
@@ -100,13 +86,13 @@ def plot_upbit_xrp_candles():
     plt.xticks(rotation=45)
     plt.gca().xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m-%d'))
     plt.gca().xaxis.set_major_locator(mdates.DayLocator(interval=5))
-    plt.show()
+    show_chart('upbit_xrp')
 
 # ✅ 김프 그래프 그리기
 def plot_korea_premium():
     premium_data = calculate_korea_premium()
     
-    plt.figure(figsize=(12, 6))
+    figure_template('line_chart', figsize=(12, 6))
     plt.plot(premium_data['timestamp'], premium_data['premium'], marker='o', linestyle='-', color='green', label='Korea Premium (%)')
     plt.axhline(0, color='gray', linestyle='--', linewidth=1)
     plt.xlabel("Date")
@@ -117,7 +103,7 @@ def plot_korea_premium():
     plt.xticks(rotation=45)
     plt.gca().xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m-%d'))
     plt.gca().xaxis.set_major_locator(mdates.DayLocator(interval=5))
-    plt.show()
+    show_chart('korea_premium')
 
 # ✅ 실행 (세 개의 그래프를 출력)
 def plot_xrp_charts():
@@ -0,0 +1,195 @@
+import time
+import asyncio
+import logging
+import aiohttp
+from metrics import metrics
+from line_outbox import LineOutbox, backoff_delay, parse_retry_after
+from line_recipients import LineRecipients, MAX_MESSAGES_PER_REQUEST
+
+# 🔹 LINE API 주소 (api_base를 바꾸면 로컬 테스트 서버로 보낼 수 있음)
+LINE_API_BASE = "https://api.line.me"
+LINE_ENDPOINT_PATHS = {
+    "push": "/v2/bot/message/push",
+    "multicast": "/v2/bot/message/multicast",
+}
+
+# 🔹 다시 시도할 만한 응답 (그 외 4xx는 바로 포기)
+RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+
+
+# 🔹 LINE 비동기 전송기
+# 핸들러는 enqueue()로 SQLite 대기열(LineOutbox)에 넣기만 하고, 실제 전송은 워커 풀이 keep-alive 세션으로 처리한다.
+# 메시지는 수신 대상(multicast 500명 묶음 / 그룹별 push)마다 대기열에 들어가고,
+# 같은 대상에 쌓인 메시지는 최대 5개씩 한 요청으로 묶어 보낸다 (대상마다 한 번에 한 요청, 넣은 순서대로).
+# 실패한 메시지는 백오프 후 다시 보낼 시각만 기록해 두므로, 다른 대상으로 가는 메시지 전송을 막지 않는다.
+# (같은 대상의 뒤 메시지는 순서를 지키려고 기다림)
+class LineDelivery:
+    def __init__(self, access_token, to, workers=4, queue_size=1000, max_attempts=8, timeout=10,
+                 on_result=None, outbox=None, poll_interval=1.0, api_base=None):
+        self.access_token = access_token
+        # to: 사용자 ID 하나, 또는 LineRecipients (여러 사용자 + 그룹)
+        self.recipients = to if isinstance(to, LineRecipients) else LineRecipients([to])
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.timeout = timeout
+        # 전송 결과 콜백 on_result(key, ok) - key는 enqueue()에 넘긴 값
+        # 수신 대상이 여러 개면 마지막 대상이 끝났을 때 한 번만 호출 (하나라도 포기했으면 ok=False)
+        self.on_result = on_result
+        self.outbox = outbox if outbox is not None else LineOutbox()
+        self.poll_interval = poll_interval
+        api_base = (api_base or LINE_API_BASE).rstrip("/")
+        self.endpoint_urls = {endpoint: api_base + path for endpoint, path in LINE_ENDPOINT_PATHS.items()}
+        # 대기열에서 꺼내 워커에게 넘기는 메모리 큐 (가득 차면 꺼내기를 멈춤)
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.session = None
+        self._tasks = []
+        self._dispatcher = None
+        self._wakeup = asyncio.Event()
+
+    # 🔹 세션 + 워커 시작 (이벤트 루프 안에서 호출)
+    async def start(self):
+        recovered = self.outbox.recover()
+        if recovered:
+            logging.info(f"♻️ 전송 중이던 LINE 메시지 {recovered}개 다시 대기열에 넣음")
+        connector = aiohttp.TCPConnector(limit=self.workers, keepalive_timeout=60)
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            headers={
+                "Authorization": f"Bearer {self.access_token}",
+                "Content-Type": "application/json"
+            }
+        )
+        self._tasks = [asyncio.create_task(self._worker(i)) for i in range(self.workers)]
+        self._dispatcher = asyncio.create_task(self._dispatch())
+        logging.info(f"🚚 LINE 전송 워커 {self.workers}개 시작 (대기열: {self.outbox.counts()})")
+
+    # 🔹 꺼내 둔 메시지까지 전송 후 종료 (나머지는 대기열에 남아 다음 실행 때 전송)
+    async def stop(self):
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+            await asyncio.gather(self._dispatcher, return_exceptions=True)
+            self._dispatcher = None
+        await self.queue.join()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    # 🔹 대기열에 넣기만 함 (블로킹 없음)
+    # received_at: 원본 메시지 수신 시각 (epoch 초) - 전송 성공 시 종단 간 지연(e2e)으로 기록
+    # 반환: 대기열에 들어갔는지 (수신 대상이 없거나 저장에 실패하면 False)
+    def enqueue(self, message, key=None, received_at=None):
+        targets = self.recipients.targets()
+        if not targets:
+            logging.warning(f"⚠️ LINE 수신 대상 없음 - 메시지 버림: {message}")
+            metrics.inc("line_no_recipients")
+            return False
+        try:
+            self.outbox.put(targets, message, key, received_at)
+        except Exception as e:
+            logging.error(f"❌ LINE 전송 대기열 저장 실패 - 메시지 버림: {e} / {message}")
+            metrics.inc("line_enqueue_errors")
+            return False
+        self._wakeup.set()
+        return True
+
+    async def _dispatch(self):
+        while True:
+            self._wakeup.clear()
+            items = self.outbox.claim_batch(MAX_MESSAGES_PER_REQUEST)
+            if items:
+                await self.queue.put(items)
+                continue
+            due_in = self.outbox.next_due_in()
+            # 차례가 된 항목이 있는데 못 가져왔으면 그 대상의 앞 묶음이 전송 중 → 전송이 끝나면 워커가 깨움
+            wait = min(due_in, self.poll_interval) if due_in else self.poll_interval
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), wait)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _worker(self, worker_id):
+        while True:
+            items = await self.queue.get()
+            try:
+                await self._deliver(items)
+            except Exception as e:
+                logging.error(f"❌ LINE 워커 {worker_id} 오류: {e}")
+                metrics.inc("line_worker_errors")
+                self._retry_or_give_up(items, None, str(e))
+            finally:
+                self.queue.task_done()
+                # 같은 대상의 다음 묶음을 가져갈 수 있게 됨
+                self._wakeup.set()
+
+    async def _deliver(self, items):
+        endpoint, target = items[0].endpoint, items[0].target
+        data = {
+            "to": target,
+            "messages": [{"type": "text", "text": item.message} for item in items]
+        }
+        request_start = time.perf_counter()
+        try:
+            async with self.session.post(self.endpoint_urls[endpoint], json=data) as response:
+                metrics.observe("line_http", time.perf_counter() - request_start)
+                metrics.inc(f"line_http_{response.status}")
+                if response.status == 200:
+                    self.outbox.done([item.id for item in items])
+                    now = time.time()
+                    for item in items:
+                        logging.info(f"📩 LINE 메시지 전송 성공 ({endpoint}): {item.message}")
+                        metrics.observe("deliver", now - item.created_at)
+                        if item.received_at is not None:
+                            metrics.observe("e2e", now - item.received_at)
+                        self._report(item, True)
+                    metrics.inc("line_sent", len(items))
+                    return
+                error = f"HTTP {response.status}"
+                logging.warning(f"⚠️ LINE 메시지 전송 실패 ({response.status}, {endpoint}, 메시지 {len(items)}개)")
+                if response.status not in RETRYABLE_STATUS:
+                    self._give_up(items, error)
+                    return
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logging.error(f"❌ LINE API 오류: {e!r}")
+            metrics.inc("line_network_errors")
+            error, retry_after = repr(e), None
+        self._retry_or_give_up(items, retry_after, error)
+
+    def _retry_or_give_up(self, items, retry_after, error):
+        exhausted = [item for item in items if item.attempts + 1 >= self.max_attempts]
+        if exhausted:
+            self._give_up(exhausted, error)
+        retry = [item for item in items if item.attempts + 1 < self.max_attempts]
+        if not retry:
+            return
+        # 같이 보낸 메시지는 같은 시각에 다시 보내 다음에도 한 요청으로 묶이게 함
+        delay = backoff_delay(max(item.attempts for item in retry) + 1)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        logging.info(f"⏳ LINE 메시지 {[item.id for item in retry]} {delay:.1f}초 후 재시도 ({error})")
+        metrics.inc("line_retries", len(retry))
+        self.outbox.retry_later([item.id for item in retry], delay, error)
+        self._wakeup.set()
+
+    def _give_up(self, items, error):
+        self.outbox.dead_letter([item.id for item in items], error)
+        metrics.inc("line_dead", len(items))
+        for item in items:
+            logging.error(f"☠️ LINE 메시지 #{item.id} 전송 포기 ({error}) - line_outbox.py --replay-dead 로 다시 보낼 수 있음")
+            self._report(item, False)
+
+    def _report(self, item, ok):
+        if self.on_result is None:
+            return
+        if item.key is not None:
+            # 같은 key의 다른 대상이 아직 남아 있으면 기다림 (대기열에 남은 상태로 판단 → 재시작해도 맞음)
+            remaining, dead = self.outbox.key_status(item.key)
+            if remaining:
+                return
+            ok = dead == 0
+        self.on_result(item.key, ok)
@@ -0,0 +1,219 @@
+import json
+import time
+import random
+import sqlite3
+import argparse
+from collections import namedtuple
+
+OutboxItem = namedtuple("OutboxItem", ["id", "endpoint", "target", "message", "key", "attempts", "created_at", "received_at"])
+
+
+# 🔹 재시도 대기 시간 (지수 백오프 + 지터)
+def backoff_delay(attempts, base=1.0, cap=300.0):
+    delay = min(cap, base * 2 ** max(attempts - 1, 0))
+    return random.uniform(delay / 2, delay)
+
+
+# 🔹 Retry-After 헤더 해석 (초 단위 숫자만 사용, 없거나 잘못되면 None)
+def parse_retry_after(value):
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        return None
+
+
+# 🔹 LINE 전송 대기열 (SQLite, 재시작해도 남아 있음)
+# status: pending(대기) → sending(전송 중) → 삭제(성공) / dead(포기)
+# 재시작 시 sending 상태로 남은 항목은 pending으로 되돌려 다시 보낸다.
+# owner: 여러 프로세스가 한 파일을 같이 쓸 때 프로세스 이름 - 넣은 항목(enqueued_by) / 가져간 항목(claimed_by)에 기록하고,
+#   자기가 넣은 항목만 가져가고 (전송 결과 콜백이 넣은 프로세스의 저장소에 기록되도록) 자기가 가져간 항목만 되살린다.
+#   key 없는 항목(김프 알림 등 결과를 기다리는 곳이 없음)과 이전 버전이 넣은 항목은 누구나 가져감
+#   owner가 없으면 전체 (프로세스 하나만 쓸 때 / 관리용)
+# 같은 대상(endpoint + target)은 한 번에 한 묶음만 보내고, 넣은 순서대로 보낸다 (재시도 중인 앞 항목을 앞지르지 않음).
+# prepare=False면 테이블 준비를 건너뜀 (다른 프로세스가 미리 준비한 경우)
+class LineOutbox:
+    def __init__(self, path="line_outbox.db", owner=None, prepare=True):
+        self.path = path
+        self.owner = owner
+        self.conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        if prepare:
+            self.prepare()
+
+    def prepare(self):
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS line_outbox (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                endpoint TEXT NOT NULL,
+                target TEXT NOT NULL,
+                message TEXT NOT NULL,
+                msg_key TEXT,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                next_attempt_at REAL NOT NULL,
+                last_error TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL
+            );
+            CREATE INDEX IF NOT EXISTS idx_line_outbox_due ON line_outbox(status, next_attempt_at);
+            CREATE INDEX IF NOT EXISTS idx_line_outbox_key ON line_outbox(msg_key);
+        """)
+        # 🔹 원본 메시지 수신 시각 (종단 간 지연 측정용) / 가져간 프로세스 / 넣은 프로세스 - 이전 버전 DB에는 없음
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(line_outbox)")}
+        for column, column_type in (("received_at", "REAL"), ("claimed_by", "TEXT"), ("enqueued_by", "TEXT")):
+            if column not in columns:
+                self.conn.execute(f"ALTER TABLE line_outbox ADD COLUMN {column} {column_type}")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_line_outbox_target ON line_outbox(endpoint, target, status)")
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+    # 🔹 대기열에 추가 (대상별로 한 행씩, 한 트랜잭션)
+    def put(self, targets, message, key=None, received_at=None):
+        now = time.time()
+        key = None if key is None else json.dumps(key)
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO line_outbox (endpoint, target, message, msg_key, next_attempt_at, created_at, received_at, "
+                "enqueued_by) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(endpoint, json.dumps(target), message, key, now, now, received_at, self.owner)
+                 for endpoint, target in targets]
+            )
+
+    # 🔹 재시작 시 전송 중이던 항목 되살리기
+    # owner가 있으면 그 프로세스가 가져간 항목만 (다른 프로세스가 보내는 중인 항목은 건드리지 않음, 이전 버전이 가져간 항목 포함),
+    # 없으면 전체 - 이 파일을 쓰는 프로세스가 하나도 돌고 있지 않을 때만 써야 함
+    def recover(self):
+        with self.conn:
+            if self.owner is None:
+                cursor = self.conn.execute(
+                    "UPDATE line_outbox SET status = 'pending', updated_at = ? WHERE status = 'sending'", (time.time(),)
+                )
+            else:
+                cursor = self.conn.execute(
+                    "UPDATE line_outbox SET status = 'pending', updated_at = ? "
+                    "WHERE status = 'sending' AND (claimed_by = ? OR claimed_by IS NULL)",
+                    (time.time(), self.owner)
+                )
+        return cursor.rowcount
+
+    # 🔹 보낼 차례가 된 항목 가져가기 (여러 프로세스가 같이 써도 한 번만 가져감)
+    # 가장 오래된 항목과 같은 대상(endpoint + target)의 항목을 최대 limit개까지 묶어서 가져간다.
+    # 보내는 중인 묶음이 있는 대상 / 같은 곳에서 넣은 앞 항목이 아직 대기 중인 항목은 건너뜀 (대상별 순서 유지)
+    def claim_batch(self, limit=1, now=None):
+        now = time.time() if now is None else now
+        if self.owner is None:
+            mine, params = "1", ()
+        else:
+            mine, params = "(o.enqueued_by = ? OR o.enqueued_by IS NULL OR o.msg_key IS NULL)", (self.owner,)
+        with self.conn:
+            # 고르기 + 가져가기를 한 쓰기 트랜잭션으로 (다른 프로세스가 같은 대상을 동시에 가져가지 않도록)
+            self.conn.execute("BEGIN IMMEDIATE")
+            first = self.conn.execute(
+                "SELECT o.endpoint, o.target, o.enqueued_by FROM line_outbox AS o "
+                f"WHERE o.status = 'pending' AND o.next_attempt_at <= ? AND {mine} "
+                "AND NOT EXISTS (SELECT 1 FROM line_outbox AS b WHERE b.endpoint = o.endpoint AND b.target = o.target "
+                "AND (b.status = 'sending' OR b.status = 'pending' AND b.id < o.id AND b.enqueued_by IS o.enqueued_by)) "
+                "ORDER BY o.next_attempt_at, o.id LIMIT 1", (now,) + params
+            ).fetchone()
+            if first is None:
+                return []
+            # 같은 곳에서 넣은 항목 중 아직 차례가 안 된(재시도 대기) 항목 앞까지만
+            rows = self.conn.execute(
+                "UPDATE line_outbox SET status = 'sending', claimed_by = ?, updated_at = ? "
+                "WHERE id IN (SELECT id FROM line_outbox WHERE status = 'pending' AND endpoint = ? AND target = ? "
+                "AND enqueued_by IS ? AND id < (SELECT COALESCE(MIN(id), 9223372036854775807) FROM line_outbox "
+                "WHERE status = 'pending' AND endpoint = ? AND target = ? AND enqueued_by IS ? AND next_attempt_at > ?) "
+                "ORDER BY id LIMIT ?) "
+                "RETURNING id, endpoint, target, message, msg_key, attempts, created_at, received_at",
+                (self.owner, now, *first, *first, now, limit)
+            ).fetchall()
+        items = []
+        for item_id, endpoint, target, message, key, attempts, created_at, received_at in sorted(rows):
+            key = None if key is None else json.loads(key)
+            if isinstance(key, list):
+                key = tuple(key)
+            items.append(OutboxItem(item_id, endpoint, json.loads(target), message, key, attempts, created_at, received_at))
+        return items
+
+    # 🔹 다음 항목까지 남은 시간 (초, 대기 항목이 없으면 None)
+    def next_due_in(self, now=None):
+        now = time.time() if now is None else now
+        row = self.conn.execute(
+            "SELECT MIN(next_attempt_at) FROM line_outbox WHERE status = 'pending'"
+        ).fetchone()
+        if row[0] is None:
+            return None
+        return max(row[0] - now, 0.0)
+
+    def done(self, item_ids):
+        with self.conn:
+            self.conn.executemany("DELETE FROM line_outbox WHERE id = ?", [(item_id,) for item_id in item_ids])
+
+    def retry_later(self, item_ids, delay, error):
+        now = time.time()
+        with self.conn:
+            self.conn.executemany(
+                "UPDATE line_outbox SET status = 'pending', attempts = attempts + 1, next_attempt_at = ?, "
+                "last_error = ?, updated_at = ? WHERE id = ?",
+                [(now + delay, error, now, item_id) for item_id in item_ids]
+            )
+
+    def dead_letter(self, item_ids, error):
+        now = time.time()
+        with self.conn:
+            self.conn.executemany(
+                "UPDATE line_outbox SET status = 'dead', attempts = attempts + 1, last_error = ?, updated_at = ? "
+                "WHERE id = ?",
+                [(error, now, item_id) for item_id in item_ids]
+            )
+
+    # 🔹 포기한 항목 다시 보내기
+    def replay_dead(self):
+        now = time.time()
+        with self.conn:
+            cursor = self.conn.execute(
+                "UPDATE line_outbox SET status = 'pending', attempts = 0, next_attempt_at = ?, updated_at = ? "
+                "WHERE status = 'dead'", (now, now)
+            )
+        return cursor.rowcount
+
+    # 🔹 key 하나의 남은 항목 수 (pending + sending) / 포기한 항목 수 - 성공한 항목은 삭제되어 없음
+    def key_status(self, key):
+        remaining, dead = self.conn.execute(
+            "SELECT COUNT(*) FILTER (WHERE status IN ('pending', 'sending')), COUNT(*) FILTER (WHERE status = 'dead') "
+            "FROM line_outbox WHERE msg_key = ?", (json.dumps(key),)
+        ).fetchone()
+        return remaining, dead
+
+    def pending_count(self):
+        return self.conn.execute("SELECT COUNT(*) FROM line_outbox WHERE status = 'pending'").fetchone()[0]
+
+    def counts(self):
+        return dict(self.conn.execute("SELECT status, COUNT(*) FROM line_outbox GROUP BY status").fetchall())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LINE 전송 대기열 관리")
+    parser.add_argument("--db", default="line_outbox.db")
+    parser.add_argument("--replay-dead", action="store_true", help="포기한(dead) 항목을 다시 대기열에 넣기")
+    parser.add_argument("--list-dead", action="store_true", help="포기한 항목 보기")
+    args = parser.parse_args()
+
+    outbox = LineOutbox(args.db)
+    if args.replay_dead:
+        print(f"다시 보낼 항목: {outbox.replay_dead()}개")
+    if args.list_dead:
+        for item_id, attempts, error, message in outbox.conn.execute(
+                "SELECT id, attempts, last_error, message FROM line_outbox WHERE status = 'dead' ORDER BY id"):
+            print(f"#{item_id} (시도 {attempts}회, {error}) {message}")
+    print(f"상태: {outbox.counts()}")
+    outbox.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+import os
+import json
+import logging
+
+# 🔹 webhook.py가 감지한 그룹 ID를 저장하는 파일
+LINE_GROUPS_PATH = "line_groups.json"
+
+# 🔹 LINE 제한: multicast는 요청당 최대 500명, 모든 전송은 요청당 메시지 최대 5개
+MULTICAST_MAX_RECIPIENTS = 500
+MAX_MESSAGES_PER_REQUEST = 5
+
+
+# 🔹 쉼표로 구분된 환경 변수 → ID 목록
+def parse_ids(value):
+    return [item.strip() for item in (value or "").split(",") if item.strip()]
+
+
+def load_group_ids(path=LINE_GROUPS_PATH):
+    if not os.path.exists(path):
+        return []
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        logging.warning(f"⚠️ 그룹 ID 파일 읽기 실패: {e}")
+        return []
+
+
+# 🔹 새 그룹 ID 저장 (이미 있으면 무시)
+def add_group_id(group_id, path=LINE_GROUPS_PATH):
+    group_ids = load_group_ids(path)
+    if group_id in group_ids:
+        return False
+    group_ids.append(group_id)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(group_ids, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+    return True
+
+
+# 🔹 LINE 수신자 목록
+# 사용자(U...)는 multicast로 500명씩 묶고, 그룹(C...)과 채팅방(R...)은 multicast가 안 되므로 push로 보낸다.
+# 그룹 파일이 바뀌면 다음 전송 때 다시 읽는다 (재시작 불필요).
+class LineRecipients:
+    def __init__(self, user_ids=(), group_ids=(), groups_path=LINE_GROUPS_PATH):
+        self.user_ids = list(dict.fromkeys(user_ids))
+        self.group_ids = list(dict.fromkeys(group_ids))
+        self.groups_path = groups_path
+        self._file_group_ids = []
+        self._groups_mtime = None
+
+    def _reload_groups(self):
+        if not self.groups_path:
+            return
+        try:
+            mtime = os.path.getmtime(self.groups_path)
+        except OSError:
+            return
+        if mtime != self._groups_mtime:
+            self._groups_mtime = mtime
+            self._file_group_ids = load_group_ids(self.groups_path)
+            logging.info(f"👥 LINE 그룹 {len(self._file_group_ids)}개 로드 ({self.groups_path})")
+
+    # 🔹 전송 대상 목록 [(endpoint, target), ...]
+    def targets(self):
+        self._reload_groups()
+        targets = []
+        users = self.user_ids
+        if len(users) == 1:
+            targets.append(("push", users[0]))
+        else:
+            for i in range(0, len(users), MULTICAST_MAX_RECIPIENTS):
+                targets.append(("multicast", users[i:i + MULTICAST_MAX_RECIPIENTS]))
+        for group_id in dict.fromkeys(self.group_ids + self._file_group_ids):
+            targets.append(("push", group_id))
+        return targets
@@ -0,0 +1,43 @@
+import re
+from collections import namedtuple
+from datetime import datetime
+
+# 🔹 로그 한 줄 형식: "2025-04-10 04:47:39,007 - INFO - 메시지"
+LOG_LINE_PATTERN = re.compile(r'^(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d{3}) - (\w+) - (.*)$')
+CHANNEL_PATTERN = re.compile(r'^📌 채널 ID: (-?\d+) \(출처: (.*)\)$')
+RECEIVED_PREFIX = "📩 수신된 메시지: "
+
+LogRecord = namedtuple("LogRecord", ["timestamp", "level", "message"])
+CorpusMessage = namedtuple("CorpusMessage", ["timestamp", "chat_id", "source", "text"])
+
+
+# 🔹 로그 파일 → LogRecord 목록 (여러 줄 메시지는 앞 레코드에 붙임)
+def read_log_records(path="telegram_bot.log"):
+    records = []
+    with open(path, encoding="utf-8", errors="replace") as f:
+        for line in f:
+            line = line.rstrip("\n")
+            match = LOG_LINE_PATTERN.match(line)
+            if match:
+                timestamp = datetime.strptime(match.group(1), "%Y-%m-%d %H:%M:%S,%f")
+                records.append(LogRecord(timestamp, match.group(2), match.group(3)))
+            elif records:
+                last = records[-1]
+                records[-1] = last._replace(message=f"{last.message}\n{line}")
+    return records
+
+
+# 🔹 수신된 메시지만 뽑아 코퍼스로 만들기
+# 바로 앞에 "📌 채널 ID" 로그가 있으면 채널 정보도 같이 기록한다.
+def load_messages(path="telegram_bot.log"):
+    messages = []
+    chat_id, source = None, None
+    for record in read_log_records(path):
+        channel_match = CHANNEL_PATTERN.match(record.message)
+        if channel_match:
+            chat_id, source = int(channel_match.group(1)), channel_match.group(2)
+        elif record.message.startswith(RECEIVED_PREFIX):
+            text = record.message[len(RECEIVED_PREFIX):]
+            messages.append(CorpusMessage(record.timestamp, chat_id, source, text))
+            chat_id, source = None, None
+    return messages
@@ -0,0 +1,157 @@
+import time
+import random
+import asyncio
+import aiohttp
+from datetime import date, timedelta
+from candle_store import (candle_store, upbit_candle_pages, binance_candle_pages, upbit_candles_frame,
+                          binance_candles_frame, concat_candles, BINANCE_KLINES_URL, TIMEFRAME_MS)
+from fx_rates import fx_store, yahoo_chart_request, yahoo_chart_rates
+
+# ✅ 소스별 요청 제한 시간 (초)
+SOURCE_TIMEOUTS = {
+    "upbit": 5,
+    "binance": 5,
+    "fx": 10,
+}
+# 재시도 횟수 / 백오프 (초, 시도마다 2배 + 지터)
+FETCH_RETRIES = 3
+FETCH_BACKOFF = 0.5
+FETCH_BACKOFF_CAP = 8.0
+RETRYABLE_STATUS = {408, 418, 429, 500, 502, 503, 504}
+
+# ✅ 소스별 요청 속도 제한 (초당 요청 수, 한 번에 몰아 보낼 수 있는 수)
+# 업비트 시세 API는 초당 10회, 바이낸스는 분당 weight 6000 (캔들 요청 weight 2)
+SOURCE_RATE_LIMITS = {
+    "upbit": (8, 8),
+    "binance": (20, 40),
+    "fx": (2, 2),
+}
+
+
+# ✅ 요청 속도 제한기 (GCRA - 다음 허용 시각을 미리 예약하므로 여러 태스크가 동시에 불러도 순서대로 통과)
+class RateLimiter:
+    def __init__(self, rate, burst=1):
+        self.interval = 1.0 / rate
+        self.tolerance = (burst - 1) * self.interval
+        self.tat = 0.0
+
+    async def acquire(self):
+        now = time.monotonic()
+        tat = max(self.tat, now)
+        self.tat = tat + self.interval
+        wait = tat - self.tolerance - now
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+RATE_LIMITERS = {source: RateLimiter(rate, burst) for source, (rate, burst) in SOURCE_RATE_LIMITS.items()}
+
+
+# ✅ 공유 세션 (keep-alive, 요청마다 연결을 새로 맺지 않음)
+def create_session():
+    connector = aiohttp.TCPConnector(limit=20, keepalive_timeout=60)
+    # Yahoo는 User-Agent가 없으면 거절함
+    return aiohttp.ClientSession(connector=connector, headers={"User-Agent": "Mozilla/5.0"})
+
+
+# ✅ JSON 요청 (소스별 제한 시간, 실패 시 asyncio.sleep 백오프 후 재시도)
+async def fetch_json(session, source, url, params=None, retries=FETCH_RETRIES):
+    timeout = aiohttp.ClientTimeout(total=SOURCE_TIMEOUTS[source])
+    for attempt in range(1, retries + 1):
+        retry_after = None
+        await RATE_LIMITERS[source].acquire()
+        try:
+            async with session.get(url, params=params, timeout=timeout) as response:
+                if response.status == 200:
+                    return await response.json()
+                error = f"HTTP {response.status}"
+                if response.status not in RETRYABLE_STATUS:
+                    raise Exception(f"Failed to fetch {source} data: {error}")
+                retry_after = response.headers.get("Retry-After")
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            error = repr(e)
+        if attempt == retries:
+            raise Exception(f"Failed to fetch {source} data after {retries} retries: {error}")
+        delay = min(FETCH_BACKOFF_CAP, FETCH_BACKOFF * 2 ** (attempt - 1))
+        delay = random.uniform(delay / 2, delay)
+        if retry_after and retry_after.isdigit():
+            delay = max(delay, float(retry_after))
+        await asyncio.sleep(delay)
+
+
+# ✅ [start_ms, end_ms) 구간 캔들 - 페이지를 한꺼번에 보내고 속도는 소스별 제한기가 조절
+async def fetch_upbit_candles(session, market, timeframe, start_ms, end_ms):
+    pages = await asyncio.gather(*[
+        fetch_json(session, "upbit", url, params) for url, params in upbit_candle_pages(market, timeframe, start_ms, end_ms)
+    ])
+    return concat_candles(upbit_candles_frame(data) for data in pages)
+
+
+async def fetch_binance_candles(session, symbol, timeframe, start_ms, end_ms):
+    pages = await asyncio.gather(*[
+        fetch_json(session, "binance", BINANCE_KLINES_URL, params)
+        for params in binance_candle_pages(symbol, timeframe, start_ms, end_ms)
+    ])
+    return concat_candles(binance_candles_frame(rows) for rows in pages)
+
+
+ASYNC_CANDLE_FETCHERS = {
+    "upbit": fetch_upbit_candles,
+    "binance": fetch_binance_candles,
+}
+
+
+# ✅ 캔들 (로컬 저장소 + 빠진 구간만 비동기로 받음, 앞뒤 구간도 동시에)
+async def get_candles(session, exchange, market, timeframe="1d", count=100, store=candle_store):
+    ranges = store.missing_ranges(exchange, market, timeframe, count)
+    if ranges:
+        fetched = await asyncio.gather(*[
+            ASYNC_CANDLE_FETCHERS[exchange](session, market, timeframe, start, end) for start, end in ranges
+        ])
+        df = store.merge(exchange, market, timeframe, concat_candles(fetched))
+    else:
+        df = store.load(exchange, market, timeframe)
+    return store.view(df, count)
+
+
+async def fetch_candles(exchange, market, timeframe="1d", count=100):
+    async with create_session() as session:
+        return await get_candles(session, exchange, market, timeframe, count)
+
+
+# ✅ 동기 코드용 (한 번 호출에 세션 하나, 과거 구간은 페이지를 동시에 받음)
+def load_candles(exchange, market, timeframe="1d", count=100):
+    return asyncio.run(fetch_candles(exchange, market, timeframe, count))
+
+
+# ✅ 기간 환율 (로컬 저장소 + 빠진 구간만 비동기로 받음, 여러 구간도 동시에)
+async def get_usd_to_krw_history(session, start_date, end_date, store=fx_store):
+    missing = store.missing_ranges(start_date, end_date)
+    if missing:
+        responses = await asyncio.gather(*[
+            fetch_json(session, "fx", *yahoo_chart_request(fetch_start, fetch_end))
+            for fetch_start, fetch_end in missing
+        ])
+        store.merge(yahoo_chart_rates(data) for data in responses)
+    return store.view(start_date, end_date)
+
+
+# ✅ 김프 계산에 필요한 데이터를 동시에 가져오기 (걸리는 시간 = 가장 느린 소스)
+# 반환: (바이낸스 캔들, 업비트 캔들, 환율, 걸린 시간)
+async def fetch_premium_inputs(binance_symbol="XRP/USDT", upbit_market="KRW-XRP", timeframe="1d", count=100):
+    # 환율 구간은 캔들과 같은 기간 (앞뒤로 하루씩 여유)
+    days = -(-count * TIMEFRAME_MS[timeframe] // TIMEFRAME_MS["1d"])
+    end_date = date.today() + timedelta(days=1)
+    start_date = end_date - timedelta(days=days + 2)
+    start = time.perf_counter()
+    async with create_session() as session:
+        binance_data, upbit_data, usd_to_krw = await asyncio.gather(
+            get_candles(session, "binance", binance_symbol, timeframe, count),
+            get_candles(session, "upbit", upbit_market, timeframe, count),
+            get_usd_to_krw_history(session, start_date, end_date),
+        )
+    return binance_data, upbit_data, usd_to_krw, time.perf_counter() - start
+
+
+def load_premium_inputs(*args, **kwargs):
+    return asyncio.run(fetch_premium_inputs(*args, **kwargs))
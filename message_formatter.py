@@ -0,0 +1,39 @@
+import re
+
+# 🔹 중간에 공백이 포함된 URL까지 잡는 패턴
+URL_PATTERN = r'https?:\/\/(?:[\w\-]+\.)+[a-zA-Z]{2,}(?:\s*\.\s*\w+)*(?:\/[\w\-\/\.\?\=\#\&\%\~]*)?'
+URL_REGEX = re.compile(URL_PATTERN)
+
+# 🔹 URL이 빠진 자리에 남는 " . " 정리
+SPACED_DOT_REGEX = re.compile(r'\s+\.\s+')
+
+# 🔹 출력 형식
+# single_line: 기존 format_message와 같은 한 줄 출력 (문장부호 뒤 공백 한 칸)
+# sentences: 문장부호 뒤에서 줄바꿈, 한 줄에 한 문장
+OUTPUT_MODES = ("single_line", "sentences")
+
+PUNCTUATION = ".!?"
+
+
+# 🔹 메시지 정리기
+# 정규식은 URL 제거에만 (미리 컴파일해서) 쓰고, 문장 분리와 공백 정리는 C로 구현된 str 메서드로 처리한다.
+# (문장부호 뒤에 줄바꿈을 넣었다가 다시 공백으로 합치는 기존 방식의 낭비 단계 없음)
+class MessageNormalizer:
+    def __init__(self, remove_urls=False, mode="single_line"):
+        if mode not in OUTPUT_MODES:
+            raise ValueError(f"Unknown output mode: {mode} (choose from {', '.join(OUTPUT_MODES)})")
+        self.remove_urls = remove_urls
+        self.mode = mode
+
+    def __call__(self, text):
+        if self.remove_urls:
+            text = URL_REGEX.sub('', text)
+            text = SPACED_DOT_REGEX.sub('.', text)
+        for mark in PUNCTUATION:
+            text = text.replace(mark, f"{mark} ")
+        # split()은 모든 공백 문자를 기준으로 나누므로 re.sub(r'\s+', ' ') + strip()과 같음
+        text = " ".join(text.split())
+        if self.mode == "sentences":
+            for mark in PUNCTUATION:
+                text = text.replace(f"{mark} ", f"{mark}\n")
+        return text
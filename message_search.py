@@ -0,0 +1,147 @@
+import argparse
+from collections import namedtuple
+from channels import source_for
+
+# 🔹 토크나이저 선택
+# trigram: 한국어처럼 띄어쓰기와 상관없이 부분 문자열을 찾아야 할 때 (3글자 이상 검색어)
+# unicode61: 공백 기준 단어 검색 (한국어 조사 붙은 단어는 못 찾음)
+TOKENIZERS = {
+    "trigram": "trigram",
+    "unicode61": "unicode61 remove_diacritics 2",
+}
+
+SearchResult = namedtuple("SearchResult", ["id", "created_at", "channel_id", "source", "message", "translation", "delivery_status"])
+
+
+# 🔹 FTS5 색인 준비 (messages 테이블을 외부 콘텐츠로 쓰고 트리거로 동기화)
+# messages에 translation 컬럼이 있어야 함 (message_store.prepare_schema) - 색인 생성과 전체 색인은 한 트랜잭션
+def prepare_search_index(conn, tokenizer="trigram"):
+    conn.commit()
+    try:
+        _create_search_index(conn, tokenizer)
+        # 색인이 비어 있는데 메시지가 있으면 전체 색인 (처음 만들 때 / 예전에 색인이 비어 버린 DB)
+        indexed = conn.execute("SELECT EXISTS (SELECT 1 FROM messages_fts_docsize)").fetchone()[0]
+        if not indexed and conn.execute("SELECT EXISTS (SELECT 1 FROM messages)").fetchone()[0]:
+            conn.execute("INSERT INTO messages_fts(messages_fts) VALUES ('rebuild')")
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+
+
+def _create_search_index(conn, tokenizer):
+    conn.executescript(f"""
+        BEGIN;
+        CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5(
+            message, translation, content='messages', content_rowid='id', tokenize='{TOKENIZERS[tokenizer]}'
+        );
+        CREATE TRIGGER IF NOT EXISTS messages_fts_ai AFTER INSERT ON messages BEGIN
+            INSERT INTO messages_fts(rowid, message, translation) VALUES (new.id, new.message, new.translation);
+        END;
+        CREATE TRIGGER IF NOT EXISTS messages_fts_ad AFTER DELETE ON messages BEGIN
+            INSERT INTO messages_fts(messages_fts, rowid, message, translation) VALUES ('delete', old.id, old.message, old.translation);
+        END;
+        CREATE TRIGGER IF NOT EXISTS messages_fts_au AFTER UPDATE OF message, translation ON messages BEGIN
+            INSERT INTO messages_fts(messages_fts, rowid, message, translation) VALUES ('delete', old.id, old.message, old.translation);
+            INSERT INTO messages_fts(rowid, message, translation) VALUES (new.id, new.message, new.translation);
+        END;
+    """)
+
+
+# 🔹 색인 다시 만들기 (토크나이저 변경 시)
+def rebuild_search_index(conn, tokenizer="trigram"):
+    conn.executescript("""
+        DROP TRIGGER IF EXISTS messages_fts_ai;
+        DROP TRIGGER IF EXISTS messages_fts_ad;
+        DROP TRIGGER IF EXISTS messages_fts_au;
+        DROP TABLE IF EXISTS messages_fts;
+    """)
+    prepare_search_index(conn, tokenizer)
+
+
+def _fts_query(terms):
+    # 각 검색어를 구문으로 감싸 FTS 문법 문자("-", ":" 등)가 그대로 검색되게 함
+    return " AND ".join('"{}"'.format(term.replace('"', '""')) for term in terms)
+
+
+# 🔹 메시지 검색
+# 검색어는 공백으로 나눠 모두 포함된 메시지를 찾는다 (원문 + 번역).
+# trigram 색인은 3글자 미만 검색어를 찾을 수 없으므로, 짧은 검색어가 있으면 LIKE로 찾는다.
+def search_messages(conn, query, channel_id=None, since=None, until=None, limit=50, order="time"):
+    terms = query.split()
+    if not terms:
+        return []
+
+    conditions, params = [], []
+    if channel_id is not None:
+        conditions.append("m.channel_id = ?")
+        params.append(channel_id)
+    if since is not None:
+        conditions.append("m.created_at >= ?")
+        params.append(since)
+    if until is not None:
+        conditions.append("m.created_at < ?")
+        params.append(until)
+
+    if all(len(term) >= 3 for term in terms):
+        sql = ("SELECT m.id, m.created_at, m.channel_id, m.source, m.message, m.translation, m.delivery_status "
+               "FROM messages_fts JOIN messages m ON m.id = messages_fts.rowid "
+               "WHERE messages_fts MATCH ?")
+        params.insert(0, _fts_query(terms))
+        order_by = "bm25(messages_fts)" if order == "rank" else "m.created_at DESC"
+    else:
+        sql = ("SELECT m.id, m.created_at, m.channel_id, m.source, m.message, m.translation, m.delivery_status "
+               "FROM messages m WHERE " + " AND ".join(["(m.message LIKE ? OR m.translation LIKE ?)"] * len(terms)))
+        like_params = []
+        for term in terms:
+            like_params += [f"%{term}%", f"%{term}%"]
+        params = like_params + params
+        order_by = "m.created_at DESC"
+
+    if conditions:
+        sql += " AND " + " AND ".join(conditions)
+    sql += f" ORDER BY {order_by} LIMIT ?"
+    params.append(limit)
+
+    results = []
+    for row in conn.execute(sql, params):
+        result = SearchResult(*row)
+        if result.source is None:
+            result = result._replace(source=source_for(result.channel_id))
+        results.append(result)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="릴레이 메시지 검색 (test.db)")
+    parser.add_argument("query", nargs="?", default="", help="검색어 (공백으로 여러 개)")
+    parser.add_argument("--db", default="test.db")
+    parser.add_argument("--channel", type=int, help="채널 ID")
+    parser.add_argument("--since", help="시작 시각 (예: 2025-04-10)")
+    parser.add_argument("--until", help="끝 시각 (예: 2025-04-11)")
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--order", choices=["time", "rank"], default="time")
+    parser.add_argument("--rebuild", choices=list(TOKENIZERS), help="색인을 지정한 토크나이저로 다시 만들기")
+    args = parser.parse_args()
+
+    # message_store가 이 모듈을 import하므로 여기서 import
+    # connect(): 예전 test.db에 없는 컬럼(translation 등) 추가 + 검색 색인 준비
+    from message_store import connect
+    conn = connect(args.db)
+    if args.rebuild:
+        rebuild_search_index(conn, args.rebuild)
+        print(f"색인을 다시 만들었습니다 ({args.rebuild})")
+    if not args.query:
+        return
+
+    results = search_messages(conn, args.query, args.channel, args.since, args.until, args.limit, args.order)
+    for result in results:
+        print(f"[{result.created_at}] {result.source} ({result.channel_id}) #{result.id}")
+        print(f"  {result.message}")
+        if result.translation:
+            print(f"  → {result.translation}")
+    print(f"{len(results)}건")
+
+
+if __name__ == "__main__":
+    main()
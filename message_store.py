@@ -0,0 +1,141 @@
+import asyncio
+import logging
+import sqlite3
+from datetime import datetime, timezone
+from message_search import prepare_search_index
+
+# 🔹 기존 messages(id, message, created_at) 테이블에 추가할 컬럼
+EXTRA_COLUMNS = {
+    "channel_id": "INTEGER",
+    "tg_message_id": "INTEGER",
+    "source": "TEXT",
+    "filtered": "INTEGER",
+    "translation": "TEXT",
+    "delivery_status": "TEXT",
+}
+
+INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_messages_channel_time ON messages(channel_id, created_at)",
+    "CREATE INDEX IF NOT EXISTS idx_messages_created_at ON messages(created_at)",
+    "CREATE UNIQUE INDEX IF NOT EXISTS idx_messages_channel_msg ON messages(channel_id, tg_message_id)",
+]
+
+UPDATABLE_FIELDS = ("filtered", "translation", "delivery_status")
+
+
+# 🔹 기존 데이터와 같은 시간 형식 (UTC, "2025-01-03 23:12:14+00:00")
+def to_db_time(value=None):
+    value = value or datetime.now(timezone.utc)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return str(value.astimezone(timezone.utc).replace(microsecond=0))
+
+
+# 🔹 테이블 준비 (컬럼/인덱스가 없으면 추가)
+def prepare_schema(conn):
+    conn.execute("CREATE TABLE IF NOT EXISTS messages (id INTEGER PRIMARY KEY, message TEXT, created_at DATETIME)")
+    existing = {row[1] for row in conn.execute("PRAGMA table_info(messages)")}
+    for column, column_type in EXTRA_COLUMNS.items():
+        if column not in existing:
+            conn.execute(f"ALTER TABLE messages ADD COLUMN {column} {column_type}")
+    for statement in INDEXES:
+        conn.execute(statement)
+    conn.commit()
+
+
+# prepare=False면 테이블/검색 색인 준비를 건너뜀 (여러 프로세스가 같이 쓸 때는 한 곳에서 미리 준비)
+def connect(path, prepare=True):
+    conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    if prepare:
+        prepare_schema(conn)
+        prepare_search_index(conn)
+    return conn
+
+
+# 🔹 메시지 저장소 (일괄 기록)
+# 핸들러는 메모리 버퍼에 넣기만 하고, flush_interval마다 executemany로 한 번에 기록한다.
+# 아직 기록되지 않은 메시지의 상태 변경은 버퍼 안에서 합쳐진다.
+class MessageStore:
+    def __init__(self, path="test.db", flush_interval=1.0, prepare=True):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.conn = connect(path, prepare)
+        self._inserts = {}
+        self._updates = {}
+        self._task = None
+        self._lock = asyncio.Lock()
+
+    async def start(self):
+        self._task = asyncio.create_task(self._flusher())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self.flush()
+        self.conn.close()
+
+    # 🔹 수신 메시지 기록
+    def record(self, channel_id, tg_message_id, source, message, created_at=None, **fields):
+        row = {
+            "channel_id": channel_id,
+            "tg_message_id": tg_message_id,
+            "source": source,
+            "message": message,
+            "created_at": to_db_time(created_at),
+            "filtered": None,
+            "translation": None,
+            "delivery_status": None,
+        }
+        row.update(fields)
+        self._inserts[(channel_id, tg_message_id)] = row
+
+    # 🔹 상태 변경 (filtered / translation / delivery_status)
+    def update(self, channel_id, tg_message_id, **fields):
+        unknown = set(fields) - set(UPDATABLE_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown message fields: {', '.join(sorted(unknown))}")
+        key = (channel_id, tg_message_id)
+        if key in self._inserts:
+            self._inserts[key].update(fields)
+        else:
+            self._updates.setdefault(key, {}).update(fields)
+
+    async def _flusher(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except sqlite3.Error as e:
+                logging.error(f"❌ 메시지 저장 실패: {e}")
+
+    async def flush(self):
+        async with self._lock:
+            inserts, self._inserts = self._inserts, {}
+            updates, self._updates = self._updates, {}
+            if inserts or updates:
+                await asyncio.to_thread(self._write, list(inserts.values()), updates)
+
+    def _write(self, inserts, updates):
+        with self.conn:
+            if inserts:
+                self.conn.executemany(
+                    "INSERT OR IGNORE INTO messages "
+                    "(channel_id, tg_message_id, source, message, created_at, filtered, translation, delivery_status) "
+                    "VALUES (:channel_id, :tg_message_id, :source, :message, :created_at, :filtered, :translation, :delivery_status)",
+                    inserts
+                )
+            # 같은 컬럼 조합끼리 묶어서 executemany
+            grouped = {}
+            for (channel_id, tg_message_id), fields in updates.items():
+                columns = tuple(sorted(fields))
+                grouped.setdefault(columns, []).append([fields[c] for c in columns] + [channel_id, tg_message_id])
+            for columns, rows in grouped.items():
+                assignments = ", ".join(f"{c} = ?" for c in columns)
+                self.conn.executemany(
+                    f"UPDATE messages SET {assignments} WHERE channel_id = ? AND tg_message_id = ?", rows
+                )
+        logging.debug(f"💾 메시지 저장: 추가 {len(inserts)}개, 변경 {len(updates)}개")
@@ -0,0 +1,129 @@
+import json
+import time
+import asyncio
+import logging
+from collections import deque, defaultdict
+from contextlib import contextmanager
+
+
+# 🔹 지연 시간 기록 (최근 window개 샘플로 백분위 계산)
+class LatencyHistogram:
+    def __init__(self, window=2048):
+        self.samples = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds):
+        self.samples.append(seconds)
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, sorted_samples, q):
+        if not sorted_samples:
+            return None
+        index = min(int(q * len(sorted_samples)), len(sorted_samples) - 1)
+        return sorted_samples[index]
+
+    # 🔹 요약 (단위: ms)
+    def summary(self):
+        ordered = sorted(self.samples)
+        result = {"count": self.count}
+        if ordered:
+            result.update({
+                "p50_ms": round(self.percentile(ordered, 0.50) * 1000, 2),
+                "p95_ms": round(self.percentile(ordered, 0.95) * 1000, 2),
+                "p99_ms": round(self.percentile(ordered, 0.99) * 1000, 2),
+                "max_ms": round(self.max * 1000, 2),
+                "avg_ms": round(self.total / self.count * 1000, 2),
+            })
+        return result
+
+
+# 🔹 릴레이 지표 모음 (단계별 지연 시간 / 카운터 / 큐 길이)
+class RelayMetrics:
+    def __init__(self, window=2048):
+        self.window = window
+        self.stages = {}
+        self.counters = defaultdict(int)
+        self.gauges = {}
+        self.started_at = time.time()
+
+    def observe(self, stage, seconds):
+        histogram = self.stages.get(stage)
+        if histogram is None:
+            histogram = self.stages[stage] = LatencyHistogram(self.window)
+        histogram.observe(seconds)
+
+    @contextmanager
+    def timer(self, stage):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start)
+
+    def inc(self, name, amount=1):
+        self.counters[name] += amount
+
+    # 🔹 큐 길이 등 현재 값을 돌려주는 함수 등록
+    def register_gauge(self, name, func):
+        self.gauges[name] = func
+
+    def snapshot(self):
+        gauges = {}
+        for name, func in self.gauges.items():
+            try:
+                gauges[name] = func()
+            except Exception as e:
+                gauges[name] = f"error: {e}"
+        return {
+            "uptime_s": round(time.time() - self.started_at, 1),
+            "stages": {stage: histogram.summary() for stage, histogram in self.stages.items()},
+            "counters": dict(self.counters),
+            "gauges": gauges,
+        }
+
+    # 🔹 주기적으로 한 줄짜리 JSON 로그 남기기
+    async def report_forever(self, interval=60):
+        while True:
+            await asyncio.sleep(interval)
+            logging.info(f"📊 metrics {json.dumps(self.snapshot(), ensure_ascii=False)}")
+
+    # 🔹 로컬 지표 엔드포인트 (GET /metrics → JSON)
+    async def serve(self, host="127.0.0.1", port=9108):
+        async def handle(reader, writer):
+            try:
+                request_line = await reader.readline()
+                # 나머지 헤더는 읽고 버림
+                while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    pass
+                parts = request_line.decode(errors="replace").split()
+                if len(parts) >= 2 and parts[1] in ("/", "/metrics"):
+                    status, body = "200 OK", json.dumps(self.snapshot(), ensure_ascii=False).encode()
+                else:
+                    status, body = "404 Not Found", b'{"error": "not found"}'
+                writer.write(
+                    f"HTTP/1.1 {status}\r\nContent-Type: application/json; charset=utf-8\r\n"
+                    f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body
+                )
+                await writer.drain()
+            finally:
+                writer.close()
+
+        # port가 없으면(0/None) 엔드포인트 없이, 포트가 이미 쓰이고 있으면 경고만 남기고 계속 (지표 때문에 릴레이가 멈추지 않도록)
+        if not port:
+            return None
+        try:
+            server = await asyncio.start_server(handle, host, port)
+        except OSError as e:
+            logging.warning(f"⚠️ 지표 엔드포인트를 열 수 없음 ({host}:{port}) - 엔드포인트 없이 계속: {e}")
+            return None
+        logging.info(f"📊 지표 엔드포인트: http://{host}:{port}/metrics")
+        return server
+
+
+# 🔹 프로세스 전체에서 같이 쓰는 지표 (logging처럼 import해서 사용)
+metrics = RelayMetrics()
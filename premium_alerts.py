@@ -0,0 +1,229 @@
+import os
+import time
+import asyncio
+import logging
+import argparse
+from collections import deque
+from dotenv import load_dotenv
+from line_delivery import LineDelivery
+from line_outbox import LineOutbox
+from line_recipients import LineRecipients, parse_ids, LINE_GROUPS_PATH
+from relay import LINE_OUTBOX_PATH
+from market_data import create_session
+from premium_stream import PriceBook, PremiumStream, latest_usd_to_krw, resolve_symbols
+from premium_scanner import scan
+
+# 🔹 환경 변수 파일 (telegram.py와 같음)
+ENV_PATH = '/Users/sonjuwon/Desktop/python workplace/.env'
+
+# 🔹 김프 알림 기준 (%)
+ALERT_ABOVE = 5.0
+ALERT_BELOW = -1.0
+# 🔹 기준을 넘은 뒤 HYSTERESIS만큼 되돌아와야 다시 알림 (기준선 근처에서 오르내릴 때 반복 알림 방지)
+ALERT_HYSTERESIS = 0.5
+# 🔹 급변: RAPID_WINDOW초 안에 RAPID_CHANGE%p 이상 움직이면 알림
+RAPID_CHANGE = 1.5
+RAPID_WINDOW = 300
+# 🔹 같은 종목 / 같은 종류 알림 최소 간격 (초)
+ALERT_COOLDOWN = 1800
+
+# 🔹 주기 모드 (premium_scanner로 전체 종목 조회) 간격 (초)
+SCAN_INTERVAL = 60
+
+
+# 🔹 종목별 상태: 기준 알림 준비 여부 + 급변 감지용 최근 김프 (최솟값 / 최댓값 단조 큐)
+class _SymbolState:
+    __slots__ = ("above_armed", "below_armed", "min_window", "max_window")
+
+    def __init__(self):
+        self.above_armed = True
+        self.below_armed = True
+        self.min_window = deque()
+        self.max_window = deque()
+
+
+# 🔹 김프 알림 판단 (히스테리시스 + 쿨다운)
+# observe()는 김프 하나당 O(1) (급변 감지 창의 최솟값/최댓값은 단조 큐로 유지)
+class PremiumAlerter:
+    def __init__(self, send, above=ALERT_ABOVE, below=ALERT_BELOW, hysteresis=ALERT_HYSTERESIS,
+                 rapid_change=RAPID_CHANGE, rapid_window=RAPID_WINDOW, cooldown=ALERT_COOLDOWN):
+        # send(message) - LINE 전송 대기열에 넣는 함수
+        self.send = send
+        self.above = above
+        self.below = below
+        self.hysteresis = hysteresis
+        self.rapid_change = rapid_change
+        self.rapid_window = rapid_window
+        self.cooldown = cooldown
+        self.states = {}
+        self.last_sent = {}
+        self.sent = 0
+        self.suppressed = 0
+
+    def observe(self, symbol, premium, upbit_krw=None, binance_usdt=None, usd_to_krw=None, timestamp=None):
+        timestamp = timestamp or time.time()
+        state = self.states.get(symbol)
+        if state is None:
+            state = self.states[symbol] = _SymbolState()
+        alerts = []
+
+        # 기준 이상 / 이하 (한 번 알리면 기준 - 히스테리시스 아래로 내려와야 다시 준비)
+        if self.above is not None:
+            if state.above_armed and premium >= self.above:
+                state.above_armed = False
+                alerts.append(("above", f"김프 {premium:+.2f}% (기준 {self.above:+.2f}% 이상)"))
+            elif not state.above_armed and premium < self.above - self.hysteresis:
+                state.above_armed = True
+        if self.below is not None:
+            if state.below_armed and premium <= self.below:
+                state.below_armed = False
+                alerts.append(("below", f"김프 {premium:+.2f}% (기준 {self.below:+.2f}% 이하)"))
+            elif not state.below_armed and premium > self.below + self.hysteresis:
+                state.below_armed = True
+
+        # 급변 (창 안의 최솟값 / 최댓값과 비교)
+        if self.rapid_change:
+            self._push_window(state, timestamp, premium)
+            low_at, low = state.min_window[0]
+            high_at, high = state.max_window[0]
+            if high - low >= self.rapid_change:
+                rising = low_at < high_at
+                change = premium - (low if rising else high)
+                minutes = (timestamp - (low_at if rising else high_at)) / 60
+                alerts.append(("rapid", f"김프 급{'등' if rising else '락'} {change:+.2f}%p ({minutes:.0f}분) → {premium:+.2f}%"))
+                # 같은 움직임으로 다시 알리지 않도록 창을 비움
+                state.min_window.clear()
+                state.max_window.clear()
+                self._push_window(state, timestamp, premium)
+
+        for kind, text in alerts:
+            self._emit(symbol, kind, text, upbit_krw, binance_usdt, usd_to_krw, timestamp)
+
+    def _push_window(self, state, timestamp, premium):
+        while state.min_window and state.min_window[-1][1] >= premium:
+            state.min_window.pop()
+        state.min_window.append((timestamp, premium))
+        while state.max_window and state.max_window[-1][1] <= premium:
+            state.max_window.pop()
+        state.max_window.append((timestamp, premium))
+        cutoff = timestamp - self.rapid_window
+        while state.min_window[0][0] < cutoff:
+            state.min_window.popleft()
+        while state.max_window[0][0] < cutoff:
+            state.max_window.popleft()
+
+    def _emit(self, symbol, kind, text, upbit_krw, binance_usdt, usd_to_krw, timestamp):
+        last = self.last_sent.get((symbol, kind))
+        if last is not None and timestamp - last < self.cooldown:
+            self.suppressed += 1
+            logging.info(f"⏸️ 김프 알림 생략 (쿨다운): {symbol} {text}")
+            return
+        self.last_sent[(symbol, kind)] = timestamp
+        message = f"[김프 알림]\n\n🔹 {symbol} {text}"
+        if upbit_krw is not None and binance_usdt is not None:
+            message += f"\n🔹 업비트 {upbit_krw:,.2f}원 / 바이낸스 {binance_usdt:,.6g} USDT"
+        if usd_to_krw is not None:
+            message += f" / 환율 {usd_to_krw:,.2f}"
+        logging.info(f"🚨 {message}")
+        self.sent += 1
+        self.send(message)
+
+
+# 🔹 LINE 전송 대기열(line_outbox.db)에 넣기
+# telegram.py의 LINE 전송 워커가 같은 대기열을 읽어 보내므로, 이 프로세스는 넣기만 하면 된다.
+def outbox_sender(outbox, recipients):
+    def send(message):
+        try:
+            outbox.put(recipients.targets(), message)
+        except Exception as e:
+            logging.error(f"❌ 김프 알림 대기열 저장 실패: {e} / {message}")
+    return send
+
+
+async def run_stream(session, alerter, symbols, replay=None, fx=None):
+    usd_to_krw = fx if fx or replay else await latest_usd_to_krw(session)
+    stream = PremiumStream(PriceBook(usd_to_krw, thresholds=()), symbols)
+    stream.listen(alerter.observe)
+    if replay:
+        await stream.run_replay(replay)
+    else:
+        await stream.run_live(session)
+
+
+async def run_scan(alerter, interval=SCAN_INTERVAL):
+    while True:
+        try:
+            table = await scan()
+        except Exception as e:
+            logging.error(f"⚠️ 김프 조회 실패: {e}")
+        else:
+            now = time.time()
+            for symbol, row in zip(table.index, table.itertuples(index=False)):
+                alerter.observe(symbol, row.premium, row.upbit_krw, row.binance_usdt, row.binance_krw / row.binance_usdt, now)
+        await asyncio.sleep(interval)
+
+
+async def run(args, alerter):
+    async with create_session() as session:
+        if args.mode == "scan":
+            await run_scan(alerter, args.interval)
+        else:
+            symbols = await resolve_symbols(session, args.symbols, args.all)
+            await run_stream(session, alerter, symbols, args.replay, args.fx)
+
+
+async def run_with_delivery(args, alerter, delivery):
+    await delivery.start()
+    try:
+        await run(args, alerter)
+    finally:
+        await delivery.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="김프 알림 → LINE (telegram.py와 같은 전송 대기열)")
+    parser.add_argument("--mode", choices=["stream", "scan"], default="stream",
+                        help="stream: 웹소켓 실시간, scan: SCAN_INTERVAL마다 전체 종목 조회")
+    parser.add_argument("--symbols", default="XRP", help="stream 모드 종목 (쉼표로 구분)")
+    parser.add_argument("--all", action="store_true", help="stream 모드에서 전체 종목 구독")
+    parser.add_argument("--interval", type=float, default=SCAN_INTERVAL, help="scan 모드 조회 간격 (초)")
+    parser.add_argument("--above", type=float, default=ALERT_ABOVE)
+    parser.add_argument("--below", type=float, default=ALERT_BELOW)
+    parser.add_argument("--hysteresis", type=float, default=ALERT_HYSTERESIS)
+    parser.add_argument("--rapid", type=float, default=RAPID_CHANGE, help="급변 기준 (%%p, 0 = 끔)")
+    parser.add_argument("--rapid-window", type=float, default=RAPID_WINDOW, help="급변 감지 창 (초)")
+    parser.add_argument("--cooldown", type=float, default=ALERT_COOLDOWN, help="같은 알림 최소 간격 (초)")
+    parser.add_argument("--outbox", default=LINE_OUTBOX_PATH, help="LINE 전송 대기열 (telegram.py와 같은 파일)")
+    parser.add_argument("--deliver", action="store_true", help="이 프로세스에서도 LINE 전송 워커 실행 (telegram.py가 꺼져 있을 때)")
+    parser.add_argument("--replay", help="녹화한 틱 파일 재생 (premium_stream.py --record)")
+    parser.add_argument("--fx", type=float, help="USD/KRW 환율 고정")
+    parser.add_argument("--dry-run", action="store_true", help="LINE 대기열에 넣지 않고 로그만")
+    args = parser.parse_args()
+
+    load_dotenv(dotenv_path=ENV_PATH)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+    recipients = LineRecipients(
+        parse_ids(os.getenv("USER_ID")) + parse_ids(os.getenv("LINE_USER_IDS")),
+        parse_ids(os.getenv("LINE_GROUP_IDS")), LINE_GROUPS_PATH
+    )
+    # 릴레이와 같은 파일을 쓰므로 --deliver로 재시작할 때 이 프로세스가 가져간 항목만 되살림
+    outbox = LineOutbox(args.outbox, owner="premium_alerts")
+    send = (lambda message: None) if args.dry_run else outbox_sender(outbox, recipients)
+    alerter = PremiumAlerter(send, args.above, args.below, args.hysteresis, args.rapid, args.rapid_window, args.cooldown)
+
+    try:
+        if args.deliver and not args.dry_run:
+            delivery = LineDelivery(os.getenv("LINE_ACCESS_TOKEN"), recipients, outbox=outbox)
+            asyncio.run(run_with_delivery(args, alerter, delivery))
+        else:
+            asyncio.run(run(args, alerter))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        logging.info(f"⏹️ 김프 알림 {alerter.sent}건 전송, {alerter.suppressed}건 생략")
+        outbox.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+import asyncio
+import argparse
+import numpy as np
+import pandas as pd
+from datetime import date, timedelta
+from market_data import create_session, fetch_json, get_candles, get_usd_to_krw_history
+
+# ✅ 전체 마켓 / 시세 API (한 번 요청으로 여러 종목)
+UPBIT_MARKETS_URL = "https://api.upbit.com/v1/market/all"
+UPBIT_TICKER_URL = "https://api.upbit.com/v1/ticker"
+UPBIT_TICKER_CHUNK = 100
+BINANCE_EXCHANGE_INFO_URL = "https://api.binance.com/api/v3/exchangeInfo"
+BINANCE_TICKER_URL = "https://api.binance.com/api/v3/ticker/price"
+
+# ✅ 거래소마다 이름이 다른 코인 (업비트 → 바이낸스)
+SYMBOL_ALIASES = {}
+
+# 종목별 캔들 요청 동시 실행 수 (요청 속도는 market_data의 소스별 제한기가 조절)
+HISTORY_CONCURRENCY = 8
+
+
+# ✅ 업비트 KRW 마켓 코인 목록
+async def fetch_upbit_krw_symbols(session):
+    markets = await fetch_json(session, "upbit", UPBIT_MARKETS_URL)
+    return [market['market'][4:] for market in markets if market['market'].startswith("KRW-")]
+
+
+# ✅ 바이낸스 USDT 마켓 코인 목록 (거래 중인 것만)
+async def fetch_binance_usdt_symbols(session):
+    info = await fetch_json(session, "binance", BINANCE_EXCHANGE_INFO_URL)
+    return [symbol['baseAsset'] for symbol in info['symbols']
+            if symbol['quoteAsset'] == "USDT" and symbol['status'] == "TRADING"]
+
+
+# ✅ 업비트 현재가 (마켓 100개씩 묶어서 요청)
+async def fetch_upbit_tickers(session, symbols):
+    markets = [f"KRW-{symbol}" for symbol in symbols]
+    chunks = [markets[i:i + UPBIT_TICKER_CHUNK] for i in range(0, len(markets), UPBIT_TICKER_CHUNK)]
+    responses = await asyncio.gather(*[
+        fetch_json(session, "upbit", UPBIT_TICKER_URL, {"markets": ",".join(chunk)}) for chunk in chunks
+    ])
+    tickers = pd.DataFrame([ticker for response in responses for ticker in response])
+    return pd.DataFrame({
+        "upbit_krw": tickers['trade_price'].to_numpy(dtype="float64"),
+        "upbit_volume_krw": tickers['acc_trade_price_24h'].to_numpy(dtype="float64"),
+    }, index=pd.Index(tickers['market'].str[4:], name="symbol"))
+
+
+# ✅ 바이낸스 현재가 (전체 종목 한 번에)
+async def fetch_binance_tickers(session):
+    tickers = pd.DataFrame(await fetch_json(session, "binance", BINANCE_TICKER_URL))
+    tickers = tickers[tickers['symbol'].str.endswith("USDT")]
+    return pd.Series(tickers['price'].to_numpy(dtype="float64"), index=tickers['symbol'].str[:-4], name="binance_usdt")
+
+
+# ✅ 양쪽에 모두 상장된 코인 (업비트 이름, 바이낸스 이름)
+def common_symbols(upbit_symbols, binance_symbols):
+    binance_symbols = set(binance_symbols)
+    return [(symbol, SYMBOL_ALIASES.get(symbol, symbol)) for symbol in upbit_symbols
+            if SYMBOL_ALIASES.get(symbol, symbol) in binance_symbols]
+
+
+# ✅ 전체 종목 김프 계산 (한 번에 벡터 연산)
+def compute_premiums(upbit, binance_usdt, usd_to_krw, pairs):
+    df = upbit.reindex([upbit_symbol for upbit_symbol, _ in pairs])
+    df['binance_usdt'] = binance_usdt.reindex([binance_symbol for _, binance_symbol in pairs]).to_numpy()
+    df = df.dropna(subset=['upbit_krw', 'binance_usdt'])
+    binance_krw = df['binance_usdt'].to_numpy() * usd_to_krw
+    df['binance_krw'] = binance_krw
+    df['premium'] = (df['upbit_krw'].to_numpy() / binance_krw - 1) * 100
+    # 업비트 USDT 가격 기준 김프 (환율 대신 실제 거래되는 달러 가격)
+    if "USDT" in upbit.index:
+        usdt_krw = upbit.at["USDT", 'upbit_krw']
+        df['premium_usdt'] = (df['upbit_krw'].to_numpy() / (df['binance_usdt'].to_numpy() * usdt_krw) - 1) * 100
+    return df.sort_values('premium', ascending=False)
+
+
+# ✅ 종목별 일별 김프 평균 (캔들은 로컬 저장소, 요청은 소스별 속도 제한 + 동시 실행 수 제한)
+async def fetch_premium_history(session, pairs, days):
+    semaphore = asyncio.Semaphore(HISTORY_CONCURRENCY)
+
+    async def closes(exchange, market):
+        async with semaphore:
+            try:
+                df = await get_candles(session, exchange, market, "1d", days)
+            except Exception as e:
+                print(f"⚠️ {exchange} {market} 캔들 실패: {e}")
+                return pd.Series(dtype="float64")
+        return pd.Series(df['close'].to_numpy(), index=df['timestamp'])
+
+    upbit_closes, binance_closes = await asyncio.gather(
+        asyncio.gather(*[closes("upbit", f"KRW-{upbit_symbol}") for upbit_symbol, _ in pairs]),
+        asyncio.gather(*[closes("binance", f"{binance_symbol}/USDT") for _, binance_symbol in pairs]),
+    )
+    # 날짜 x 종목 행렬 (두 거래소 일봉 모두 UTC 00:00 시작)
+    symbols = [upbit_symbol for upbit_symbol, _ in pairs]
+    upbit_matrix = pd.DataFrame(dict(zip(symbols, upbit_closes)))
+    columns = [f'premium_avg_{days}d', f'premium_min_{days}d', f'premium_max_{days}d']
+    if upbit_matrix.empty or not isinstance(upbit_matrix.index, pd.DatetimeIndex):
+        # 업비트 캔들을 하나도 못 받으면 빈 값 (표에는 NaN으로 붙음)
+        print("⚠️ 업비트 캔들 없음 - 과거 김프 생략")
+        return pd.DataFrame(np.nan, index=symbols, columns=columns)
+    binance_matrix = pd.DataFrame(dict(zip(symbols, binance_closes))).reindex(upbit_matrix.index)
+
+    end_date = date.today() + timedelta(days=1)
+    usd_to_krw = await get_usd_to_krw_history(session, end_date - timedelta(days=days + 2), end_date)
+    rates = usd_to_krw['usd_to_krw'].reindex(upbit_matrix.index.date).to_numpy()
+
+    premium = (upbit_matrix.to_numpy() / (binance_matrix.to_numpy() * rates[:, None]) - 1) * 100
+    return pd.DataFrame(dict(zip(columns, (np.nanmean(premium, axis=0), np.nanmin(premium, axis=0),
+                                            np.nanmax(premium, axis=0)))), index=symbols)
+
+
+async def scan(history_days=0, history_top=20):
+    async with create_session() as session:
+        upbit_symbols, binance_symbols = await asyncio.gather(
+            fetch_upbit_krw_symbols(session), fetch_binance_usdt_symbols(session)
+        )
+        today = date.today()
+        upbit, binance_usdt, usd_to_krw = await asyncio.gather(
+            # 업비트는 KRW 마켓 전체 (KRW-USDT 가격은 premium_usdt 계산에 사용)
+            fetch_upbit_tickers(session, upbit_symbols),
+            fetch_binance_tickers(session),
+            get_usd_to_krw_history(session, today - timedelta(days=7), today),
+        )
+        pairs = common_symbols(upbit_symbols, binance_symbols)
+        table = compute_premiums(upbit, binance_usdt, float(usd_to_krw['usd_to_krw'].iloc[-1]), pairs)
+
+        if history_days:
+            # 김프 절댓값이 큰 종목만 과거 데이터 조회
+            top = table['premium'].abs().sort_values(ascending=False).index[:history_top]
+            aliases = dict(pairs)
+            history = await fetch_premium_history(session, [(symbol, aliases[symbol]) for symbol in top], history_days)
+            table = table.join(history)
+    return table
+
+
+def main():
+    parser = argparse.ArgumentParser(description="업비트 KRW / 바이낸스 USDT 전체 종목 김프 순위")
+    parser.add_argument("--top", type=int, default=30, help="출력할 종목 수 (0 = 전체)")
+    parser.add_argument("--min-volume", type=float, default=0, help="업비트 24시간 거래대금 하한 (KRW)")
+    parser.add_argument("--history", type=int, default=0, help="최근 N일 김프 평균/최소/최대 추가")
+    parser.add_argument("--history-top", type=int, default=20, help="과거 데이터를 조회할 종목 수 (김프 절댓값 순)")
+    parser.add_argument("--ascending", action="store_true", help="역프리미엄부터 출력")
+    parser.add_argument("--csv", help="결과를 CSV로 저장")
+    args = parser.parse_args()
+
+    table = asyncio.run(scan(args.history, args.history_top))
+    table = table[table['upbit_volume_krw'] >= args.min_volume]
+    table = table.sort_values('premium', ascending=args.ascending)
+    if args.csv:
+        table.to_csv(args.csv, index_label="symbol")
+        print(f"'{args.csv}' 파일에 저장되었습니다.")
+    shown = table.head(args.top) if args.top else table
+    with pd.option_context("display.max_rows", None, "display.width", 200, "display.float_format", "{:,.4f}".format):
+        print(shown)
+    print(f"{len(table)}개 종목 (업비트 KRW ∩ 바이낸스 USDT)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,307 @@
+import json
+import time
+import uuid
+import random
+import asyncio
+import logging
+import argparse
+from bisect import bisect_right
+from collections import namedtuple
+from datetime import date, timedelta
+import aiohttp
+from market_data import create_session, get_usd_to_krw_history
+from premium_scanner import SYMBOL_ALIASES, fetch_upbit_krw_symbols, fetch_binance_usdt_symbols, common_symbols
+
+# ✅ 웹소켓 주소
+UPBIT_WS_URL = "wss://api.upbit.com/websocket/v1"
+BINANCE_WS_URL = "wss://stream.binance.com:9443/stream"
+# 바이낸스 연결 하나당 최대 스트림 수
+BINANCE_MAX_STREAMS = 1024
+
+# ✅ 김프 기준선 (%) - 이 값을 넘거나 내려갈 때 알림
+PREMIUM_THRESHOLDS = [0.0, 2.0, 5.0]
+# 환율 다시 읽는 주기 (초)
+FX_REFRESH_INTERVAL = 600
+# 재연결 대기 (초, 실패할 때마다 2배)
+RECONNECT_DELAY = 1.0
+RECONNECT_DELAY_CAP = 60.0
+
+PremiumCrossing = namedtuple("PremiumCrossing", ["symbol", "threshold", "direction", "premium", "previous",
+                                                 "upbit_krw", "binance_usdt", "usd_to_krw", "timestamp"])
+
+
+# ✅ 종목별 최신 가격 + 김프 (틱마다 O(1) 갱신)
+# 기준선 사이 구간 번호를 기억해 두고, 구간이 바뀌면 그 사이 기준선을 넘은 것으로 본다.
+class PriceBook:
+    def __init__(self, usd_to_krw, thresholds=PREMIUM_THRESHOLDS):
+        self.usd_to_krw = usd_to_krw
+        self.thresholds = sorted(thresholds)
+        # symbol → [업비트 KRW, 바이낸스 USDT, 김프, 구간]
+        self.entries = {}
+        self.ticks = 0
+
+    def premium(self, symbol):
+        entry = self.entries.get(symbol)
+        return None if entry is None else entry[2]
+
+    def snapshot(self):
+        return {symbol: entry[2] for symbol, entry in self.entries.items() if entry[2] is not None}
+
+    def update(self, exchange, symbol, price, timestamp=None):
+        self.ticks += 1
+        entry = self.entries.get(symbol)
+        if entry is None:
+            entry = self.entries[symbol] = [None, None, None, None]
+        entry[0 if exchange == "upbit" else 1] = price
+        return self._recompute(symbol, entry, timestamp)
+
+    # ✅ 환율이 바뀌면 전체 종목 다시 계산 (드물게 호출)
+    def set_fx(self, usd_to_krw, timestamp=None):
+        self.usd_to_krw = usd_to_krw
+        crossings = []
+        for symbol, entry in self.entries.items():
+            crossings.extend(self._recompute(symbol, entry, timestamp))
+        return crossings
+
+    def _recompute(self, symbol, entry, timestamp):
+        upbit_krw, binance_usdt, previous, previous_band = entry
+        if upbit_krw is None or not binance_usdt or not self.usd_to_krw:
+            return []
+        premium = (upbit_krw / (binance_usdt * self.usd_to_krw) - 1) * 100
+        band = bisect_right(self.thresholds, premium)
+        entry[2], entry[3] = premium, band
+        if previous_band is None or band == previous_band:
+            return []
+        timestamp = timestamp or time.time()
+        if band > previous_band:
+            crossed, direction = self.thresholds[previous_band:band], "up"
+        else:
+            crossed, direction = reversed(self.thresholds[band:previous_band]), "down"
+        return [PremiumCrossing(symbol, threshold, direction, premium, previous, upbit_krw, binance_usdt,
+                                self.usd_to_krw, timestamp) for threshold in crossed]
+
+
+# ✅ 실시간 김프 스트림 (업비트 / 바이낸스 웹소켓 → PriceBook → 구독자)
+class PremiumStream:
+    def __init__(self, book, symbols, aliases=SYMBOL_ALIASES, record_path=None):
+        self.book = book
+        self.symbols = list(symbols)
+        # 바이낸스 이름 → 업비트 이름
+        self.binance_names = {aliases.get(symbol, symbol): symbol for symbol in self.symbols}
+        self.subscribers = []
+        self.listeners = []
+        self.record_path = record_path
+        self._record_file = None
+
+    # 🔹 구독 함수 등록 callback(crossing) - 일반 함수 또는 코루틴 함수
+    def subscribe(self, callback):
+        self.subscribers.append(callback)
+
+    # 🔹 틱마다 김프를 받을 함수 등록 callback(symbol, premium, upbit_krw, binance_usdt, usd_to_krw, timestamp)
+    def listen(self, callback):
+        self.listeners.append(callback)
+
+    async def publish(self, crossings):
+        for crossing in crossings:
+            for callback in self.subscribers:
+                try:
+                    result = callback(crossing)
+                    if asyncio.iscoroutine(result):
+                        await result
+                except Exception as e:
+                    logging.error(f"❌ 김프 구독자 오류: {e}")
+
+    async def on_tick(self, exchange, symbol, price, timestamp=None):
+        if self._record_file is not None:
+            self._record_file.write(json.dumps({"t": timestamp or time.time(), "exchange": exchange,
+                                                "symbol": symbol, "price": price}) + "\n")
+        crossings = self.book.update(exchange, symbol, price, timestamp)
+        if self.listeners:
+            upbit_krw, binance_usdt, premium, _ = self.book.entries[symbol]
+            if premium is not None:
+                timestamp = timestamp or time.time()
+                for callback in self.listeners:
+                    try:
+                        callback(symbol, premium, upbit_krw, binance_usdt, self.book.usd_to_krw, timestamp)
+                    except Exception as e:
+                        logging.error(f"❌ 김프 리스너 오류: {e}")
+        if crossings:
+            await self.publish(crossings)
+
+    # ✅ 업비트 체결가 (ticker)
+    async def run_upbit(self, session):
+        request = [
+            {"ticket": str(uuid.uuid4())},
+            {"type": "ticker", "codes": [f"KRW-{symbol}" for symbol in self.symbols], "isOnlyRealtime": True},
+        ]
+
+        async def handle(data):
+            # 연결 상태 메시지 등은 건너뜀
+            if "code" in data and "trade_price" in data:
+                await self.on_tick("upbit", data['code'][4:], float(data['trade_price']))
+
+        await self._run_socket(session, "upbit", UPBIT_WS_URL, handle, request,
+                               (aiohttp.WSMsgType.BINARY, aiohttp.WSMsgType.TEXT))
+
+    # ✅ 바이낸스 1초 미니 티커 (종가 c)
+    async def run_binance(self, session):
+        names = list(self.binance_names)
+        await asyncio.gather(*[
+            self._run_binance_streams(session, names[i:i + BINANCE_MAX_STREAMS])
+            for i in range(0, len(names), BINANCE_MAX_STREAMS)
+        ])
+
+    async def _run_binance_streams(self, session, names):
+        url = f"{BINANCE_WS_URL}?streams=" + "/".join(f"{name.lower()}usdt@miniTicker" for name in names)
+
+        async def handle(data):
+            data = data.get('data', {})
+            symbol = self.binance_names.get(data.get('s', '')[:-4])
+            if symbol is not None:
+                await self.on_tick("binance", symbol, float(data['c']))
+
+        await self._run_socket(session, "binance", url, handle)
+
+    # 🔹 웹소켓 하나를 계속 읽음
+    # 연결 중이든 받는 중이든 끊기거나 오류가 나면 백오프 후 다시 연결, 메시지 하나를 처리하다 난 오류는 그 메시지만 건너뜀
+    async def _run_socket(self, session, name, url, handle, request=None, message_types=(aiohttp.WSMsgType.TEXT,)):
+        delay = RECONNECT_DELAY
+        while True:
+            try:
+                async with session.ws_connect(url, heartbeat=30) as ws:
+                    logging.info(f"🔌 {name} 웹소켓 연결")
+                    delay = RECONNECT_DELAY
+                    if request is not None:
+                        await ws.send_json(request)
+                    async for message in ws:
+                        if message.type not in message_types:
+                            break
+                        try:
+                            await handle(json.loads(message.data))
+                        except Exception as e:
+                            logging.warning(f"⚠️ {name} 메시지 처리 실패: {e!r}")
+                logging.warning(f"⚠️ {name} 웹소켓 끊김 - 다시 연결")
+                await asyncio.sleep(RECONNECT_DELAY)
+            except Exception as e:
+                logging.warning(f"⚠️ {name} 웹소켓 오류: {e!r} - {delay:.0f}초 후 다시 연결")
+                await asyncio.sleep(random.uniform(delay / 2, delay))
+                delay = min(delay * 2, RECONNECT_DELAY_CAP)
+
+    # ✅ 환율 주기적으로 다시 읽기
+    async def refresh_fx(self, session, interval=FX_REFRESH_INTERVAL):
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                rate = await latest_usd_to_krw(session)
+            except Exception as e:
+                logging.warning(f"⚠️ 환율 갱신 실패: {e}")
+                continue
+            if rate != self.book.usd_to_krw:
+                logging.info(f"💱 환율 갱신: {self.book.usd_to_krw} → {rate}")
+                await self.publish(self.book.set_fx(rate))
+
+    async def run_live(self, session):
+        self._open_record()
+        try:
+            await asyncio.gather(self.run_upbit(session), self.run_binance(session), self.refresh_fx(session))
+        finally:
+            self._close_record()
+
+    # ✅ 녹화한 틱 재생 (네트워크 없이 테스트, speed: 배속, 0이면 기다리지 않음)
+    # 파일 형식: 한 줄에 {"t": epoch 초, "exchange": "upbit"|"binance", "symbol": "XRP", "price": 123.4}
+    async def run_replay(self, path, speed=0):
+        first_tick, started = None, time.monotonic()
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                tick = json.loads(line)
+                if speed and tick.get("t") is not None:
+                    first_tick = first_tick if first_tick is not None else tick["t"]
+                    delay = started + (tick["t"] - first_tick) / speed - time.monotonic()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                if tick["exchange"] == "fx":
+                    await self.publish(self.book.set_fx(float(tick["price"]), tick.get("t")))
+                else:
+                    await self.on_tick(tick["exchange"], tick["symbol"], float(tick["price"]), tick.get("t"))
+
+    def _open_record(self):
+        if self.record_path:
+            self._record_file = open(self.record_path, "a", encoding="utf-8")
+
+    def _close_record(self):
+        if self._record_file is not None:
+            self._record_file.close()
+            self._record_file = None
+
+
+async def latest_usd_to_krw(session):
+    today = date.today()
+    rates = await get_usd_to_krw_history(session, today - timedelta(days=7), today)
+    return float(rates['usd_to_krw'].iloc[-1])
+
+
+def format_crossing(crossing):
+    arrow = "📈" if crossing.direction == "up" else "📉"
+    return (f"{arrow} {crossing.symbol} 김프 {crossing.threshold:+.2f}% "
+            f"{'돌파' if crossing.direction == 'up' else '이탈'}: {crossing.premium:+.2f}% "
+            f"(업비트 {crossing.upbit_krw:,.2f}원 / 바이낸스 {crossing.binance_usdt:,.6g} USDT / 환율 {crossing.usd_to_krw:,.2f})")
+
+
+def print_crossing(crossing):
+    logging.info(format_crossing(crossing))
+
+
+# ✅ 구독할 종목 (쉼표로 구분한 목록, all_symbols면 업비트 KRW ∩ 바이낸스 USDT 전체)
+async def resolve_symbols(session, symbols, all_symbols=False):
+    if all_symbols:
+        upbit_symbols, binance_symbols = await asyncio.gather(
+            fetch_upbit_krw_symbols(session), fetch_binance_usdt_symbols(session)
+        )
+        return [symbol for symbol, _ in common_symbols(upbit_symbols, binance_symbols)]
+    return [symbol.strip().upper() for symbol in symbols.split(",") if symbol.strip()]
+
+
+async def run(args):
+    async with create_session() as session:
+        # 재생할 때는 --fx 또는 파일 안의 exchange=fx 줄을 사용
+        usd_to_krw = args.fx if args.fx or args.replay else await latest_usd_to_krw(session)
+        symbols = await resolve_symbols(session, args.symbols, args.all)
+
+        book = PriceBook(usd_to_krw, args.thresholds)
+        stream = PremiumStream(book, symbols, record_path=args.record)
+        stream.subscribe(print_crossing)
+        logging.info(f"🚀 김프 스트림 시작 ({len(symbols)}개 종목, 기준선 {book.thresholds}, 환율 {usd_to_krw})")
+        started = time.perf_counter()
+        if args.replay:
+            await stream.run_replay(args.replay, args.speed)
+            elapsed = time.perf_counter() - started
+            logging.info(f"⏹️ 재생 완료: 틱 {book.ticks}개, {elapsed:.3f}초 ({book.ticks / max(elapsed, 1e-9):,.0f} 틱/초)")
+            for symbol, premium in sorted(book.snapshot().items(), key=lambda item: -item[1]):
+                print(f"{symbol}: {premium:+.3f}%")
+        else:
+            await stream.run_live(session)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="업비트 / 바이낸스 웹소켓 실시간 김프")
+    parser.add_argument("--symbols", default="XRP", help="쉼표로 구분한 코인 (예: XRP,BTC,ETH)")
+    parser.add_argument("--all", action="store_true", help="업비트 KRW ∩ 바이낸스 USDT 전체 종목")
+    parser.add_argument("--thresholds", type=lambda value: [float(v) for v in value.split(",")],
+                        default=PREMIUM_THRESHOLDS, help="김프 기준선 (%%, 쉼표로 구분)")
+    parser.add_argument("--fx", type=float, help="USD/KRW 환율 고정 (없으면 fx_rates 저장소의 최신 값)")
+    parser.add_argument("--replay", help="녹화한 틱 파일(JSONL) 재생 (exchange=fx 줄로 환율 지정 가능)")
+    parser.add_argument("--speed", type=float, default=0, help="재생 배속 (0 = 기다리지 않고 바로)")
+    parser.add_argument("--record", help="실시간 틱을 JSONL 파일로 녹화")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    try:
+        asyncio.run(run(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+import time
+import logging
+from datetime import datetime, timezone
+from line_delivery import LineDelivery
+from line_outbox import LineOutbox
+from translation import TranslationCache, TranslationStage
+from keyword_matcher import ChannelKeywordMatcher
+from message_formatter import MessageNormalizer
+from dedup import NoticeDeduplicator
+from message_store import MessageStore, connect
+from channels import FILTER_KEYWORDS, CHANNEL_FILTER_KEYWORDS, source_for
+from metrics import metrics
+
+# 🔹 URL 제거 여부
+REMOVE_URLS = False
+
+# 🔹 메시지 출력 형식 ("single_line" 또는 "sentences")
+MESSAGE_FORMAT_MODE = "single_line"
+
+# 🔹 채널 간 중복 공지 제거 (같은 공지가 DEDUP_WINDOW초 안에 다시 오면 번역/전송 생략)
+DEDUP_WINDOW = 600
+DEDUP_MAX_DISTANCE = 3
+
+# 🔹 DeepL 번역 언어 + 캐시 파일
+SOURCE_LANG = "KO"
+TARGET_LANG = "ZH-HANT"
+TRANSLATION_CACHE_PATH = "translation_cache.json"
+
+# 🔹 메시지 저장소 (test.db messages 테이블, 일괄 기록)
+MESSAGE_DB_PATH = "test.db"
+
+# 🔹 LINE 비동기 전송기 (SQLite 대기열 + 워커 풀, 실패 시 백오프 재시도)
+LINE_OUTBOX_PATH = "line_outbox.db"
+LINE_WORKERS = 4
+LINE_QUEUE_SIZE = 1000
+LINE_MAX_ATTEMPTS = 8
+# 프로세스 하나로 돌 때 LINE 대기열에 기록하는 이름 (김프 알림 등 같은 파일을 쓰는 다른 프로세스와 구분)
+LINE_OUTBOX_OWNER = "relay"
+
+
+# 🔹 텔레그램 메시지 → 정리 → 필터 → 중복 제거 → 번역 → LINE 전송
+# telegram.py의 핸들러와 리플레이 하니스(replay_harness.py)가 같은 파이프라인을 쓴다.
+class Relay:
+    def __init__(self, format_message, keyword_matcher, deduplicator, translation_stage, line_delivery, message_store):
+        self.format_message = format_message
+        self.keyword_matcher = keyword_matcher
+        self.deduplicator = deduplicator
+        self.translation_stage = translation_stage
+        self.line_delivery = line_delivery
+        self.message_store = message_store
+        self.line_delivery.on_result = self.on_line_result
+
+    async def start(self):
+        await self.message_store.start()
+        await self.translation_stage.start()
+        await self.line_delivery.start()
+
+    async def stop(self):
+        await self.translation_stage.stop()
+        await self.line_delivery.stop()
+        await self.message_store.stop()
+
+    # 🔹 LINE 전송 결과를 저장소에 기록 (key = (채널 ID, 메시지 ID), 모든 수신 대상이 끝난 뒤 한 번)
+    def on_line_result(self, key, ok):
+        if key is not None:
+            self.message_store.update(*key, delivery_status="sent" if ok else "failed")
+
+    # 🔹 LINE 알림 전송 함수 (큐에 넣기만 하고 바로 반환)
+    def send_line_alert(self, message, key=None, received_at=None):
+        return self.line_delivery.enqueue(message, key=key, received_at=received_at)
+
+    # 🔹 지표에 큐 길이 등록
+    def register_gauges(self):
+        metrics.register_gauge("translation_queue", lambda: self.translation_stage.queue.qsize())
+        metrics.register_gauge("translation_cache", lambda: self.translation_stage.cache.stats())
+        metrics.register_gauge("line_worker_queue", lambda: self.line_delivery.queue.qsize())
+        metrics.register_gauge("line_outbox_pending", lambda: self.line_delivery.outbox.pending_count())
+        if self.deduplicator is not None:
+            metrics.register_gauge("dedup_window", lambda: len(self.deduplicator))
+
+    # 🔹 메시지 처리 (date: 텔레그램 서버 시각)
+    # wait_for: 같은 채널 앞 메시지의 완료 future - 번역은 동시에 하되 LINE 대기열에는 받은 순서대로 넣는다.
+    async def handle(self, chat_id, message_id, message_text, date=None, wait_for=None):
+        date = date or datetime.now(timezone.utc)
+        # 텔레그램 서버 시각 → 수신까지 걸린 시간
+        received_at = date.timestamp()
+        metrics.observe("receive", max(time.time() - received_at, 0.0))
+        metrics.inc("received")
+
+        message_text = message_text.strip()
+        with metrics.timer("format"):
+            formatted_text = self.format_message(message_text)
+        source = source_for(chat_id)
+
+        logging.info(f"📌 채널 ID: {chat_id} (출처: {source})")
+        logging.info(f"📩 수신된 메시지: {formatted_text}")
+
+        with metrics.timer("filter"):
+            matched_keywords = self.keyword_matcher.for_channel(chat_id).matched_keywords(formatted_text)
+        self.message_store.record(chat_id, message_id, source, message_text, date, filtered=int(bool(matched_keywords)))
+        if not matched_keywords:
+            metrics.inc("unfiltered")
+            logging.info(f"❌ 필터링되지 않음 ({source})")
+            return
+
+        metrics.inc("filtered")
+        logging.info(f"✅ 필터링됨 메시지 (키워드: {', '.join(matched_keywords)})")
+        if "안녕하세요" in formatted_text:
+            formatted_text = formatted_text.split("안녕하세요")[0].strip()
+            logging.info(f"✂️ '안녕하세요' 이후 삭제됨: {formatted_text}")
+
+        if self.deduplicator is not None:
+            with metrics.timer("dedup"):
+                duplicate = self.deduplicator.check(formatted_text, source).duplicate
+            if duplicate:
+                metrics.inc("duplicates")
+                logging.info(f"♻️ 중복 메시지 - 번역/전송 생략 ({source})")
+                self.message_store.update(chat_id, message_id, delivery_status="duplicate")
+                return
+
+        try:
+            with metrics.timer("translate"):
+                translated_text = await self.translation_stage.translate(formatted_text)
+            logging.info(f"📜 번역 결과: {translated_text}")
+        except Exception as e:
+            metrics.inc("translate_errors")
+            logging.error(f"⚠️ 번역 오류: {e}")
+            translated_text = "번역 실패"
+
+        if wait_for is not None:
+            await wait_for
+
+        final_message = f"[{source}]\n\n🔹 原文: {formatted_text}\n🔹 中文翻譯: {translated_text}"
+        queued = self.send_line_alert(final_message, key=(chat_id, message_id), received_at=received_at)
+        self.message_store.update(chat_id, message_id, translation=translated_text,
+                                  delivery_status="queued" if queued else "dropped")
+
+
+# 🔹 기본 설정으로 릴레이 만들기 (경로/옵션은 필요한 것만 바꿔서 사용)
+def create_relay(translator, line_access_token, line_recipients, message_db_path=MESSAGE_DB_PATH,
+                 line_outbox_path=LINE_OUTBOX_PATH, translation_cache_path=TRANSLATION_CACHE_PATH,
+                 dedup=True, line_api_base=None, line_workers=LINE_WORKERS, deduplicator=None, worker_name=None):
+    format_message = MessageNormalizer(remove_urls=REMOVE_URLS, mode=MESSAGE_FORMAT_MODE)
+    keyword_matcher = ChannelKeywordMatcher(FILTER_KEYWORDS, CHANNEL_FILTER_KEYWORDS)
+    # worker_name: 여러 프로세스가 DB를 같이 쓸 때 이 프로세스 이름 (supervisor.py)
+    #   → 테이블 준비는 prepare_storage()에서 미리 하고, LINE 대기열은 이 프로세스가 넣은 항목만 보내고 가져간 항목만 되살림
+    # deduplicator: 여러 프로세스가 같이 쓰는 중복 제거기 (supervisor.py), 없으면 프로세스 안에서 생성
+    if deduplicator is None and dedup:
+        deduplicator = NoticeDeduplicator(window=DEDUP_WINDOW, max_distance=DEDUP_MAX_DISTANCE)
+    translation_stage = TranslationStage(translator, source_lang=SOURCE_LANG, target_lang=TARGET_LANG,
+                                         cache=TranslationCache(translation_cache_path))
+    line_delivery = LineDelivery(line_access_token, line_recipients, workers=line_workers, queue_size=LINE_QUEUE_SIZE,
+                                 max_attempts=LINE_MAX_ATTEMPTS, api_base=line_api_base,
+                                 outbox=LineOutbox(line_outbox_path, owner=worker_name or LINE_OUTBOX_OWNER,
+                                                   prepare=worker_name is None))
+    message_store = MessageStore(message_db_path, flush_interval=1.0, prepare=worker_name is None)
+    return Relay(format_message, keyword_matcher, deduplicator, translation_stage, line_delivery, message_store)
+
+
+# 🔹 여러 프로세스가 같이 쓰기 전에 한 번만: 테이블/검색 색인 준비 + 전송 중이던 LINE 항목 되살리기
+def prepare_storage(message_db_path=MESSAGE_DB_PATH, line_outbox_path=LINE_OUTBOX_PATH):
+    connect(message_db_path).close()
+    outbox = LineOutbox(line_outbox_path)
+    try:
+        return outbox.recover()
+    finally:
+        outbox.close()
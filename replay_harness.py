@@ -0,0 +1,228 @@
+import os
+import json
+import time
+import random
+import asyncio
+import logging
+import argparse
+import tempfile
+from collections import namedtuple, Counter
+from aiohttp import web
+from log_corpus import load_messages
+from channels import MONITOR_CHANNELS
+from line_recipients import LineRecipients
+from relay import create_relay
+from metrics import metrics
+
+TextResult = namedtuple("TextResult", ["text"])
+
+# 🔹 보고서에 보여줄 단계 (순서대로)
+REPORT_STAGES = ["handle", "receive", "format", "filter", "dedup", "translate", "deepl_request", "line_http", "deliver", "e2e"]
+
+
+# 🔹 DeepL 대역 (지연 + 오류 주입, translate_text()만 흉내냄)
+class FakeTranslator:
+    def __init__(self, latency=0.3, per_text=0.005, error_rate=0.0):
+        self.latency = latency
+        self.per_text = per_text
+        self.error_rate = error_rate
+        self.calls = 0
+        self.texts = 0
+
+    def translate_text(self, texts, source_lang=None, target_lang=None):
+        self.calls += 1
+        single = isinstance(texts, str)
+        texts = [texts] if single else list(texts)
+        self.texts += len(texts)
+        time.sleep(self.latency * random.uniform(0.5, 1.5) + self.per_text * len(texts))
+        if random.random() < self.error_rate:
+            raise Exception("fake DeepL error (503)")
+        results = [TextResult(f"[{target_lang}] {text}") for text in texts]
+        return results[0] if single else results
+
+
+# 🔹 LINE API 대역 (push / multicast, 지연 + 500 / 429 응답 주입)
+class FakeLineServer:
+    def __init__(self, latency=0.1, error_rate=0.0, throttle_rate=0.0, retry_after=1):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.statuses = Counter()
+        self.messages = 0
+        self.runner = None
+        self.url = None
+
+    async def handle(self, request):
+        data = await request.json()
+        await asyncio.sleep(self.latency * random.uniform(0.5, 1.5))
+        roll = random.random()
+        if roll < self.throttle_rate:
+            status, headers = 429, {"Retry-After": str(self.retry_after)}
+        elif roll < self.throttle_rate + self.error_rate:
+            status, headers = 500, {}
+        else:
+            status, headers = 200, {}
+            self.messages += len(data["messages"])
+        self.statuses[status] += 1
+        return web.json_response({}, status=status, headers=headers)
+
+    async def start(self, host="127.0.0.1"):
+        app = web.Application()
+        app.router.add_post("/v2/bot/message/push", self.handle)
+        app.router.add_post("/v2/bot/message/multicast", self.handle)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, host, 0)
+        await site.start()
+        port = self.runner.addresses[0][1]
+        self.url = f"http://{host}:{port}"
+        return self.url
+
+    async def stop(self):
+        if self.runner is not None:
+            await self.runner.cleanup()
+
+
+# 🔹 코퍼스 → (보낼 시각 오프셋, 채널 ID, 메시지 ID, 텍스트) 목록
+# speed: 원래 간격을 몇 배로 줄일지 (1 = 실제 속도), max_gap: 원래 간격 상한 (밤새 조용한 구간 건너뛰기)
+# rate: 지정하면 원래 간격 대신 초당 rate개로 일정하게 보냄, burst: 전부 한꺼번에
+def build_schedule(corpus, speed=1.0, max_gap=5.0, rate=None, burst=False, repeat=1):
+    schedule = []
+    offset = 0.0
+    message_id = 0
+    previous = None
+    for _ in range(repeat):
+        for index, message in enumerate(corpus):
+            if burst:
+                gap = 0.0
+            elif rate:
+                gap = 1.0 / rate
+            elif previous is None:
+                gap = 0.0
+            else:
+                gap = min(max((message.timestamp - previous).total_seconds(), 0.0), max_gap) / speed
+            offset += gap
+            previous = message.timestamp
+            message_id += 1
+            chat_id = message.chat_id or MONITOR_CHANNELS[index % len(MONITOR_CHANNELS)]
+            schedule.append((offset, chat_id, message_id, message.text))
+    return schedule
+
+
+async def wait_for_drain(relay, timeout):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        counts = relay.line_delivery.outbox.counts()
+        if not counts.get("pending") and not counts.get("sending"):
+            return True
+        await asyncio.sleep(0.1)
+    return False
+
+
+def print_report(schedule, ingest_time, total_time, drained, translator, line_server):
+    snapshot = metrics.snapshot()
+    counters = snapshot["counters"]
+    sent = counters.get("line_sent", 0)
+    print()
+    print(f"메시지 {len(schedule)}개 / 투입 {ingest_time:.2f}초 / 전체 {total_time:.2f}초"
+          f"{'' if drained else ' (대기열이 다 비지 않음)'}")
+    print(f"  처리량: 투입 {len(schedule) / max(ingest_time, 1e-9):.1f} msg/s, "
+          f"LINE 전송 {sent / max(total_time, 1e-9):.1f} msg/s")
+    print()
+    print(f"{'단계':<14}{'count':>8}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}  (ms)")
+    for stage in REPORT_STAGES:
+        summary = snapshot["stages"].get(stage)
+        if not summary or "p50_ms" not in summary:
+            continue
+        print(f"{stage:<14}{summary['count']:>8}{summary['p50_ms']:>10.2f}{summary['p95_ms']:>10.2f}"
+              f"{summary['p99_ms']:>10.2f}{summary['max_ms']:>10.2f}")
+    print()
+    print(f"카운터: {json.dumps(counters, ensure_ascii=False, sort_keys=True)}")
+    print(f"DeepL 대역: 요청 {translator.calls}회, 텍스트 {translator.texts}개")
+    print(f"LINE 대역: 응답 {dict(line_server.statuses)}, 받은 메시지 {line_server.messages}개")
+
+
+async def run(args):
+    corpus = load_messages(args.log)
+    if args.limit:
+        corpus = corpus[:args.limit]
+    if not corpus:
+        raise SystemExit(f"{args.log}에서 수신된 메시지를 찾지 못했습니다")
+    schedule = build_schedule(corpus, args.speed, args.max_gap, args.rate, args.burst, args.repeat)
+
+    translator = FakeTranslator(args.deepl_latency, args.deepl_per_text, args.deepl_error_rate)
+    line_server = FakeLineServer(args.line_latency, args.line_error_rate, args.line_throttle_rate, args.retry_after)
+    line_url = await line_server.start()
+
+    with tempfile.TemporaryDirectory(prefix="relay_replay_") as workdir:
+        # 테스트용 수신자 (그룹 파일은 읽지 않음)
+        user_ids = [f"U{i:032x}" for i in range(args.users)]
+        relay = create_relay(
+            translator, "replay-token", LineRecipients(user_ids, groups_path=None),
+            message_db_path=os.path.join(workdir, "test.db"),
+            line_outbox_path=os.path.join(workdir, "line_outbox.db"),
+            translation_cache_path=os.path.join(workdir, "translation_cache.json"),
+            dedup=not args.no_dedup, line_api_base=line_url, line_workers=args.line_workers,
+        )
+        relay.register_gauges()
+        await relay.start()
+
+        async def replay_one(chat_id, message_id, text):
+            with metrics.timer("handle"):
+                await relay.handle(chat_id, message_id, text)
+
+        print(f"▶️ {len(corpus)}개 메시지 x {args.repeat} 재생 "
+              f"({'burst' if args.burst else f'{args.rate} msg/s' if args.rate else f'{args.speed}배속'})")
+        tasks = []
+        started = time.monotonic()
+        # Telethon처럼 메시지마다 태스크 하나씩
+        for offset, chat_id, message_id, text in schedule:
+            delay = started + offset - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(replay_one(chat_id, message_id, text)))
+        await asyncio.gather(*tasks)
+        ingest_time = time.monotonic() - started
+
+        drained = await wait_for_drain(relay, args.drain_timeout)
+        total_time = time.monotonic() - started
+        await relay.stop()
+        await line_server.stop()
+        relay.line_delivery.outbox.close()
+
+    print_report(schedule, ingest_time, total_time, drained, translator, line_server)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="telegram_bot.log 재생으로 릴레이 부하 테스트 (DeepL / LINE은 로컬 대역)")
+    parser.add_argument("--log", default="telegram_bot.log")
+    parser.add_argument("--speed", type=float, default=10.0, help="원래 간격 대비 배속 (1, 10, 100 ...)")
+    parser.add_argument("--max-gap", type=float, default=5.0, help="원래 메시지 간격 상한 (초)")
+    parser.add_argument("--rate", type=float, help="원래 간격 대신 초당 메시지 수로 고정")
+    parser.add_argument("--burst", action="store_true", help="모든 메시지를 한꺼번에 투입")
+    parser.add_argument("--repeat", type=int, default=1, help="코퍼스 반복 횟수")
+    parser.add_argument("--limit", type=int, help="코퍼스 앞부분 N개만 사용")
+    parser.add_argument("--no-dedup", action="store_true", help="중복 제거 끄기 (반복 재생 시 전부 전송)")
+    parser.add_argument("--users", type=int, default=1, help="LINE 수신자 수 (2명 이상이면 multicast)")
+    parser.add_argument("--line-workers", type=int, default=4)
+    parser.add_argument("--deepl-latency", type=float, default=0.3, help="DeepL 요청당 지연 (초)")
+    parser.add_argument("--deepl-per-text", type=float, default=0.005, help="DeepL 텍스트당 추가 지연 (초)")
+    parser.add_argument("--deepl-error-rate", type=float, default=0.0)
+    parser.add_argument("--line-latency", type=float, default=0.1, help="LINE 요청당 지연 (초)")
+    parser.add_argument("--line-error-rate", type=float, default=0.0, help="500 응답 비율")
+    parser.add_argument("--line-throttle-rate", type=float, default=0.0, help="429 응답 비율")
+    parser.add_argument("--retry-after", type=int, default=1, help="429 응답의 Retry-After (초)")
+    parser.add_argument("--drain-timeout", type=float, default=120.0, help="LINE 대기열이 빌 때까지 기다릴 최대 시간 (초)")
+    parser.add_argument("--verbose", action="store_true", help="릴레이 로그 출력")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
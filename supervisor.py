@@ -0,0 +1,291 @@
+import os
+import asyncio
+import logging
+import argparse
+import multiprocessing
+from multiprocessing.managers import BaseManager
+from telethon import TelegramClient, events
+import deepl
+from dotenv import load_dotenv
+from line_recipients import LineRecipients, parse_ids, LINE_GROUPS_PATH
+from relay import create_relay, prepare_storage, DEDUP_WINDOW, DEDUP_MAX_DISTANCE, TRANSLATION_CACHE_PATH
+from dedup import NoticeDeduplicator
+from channels import MONITOR_CHANNELS
+from metrics import metrics
+
+# 🔹 환경 변수 파일 (telegram.py와 같음)
+ENV_PATH = '/Users/sonjuwon/Desktop/python workplace/.env'
+
+# 🔹 워커 프로세스 수 / 워커별 IPC 큐 크기
+WORKER_PROCESSES = 4
+IPC_QUEUE_SIZE = 10000
+
+# 🔹 워커 생존 확인 주기 (초) / 워커별 재시작 한도 (넘으면 전체 종료)
+WORKER_CHECK_INTERVAL = 5
+WORKER_MAX_RESTARTS = 5
+
+# 🔹 True면 test.py처럼 가입한 모든 채팅을 받음 (MONITOR_CHANNELS 밖은 출처 "알 수 없음")
+LISTEN_ALL_CHATS = False
+
+# 🔹 지표 (주기적 로그 + 로컬 엔드포인트: 수신 프로세스 = METRICS_PORT, 워커 n = METRICS_PORT + 1 + n, METRICS_PORT=0이면 엔드포인트 없음)
+METRICS_LOG_INTERVAL = 60
+
+
+def setup_logging(name):
+    logging.basicConfig(
+        level=logging.INFO,
+        format=f"%(asctime)s - %(levelname)s - [{name}] %(message)s",
+        handlers=[logging.FileHandler("telegram_bot.log"), logging.StreamHandler()]
+    )
+
+
+# 🔹 채널 ID → 워커 번호 (같은 채널은 항상 같은 워커로 가서 순서가 유지됨)
+def shard_for(chat_id, workers):
+    return abs(chat_id) % workers
+
+
+# 🔹 채널 간 중복 공지 제거는 모든 워커가 하나를 같이 씀 (별도 관리 프로세스)
+class DedupManager(BaseManager):
+    pass
+
+
+DedupManager.register("NoticeDeduplicator", NoticeDeduplicator, exposed=("check", "__len__"))
+
+
+# 🔹 워커 안의 채널별 순서 유지
+# 메시지마다 태스크를 만들어 번역은 동시에 진행하고,
+# 같은 채널의 앞 메시지가 LINE 대기열에 들어간 뒤에만 다음 메시지를 넣는다.
+class ChannelLanes:
+    def __init__(self, relay):
+        self.relay = relay
+        self.tails = {}
+        self.tasks = set()
+
+    def submit(self, chat_id, message_id, message_text, date):
+        previous = self.tails.get(chat_id)
+        done = asyncio.get_running_loop().create_future()
+        self.tails[chat_id] = done
+        task = asyncio.create_task(self._run(chat_id, message_id, message_text, date, previous, done))
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    async def _run(self, chat_id, message_id, message_text, date, previous, done):
+        try:
+            await self.relay.handle(chat_id, message_id, message_text, date, wait_for=previous)
+        except Exception as e:
+            metrics.inc("handler_errors")
+            logging.error(f"❌ 메시지 처리 오류 ({chat_id}/{message_id}): {e}")
+        finally:
+            # 필터링/중복으로 일찍 끝난 메시지도 앞 메시지가 끝난 뒤에 완료 처리
+            if previous is not None:
+                await previous
+            done.set_result(None)
+            if self.tails.get(chat_id) is done:
+                del self.tails[chat_id]
+
+    async def join(self):
+        while self.tasks:
+            await asyncio.gather(*list(self.tasks), return_exceptions=True)
+
+
+async def run_worker(shard, ipc_queue, deduplicator, metrics_port):
+    translator = deepl.Translator(os.getenv("DEEPL_API_KEY"))
+    line_recipients = LineRecipients(
+        parse_ids(os.getenv("USER_ID")) + parse_ids(os.getenv("LINE_USER_IDS")),
+        parse_ids(os.getenv("LINE_GROUP_IDS")), LINE_GROUPS_PATH
+    )
+    # 번역 캐시 파일은 워커마다 따로 씀 (한 파일을 여러 프로세스가 덮어쓰지 않도록)
+    cache_path = f"{os.path.splitext(TRANSLATION_CACHE_PATH)[0]}.{shard}.json"
+    # 테이블 준비 / LINE 대기열 복구는 supervisor가 워커 시작 전에 한 번 함 (워커는 자기가 넣은 항목만 보내고, 가져간 항목만 되살림)
+    relay = create_relay(translator, os.getenv("LINE_ACCESS_TOKEN"), line_recipients,
+                         translation_cache_path=cache_path, deduplicator=deduplicator, worker_name=f"worker-{shard}")
+    relay.register_gauges()
+    lanes = ChannelLanes(relay)
+    metrics.register_gauge("channel_lanes", lambda: len(lanes.tails))
+
+    await relay.start()
+    metrics_server = await metrics.serve(port=metrics_port)
+    metrics_reporter = asyncio.create_task(metrics.report_forever(METRICS_LOG_INTERVAL))
+    logging.info(f"🧵 워커 {shard} 시작")
+    try:
+        while True:
+            item = await asyncio.to_thread(ipc_queue.get)
+            if item is None:
+                break
+            metrics.inc("ipc_received")
+            lanes.submit(*item)
+        await lanes.join()
+    finally:
+        metrics_reporter.cancel()
+        if metrics_server is not None:
+            metrics_server.close()
+        await relay.stop()
+        logging.info(f"🧵 워커 {shard} 종료")
+
+
+# 🔹 워커 프로세스 진입점 (spawn으로 시작되므로 최상위 함수여야 함)
+def worker_main(shard, ipc_queue, deduplicator, metrics_port):
+    load_dotenv(dotenv_path=ENV_PATH)
+    setup_logging(f"worker {shard}")
+    try:
+        asyncio.run(run_worker(shard, ipc_queue, deduplicator, metrics_port))
+    except KeyboardInterrupt:
+        pass
+
+
+# 🔹 워커 프로세스 관리 (죽은 워커는 같은 IPC 큐로 다시 시작 → 그 채널들의 메시지가 큐에 쌓이기만 하지 않도록)
+class WorkerProcesses:
+    def __init__(self, ctx, ipc_queues, deduplicator, metrics_port, max_restarts=WORKER_MAX_RESTARTS):
+        self.ctx = ctx
+        self.ipc_queues = ipc_queues
+        self.deduplicator = deduplicator
+        self.metrics_port = metrics_port
+        self.max_restarts = max_restarts
+        self.processes = [None] * len(ipc_queues)
+        self.restarts = [0] * len(ipc_queues)
+
+    def start(self, shard):
+        metrics_port = self.metrics_port and self.metrics_port + 1 + shard
+        process = self.ctx.Process(
+            target=worker_main, args=(shard, self.ipc_queues[shard], self.deduplicator, metrics_port),
+            name=f"relay-worker-{shard}", daemon=True
+        )
+        process.start()
+        self.processes[shard] = process
+
+    def start_all(self):
+        for shard in range(len(self.processes)):
+            self.start(shard)
+
+    # 🔹 주기적으로 생존 확인 (재시작 한도를 넘으면 예외 → 수신 프로세스 종료)
+    async def watch(self, interval=WORKER_CHECK_INTERVAL):
+        while True:
+            await asyncio.sleep(interval)
+            for shard, process in enumerate(self.processes):
+                if process.is_alive():
+                    continue
+                metrics.inc("worker_exits")
+                if self.restarts[shard] >= self.max_restarts:
+                    raise RuntimeError(f"워커 {shard} 재시작 한도 초과 (exit code {process.exitcode})")
+                self.restarts[shard] += 1
+                logging.error(f"💥 워커 {shard} 종료됨 (exit code {process.exitcode}) - 다시 시작 "
+                              f"({self.restarts[shard]}/{self.max_restarts})")
+                self.start(shard)
+
+    def join(self, timeout=30):
+        for process in self.processes:
+            if process is None:
+                continue
+            process.join(timeout=timeout)
+            if process.is_alive():
+                process.terminate()
+
+
+# 🔹 수신 프로세스 → 워커 큐
+# 핸들러는 메모리 버퍼에 넣기만 하고, 워커별 전달 태스크가 순서대로 IPC 큐에 넣는다 (큐가 가득 차도 루프를 막지 않음).
+class ShardRouter:
+    def __init__(self, ipc_queues):
+        self.ipc_queues = ipc_queues
+        self.buffers = [asyncio.Queue() for _ in ipc_queues]
+        self._tasks = []
+
+    def start(self):
+        self._tasks = [asyncio.create_task(self._forward(shard)) for shard in range(len(self.ipc_queues))]
+        for shard, buffer in enumerate(self.buffers):
+            metrics.register_gauge(f"shard_{shard}_buffer", buffer.qsize)
+
+    def route(self, chat_id, message_id, message_text, date):
+        shard = shard_for(chat_id, len(self.ipc_queues))
+        self.buffers[shard].put_nowait((chat_id, message_id, message_text, date))
+        metrics.inc(f"shard_{shard}_routed")
+
+    async def _forward(self, shard):
+        buffer, ipc_queue = self.buffers[shard], self.ipc_queues[shard]
+        while True:
+            item = await buffer.get()
+            try:
+                ipc_queue.put_nowait(item)
+            except Exception:
+                metrics.inc("ipc_queue_full")
+                await asyncio.to_thread(ipc_queue.put, item)
+            buffer.task_done()
+
+    # 🔹 버퍼를 비우고 워커에게 종료 신호
+    async def stop(self):
+        for buffer in self.buffers:
+            await buffer.join()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        for ipc_queue in self.ipc_queues:
+            await asyncio.to_thread(ipc_queue.put, None)
+
+
+async def run_ingest(client, router, workers, all_chats, metrics_port):
+    chats = None if all_chats else MONITOR_CHANNELS
+
+    @client.on(events.NewMessage(chats=chats))
+    async def handler(event):
+        metrics.inc("received")
+        router.route(event.chat_id, event.message.id, event.message.message, event.message.date)
+
+    logging.info("🚀 클라이언트 실행 중... 메시지를 기다리는 중...")
+    await client.start()
+    router.start()
+    metrics_server = await metrics.serve(port=metrics_port)
+    metrics_reporter = asyncio.create_task(metrics.report_forever(METRICS_LOG_INTERVAL))
+    # 워커를 다시 살릴 수 없으면 연결을 끊어 종료
+    watcher = asyncio.create_task(workers.watch())
+    watcher.add_done_callback(lambda task: task.cancelled() or asyncio.ensure_future(client.disconnect()))
+    try:
+        await client.run_until_disconnected()
+    finally:
+        failed = watcher.done() and not watcher.cancelled() and watcher.exception() is not None
+        watcher.cancel()
+        metrics_reporter.cancel()
+        if metrics_server is not None:
+            metrics_server.close()
+        # 죽은 워커의 큐는 비워지지 않으므로 남은 메시지를 기다리지 않음
+        if not failed:
+            await router.stop()
+    if failed:
+        raise watcher.exception()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="텔레그램 수신 프로세스 1개 + 채널별로 나눠 처리하는 워커 프로세스 N개")
+    parser.add_argument("--workers", type=int, default=WORKER_PROCESSES)
+    parser.add_argument("--all-chats", action="store_true", default=LISTEN_ALL_CHATS, help="가입한 모든 채팅 수신 (test.py)")
+    args = parser.parse_args()
+
+    load_dotenv(dotenv_path=ENV_PATH)
+    setup_logging("ingest")
+    metrics_port = int(os.getenv("METRICS_PORT", "9108"))
+
+    ctx = multiprocessing.get_context("spawn")
+    dedup_manager = DedupManager(ctx=ctx)
+    dedup_manager.start()
+    deduplicator = dedup_manager.NoticeDeduplicator(window=DEDUP_WINDOW, max_distance=DEDUP_MAX_DISTANCE)
+
+    # 🔹 테이블/검색 색인 준비 + 전송 중이던 LINE 항목 되살리기 (워커가 하나도 돌기 전에 한 번만)
+    recovered = prepare_storage()
+    if recovered:
+        logging.info(f"♻️ 전송 중이던 LINE 메시지 {recovered}개 다시 대기열에 넣음")
+
+    ipc_queues = [ctx.Queue(maxsize=IPC_QUEUE_SIZE) for _ in range(args.workers)]
+    workers = WorkerProcesses(ctx, ipc_queues, deduplicator, metrics_port)
+    workers.start_all()
+    logging.info(f"🧵 워커 프로세스 {args.workers}개 시작 (채널 ID % {args.workers})")
+
+    client = TelegramClient('session_name', int(os.getenv("API_ID")), os.getenv("API_HASH"))
+    router = ShardRouter(ipc_queues)
+    try:
+        with client:
+            client.loop.run_until_complete(run_ingest(client, router, workers, args.all_chats, metrics_port))
+    finally:
+        workers.join(timeout=30)
+        dedup_manager.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,13 @@
-import re
 import os
-import requests
+import asyncio
 import logging
 from telethon import TelegramClient, events
 import deepl
 from dotenv import load_dotenv
+from line_recipients import LineRecipients, parse_ids, LINE_GROUPS_PATH
+from relay import create_relay
+from channels import MONITOR_CHANNELS
+from metrics import metrics
 
 # 🔹 환경 변수 로드
 load_dotenv(dotenv_path='/Users/sonjuwon/Desktop/python workplace/.env')
@@ -25,99 +28,42 @@ DEEPL_API_KEY = os.getenv("DEEPL_API_KEY")
 translator = deepl.Translator(DEEPL_API_KEY)
 LINE_ACCESS_TOKEN = os.getenv("LINE_ACCESS_TOKEN")
 USER_ID = os.getenv("USER_ID")
-
-# 🔹 모니터링할 채널 ID
-MONITOR_CHANNELS = [-1001219894832, -1001202540487, -1001363666182, -1001606488817, -1001386345244]
-
-# 🔹 채널 출처 매핑
-CHANNEL_SOURCE_MAP = {
-    -1001219894832: "Upbit",
-    -1001202540487: "Bithumb",
-    -1001363666182: "블록미디어",
-    -1001606488817: "블루밍비트",
-    -1001386345244: "코인니스"
-}
-
-# 🔹 필터링 키워드
-FILTER_KEYWORDS = ["코인", "체인", "거래", "입출금", "코인", "마켓추가", "거래지원"]
-FILTER_KEYWORDS = [k.lower().replace(" ", "") for k in FILTER_KEYWORDS]
-
-# 🔹 URL 제거 여부
-REMOVE_URLS = False
+# 🔹 추가 수신자 (쉼표로 구분) - webhook.py가 감지한 그룹은 line_groups.json에서 자동으로 읽음
+LINE_USER_IDS = parse_ids(os.getenv("LINE_USER_IDS"))
+LINE_GROUP_IDS = parse_ids(os.getenv("LINE_GROUP_IDS"))
 
 # 🔹 TelegramClient 생성
 client = TelegramClient('session_name', api_id, api_hash)
 
-# 🔹 LINE 알림 전송 함수
-def send_line_alert(message, retry_count=3):
-    url = "https://api.line.me/v2/bot/message/push"
-    headers = {
-        "Authorization": f"Bearer {LINE_ACCESS_TOKEN}",
-        "Content-Type": "application/json"
-    }
-    data = {
-        "to": USER_ID,
-        "messages": [{"type": "text", "text": message}]
-    }
-
-    for attempt in range(retry_count):
-        try:
-            response = requests.post(url, headers=headers, json=data)
-            if response.status_code == 200:
-                logging.info(f"📩 LINE 메시지 전송 성공: {message}")
-                return
-            else:
-                logging.warning(f"⚠️ LINE 메시지 전송 실패 ({response.status_code})")
-        except requests.RequestException as e:
-            logging.error(f"❌ LINE API 오류: {e}")
-
-# 🔹 메시지 정리 함수
-def format_message(text):
-    if REMOVE_URLS:
-        # 중간에 공백이 포함된 URL까지 제거
-        text = re.sub(r'https?:\/\/(?:[\w\-]+\.)+[a-zA-Z]{2,}(?:\s*\.\s*\w+)*(?:\/[\w\-\/\.\?\=\#\&\%\~]*)?', '', text)
-        # 남아있는 공백 정리
-        text = re.sub(r'\s+\.\s+', '.', text)
-    text = re.sub(r'([.!?])', r'\1\n', text)
-    text = re.sub(r'\s+', ' ', text).strip()
-    return text
+# 🔹 릴레이 파이프라인 (정리 → 필터 → 중복 제거 → 번역 → LINE 전송, 설정은 relay.py)
+line_recipients = LineRecipients(parse_ids(USER_ID) + LINE_USER_IDS, LINE_GROUP_IDS, LINE_GROUPS_PATH)
+relay = create_relay(translator, LINE_ACCESS_TOKEN, line_recipients)
 
 
 # 🔹 메시지 핸들러
 @client.on(events.NewMessage(chats=MONITOR_CHANNELS))
 async def handler(event):
-    message_text = event.message.message.strip()
-    formatted_text = format_message(message_text)
-    chat_id = event.chat_id
-    source = CHANNEL_SOURCE_MAP.get(chat_id, "알 수 없음")
-
-    logging.info(f"📌 채널 ID: {chat_id} (출처: {source})")
-    logging.info(f"📩 수신된 메시지: {formatted_text}")
-
-    if any(keyword in formatted_text.lower().replace(" ", "") for keyword in FILTER_KEYWORDS):
-        logging.info(f"✅ 필터링됨 메시지")
-        if "안녕하세요" in formatted_text:
-            formatted_text = formatted_text.split("안녕하세요")[0].strip()
-            logging.info(f"✂️ '안녕하세요' 이후 삭제됨: {formatted_text}")
-
-
-        try:
-            translated_text = translator.translate_text(formatted_text, source_lang="KO", target_lang="ZH-HANT").text
-            logging.info(f"📜 번역 결과: {translated_text}")
-        except Exception as e:
-            logging.error(f"⚠️ 번역 오류: {e}")
-            translated_text = "번역 실패"
+    await relay.handle(event.chat_id, event.message.id, event.message.message, event.message.date)
 
-        final_message = f"[{source}]\n\n🔹 原文: {formatted_text}\n🔹 中文翻譯: {translated_text}"
-        send_line_alert(final_message)
-    else:
-        logging.info(f"❌ 필터링되지 않음 ({source})")
+# 🔹 지표 (주기적 로그 + 로컬 엔드포인트, METRICS_PORT=0이면 엔드포인트 없음)
+METRICS_LOG_INTERVAL = 60
+METRICS_PORT = int(os.getenv("METRICS_PORT", "9108"))
+relay.register_gauges()
 
 # 🔹 클라이언트 실행
 async def main():
     logging.info("🚀 클라이언트 실행 중... 메시지를 기다리는 중...")
     await client.start()
-    await client.run_until_disconnected()
+    await relay.start()
+    metrics_server = await metrics.serve(port=METRICS_PORT)
+    metrics_reporter = asyncio.create_task(metrics.report_forever(METRICS_LOG_INTERVAL))
+    try:
+        await client.run_until_disconnected()
+    finally:
+        metrics_reporter.cancel()
+        if metrics_server is not None:
+            metrics_server.close()
+        await relay.stop()
 
 with client:
     client.loop.run_until_complete(main())
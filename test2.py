@@ -2,6 +2,7 @@ import os
 import logging
 from telethon import TelegramClient, events
 from dotenv import load_dotenv
+from keyword_matcher import KeywordMatcher
 
 # .env 파일 로드
 load_dotenv()
@@ -23,7 +24,7 @@ client = TelegramClient('session_name', api_id, api_hash)
 
 # 필터링할 단어 설정
 filter_word = ["점검", "거래", "입출금", "마켓추가", "거래지원", "유의촉구", "거래유의", "코인", "증시", "체인"]
-filter_word = [k.lower().replace(" ", "") for k in filter_word]
+filter_matcher = KeywordMatcher(filter_word)
 
 # 메시지 핸들러 (모든 채널의 메시지 수신)
 @client.on(events.NewMessage())
@@ -33,7 +34,7 @@ async def handler(event):
     chat_id = event.chat_id
 
     # 특정 단어가 메시지에 포함되어 있는지 확인
-    if filter_word in message_text:
+    if filter_matcher.matches(message_text):
         # 채널 ID와 메시지 출력 (디버깅용)
         print(f"📩 채널 ID: {chat_id}")
         print(f"📩 수신된 메시지: {message_text}")
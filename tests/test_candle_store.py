@@ -0,0 +1,37 @@
+import os
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("ccxt")
+pytest.importorskip("requests")
+from candle_store import CandleStore, CANDLE_COLUMNS, TIMEFRAME_MS
+
+
+def candles(count, timeframe="1m"):
+    timestamps = np.arange(count, dtype="int64") * TIMEFRAME_MS[timeframe]
+    return pd.DataFrame({column: timestamps if column == "timestamp" else np.arange(count, dtype="float64")
+                         for column in CANDLE_COLUMNS})
+
+
+def test_load_skips_stray_files(tmp_path):
+    store = CandleStore(str(tmp_path), chunk_bars=4)
+    df = candles(10)
+    store.save("upbit", "KRW-XRP", "1m", df)
+    path = store.path("upbit", "KRW-XRP", "1m")
+    # 맥 Finder가 남기는 파일 / 쓰다 만 조각
+    for name in (".DS_Store", "._0.npz", "2.npz.tmp"):
+        with open(os.path.join(path, name), "wb") as f:
+            f.write(b"junk")
+    loaded = CandleStore(str(tmp_path), chunk_bars=4).load("upbit", "KRW-XRP", "1m")
+    pd.testing.assert_frame_equal(loaded, df)
+
+
+def test_chunks_load_in_numeric_order(tmp_path):
+    store = CandleStore(str(tmp_path), chunk_bars=2)
+    df = candles(25)
+    store.save("binance", "XRP/USDT", "1m", df)
+    # 조각 번호 10 이상 → 문자열 순서("10.npz" < "2.npz")가 아니라 숫자 순서로 읽어야 함
+    assert len(os.listdir(store.path("binance", "XRP/USDT", "1m"))) == 13
+    loaded = CandleStore(str(tmp_path), chunk_bars=2).load("binance", "XRP/USDT", "1m")
+    pd.testing.assert_frame_equal(loaded, df)
@@ -0,0 +1,57 @@
+import time
+from datetime import date, timedelta
+import pandas as pd
+import pytest
+
+pytest.importorskip("yahoo_fin")
+from fx_rates import FxRateStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = FxRateStore(path=str(tmp_path / "usd_to_krw.csv"), seed_path=None, refresh_interval=3600)
+    today = date.today()
+    days = pd.date_range(today - timedelta(days=9), today)
+    store.rates = pd.Series(1300.0 + 10 * pd.RangeIndex(10), index=days, dtype="float64", name="usd_to_krw")
+    return store
+
+
+def test_today_is_refetched_after_refresh_interval(store):
+    # 오늘 장중 값이 이미 저장돼 있어도 refresh_interval이 지나면 오늘부터 다시 받음
+    today = date.today()
+    store.refreshed_at = 0.0
+    assert store.missing_ranges(today - timedelta(days=7), today) == [(today, today)]
+    assert store.missing_ranges(today - timedelta(days=12), today) == [(today - timedelta(days=12), today - timedelta(days=10)),
+                                                                       (today, today)]
+
+
+def test_today_is_not_refetched_within_refresh_interval(store):
+    today = date.today()
+    store.refreshed_at = time.time()
+    assert store.missing_ranges(today - timedelta(days=1), today) == []
+    # 뒤쪽이 비어 있어도 refresh_interval 안에는 다시 받지 않음 (주말/휴일에 매번 요청하지 않도록)
+    assert store.missing_ranges(today - timedelta(days=1), today + timedelta(days=1)) == []
+
+
+def test_past_range_is_not_refetched(store):
+    today = date.today()
+    store.refreshed_at = 0.0
+    assert store.missing_ranges(today - timedelta(days=2), today - timedelta(days=1)) == []
+
+
+def test_latest_picks_up_refetched_rate(store, monkeypatch):
+    today = date.today()
+    store.refreshed_at = 0.0
+    fetched = []
+
+    def fetch(start_date, end_date):
+        fetched.append((start_date, end_date))
+        return pd.Series([1333.0], index=pd.to_datetime([today]), name="usd_to_krw")
+
+    monkeypatch.setattr("fx_rates.fetch_usd_to_krw_range", fetch)
+    assert store.latest() == 1333.0
+    assert (today, today) in fetched
+    # 저장 후에는 refresh_interval 동안 다시 받지 않음
+    fetched.clear()
+    assert store.latest() == 1333.0
+    assert fetched == []
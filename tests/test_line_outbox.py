@@ -0,0 +1,77 @@
+import time
+import pytest
+from line_outbox import LineOutbox
+
+USER = ("push", "U1")
+GROUP = ("push", "G1")
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "line_outbox.db")
+
+
+def open_outbox(path, owner):
+    return LineOutbox(path, owner=owner)
+
+
+def messages(items):
+    return [item.message for item in items]
+
+
+def test_claims_only_own_keyed_rows(path):
+    worker0, worker1 = open_outbox(path, "worker-0"), open_outbox(path, "worker-1")
+    worker0.put([USER], "w0", key=(1, 1))
+    worker1.put([GROUP], "w1", key=(2, 1))
+    assert messages(worker0.claim_batch(5)) == ["w0"]
+    assert worker0.claim_batch(5) == []
+    assert messages(worker1.claim_batch(5)) == ["w1"]
+
+
+def test_keyless_and_legacy_rows_are_shared(path):
+    alerts, worker = open_outbox(path, "premium_alerts"), open_outbox(path, "worker-0")
+    alerts.put([USER], "alert")
+    # 이전 버전이 넣은 항목 (enqueued_by 없음)
+    with alerts.conn:
+        alerts.conn.execute("UPDATE line_outbox SET enqueued_by = NULL")
+    legacy = open_outbox(path, None)
+    legacy.put([GROUP], "legacy", key=(3, 1))
+    assert sorted(messages(worker.claim_batch(5) + worker.claim_batch(5))) == ["alert", "legacy"]
+
+
+def test_one_batch_in_flight_per_target(path):
+    outbox = open_outbox(path, "relay")
+    for i in range(7):
+        outbox.put([USER], f"m{i}", key=(1, i))
+    outbox.put([GROUP], "g0", key=(2, 0))
+    first = outbox.claim_batch(5)
+    assert messages(first) == ["m0", "m1", "m2", "m3", "m4"]
+    # 같은 대상은 앞 묶음이 끝날 때까지 가져가지 않음 (다른 대상은 가져감)
+    assert messages(outbox.claim_batch(5)) == ["g0"]
+    assert outbox.claim_batch(5) == []
+    # 다른 프로세스도 같은 대상은 가져가지 않음
+    assert open_outbox(path, None).claim_batch(5) == []
+    outbox.done([item.id for item in first])
+    assert messages(outbox.claim_batch(5)) == ["m5", "m6"]
+
+
+def test_retry_keeps_target_order(path):
+    outbox = open_outbox(path, "relay")
+    outbox.put([USER], "m0", key=(1, 0))
+    outbox.put([USER], "m1", key=(1, 1))
+    first = outbox.claim_batch(1)
+    outbox.retry_later([item.id for item in first], 60, "HTTP 500")
+    # m0이 재시도 대기 중이면 m1이 앞지르지 않음
+    assert outbox.claim_batch(5) == []
+    later = outbox.claim_batch(5, now=time.time() + 120)
+    assert messages(later) == ["m0", "m1"]
+
+
+def test_recover_own_claims(path):
+    worker0, worker1 = open_outbox(path, "worker-0"), open_outbox(path, "worker-1")
+    worker0.put([USER], "w0", key=(1, 1))
+    worker1.put([GROUP], "w1", key=(2, 1))
+    worker0.claim_batch(5)
+    worker1.claim_batch(5)
+    assert worker0.recover() == 1
+    assert worker0.counts() == {"pending": 1, "sending": 1}
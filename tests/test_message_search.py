@@ -0,0 +1,73 @@
+import sqlite3
+import pytest
+from message_search import prepare_search_index, rebuild_search_index, search_messages
+from message_store import connect
+
+MESSAGES = [
+    (1, "업비트 Telegram 공지 - 신규 상장", "2025-01-03 23:12:14+00:00"),
+    (2, "빗썸 입출금 일시 중단", "2025-01-04 01:00:00+00:00"),
+    (3, "Telegram 채널 점검 안내", "2025-01-05 02:30:00+00:00"),
+]
+
+
+# 🔹 예전 test.db와 같은 테이블 (id, message, created_at만 있음)
+@pytest.fixture
+def legacy_db(tmp_path):
+    path = str(tmp_path / "test.db")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE messages (id INTEGER PRIMARY KEY, message TEXT, created_at DATETIME)")
+    conn.executemany("INSERT INTO messages VALUES (?, ?, ?)", MESSAGES)
+    conn.commit()
+    conn.close()
+    return path
+
+
+def like_count(conn, term):
+    return conn.execute("SELECT count(*) FROM messages WHERE message LIKE ? OR translation LIKE ?",
+                        (f"%{term}%", f"%{term}%")).fetchone()[0]
+
+
+def test_connect_indexes_existing_messages(legacy_db):
+    conn = connect(legacy_db)
+    results = search_messages(conn, "Telegram")
+    assert len(results) == like_count(conn, "Telegram") == 2
+    assert {result.id for result in results} == {1, 3}
+
+
+def test_failed_prepare_leaves_no_index(legacy_db):
+    # translation 컬럼이 없으면 전체 색인이 실패 → 색인 테이블도 남지 않아야 다음에 다시 만듦
+    conn = sqlite3.connect(legacy_db)
+    with pytest.raises(sqlite3.OperationalError):
+        prepare_search_index(conn)
+    assert conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'messages_fts'").fetchone() is None
+    conn.close()
+    assert len(search_messages(connect(legacy_db), "Telegram")) == 2
+
+
+def test_empty_index_is_rebuilt(legacy_db):
+    # 예전 버전이 색인 테이블만 만들고 전체 색인을 못 한 DB
+    conn = sqlite3.connect(legacy_db)
+    conn.execute("ALTER TABLE messages ADD COLUMN translation TEXT")
+    conn.execute("CREATE VIRTUAL TABLE messages_fts USING fts5(message, translation, content='messages', "
+                 "content_rowid='id', tokenize='trigram')")
+    conn.commit()
+    conn.close()
+    conn = connect(legacy_db)
+    assert len(search_messages(conn, "Telegram")) == 2
+
+
+def test_new_rows_and_updates_are_indexed(legacy_db):
+    conn = connect(legacy_db)
+    conn.execute("INSERT INTO messages (id, message, created_at) VALUES (4, 'Telegram 봇 공지', '2025-01-06')")
+    conn.execute("UPDATE messages SET translation = '電報公告' WHERE id = 2")
+    conn.commit()
+    assert {result.id for result in search_messages(conn, "Telegram")} == {1, 3, 4}
+    assert [result.id for result in search_messages(conn, "電報公告")] == [2]
+    # 짧은 검색어는 LIKE
+    assert [result.id for result in search_messages(conn, "빗썸")] == [2]
+
+
+def test_rebuild_with_other_tokenizer(legacy_db):
+    conn = connect(legacy_db)
+    rebuild_search_index(conn, "unicode61")
+    assert {result.id for result in search_messages(conn, "Telegram")} == {1, 3}
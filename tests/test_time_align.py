@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+import pytest
+from time_align import align_series, candle_series, daily_series
+
+
+def candles(start, freq, count, price):
+    timestamps = pd.date_range(start, periods=count, freq=freq)  # UTC 봉 시작 (시간대 없음)
+    return pd.DataFrame({"timestamp": timestamps, "close": np.full(count, price)})
+
+
+def fx(days, rates):
+    return pd.Series(rates, index=[pd.Timestamp(day).date() for day in days], name="usd_to_krw")
+
+
+# 🔹 김프 계산과 같은 정렬 (두 거래소 + KST 날짜별 환율)
+def premium_frame(freq, count, start):
+    rates = fx(["2024-03-03", "2024-03-04", "2024-03-05"], [1300.0, 1310.0, 1320.0])
+    return align_series({
+        "close_binance": candle_series(candles(start, freq, count, 0.5)),
+        "close_upbit": candle_series(candles(start, freq, count, 700.0)),
+        "usd_to_krw": daily_series(rates),
+    }, freq=pd.Timedelta(freq), tolerance={"usd_to_krw": pd.Timedelta(days=1)},
+        fill={"close_binance": "drop", "close_upbit": "drop", "usd_to_krw": "ffill"},
+        anchor=["close_binance", "close_upbit"], how="intersection")
+
+
+@pytest.mark.parametrize("freq", ["1min", "1h"])
+def test_intraday_grid_gets_daily_fx(freq):
+    # 2024-03-04 06:00 UTC = 15:00 KST → KST 3/4 환율, 15:00 UTC(3/5 00:00 KST)부터는 3/5 환율
+    aligned = premium_frame(freq, 100 if freq == "1min" else 24, "2024-03-04 06:00")
+    assert len(aligned) == (100 if freq == "1min" else 24)
+    assert aligned["usd_to_krw"].notna().all()
+    kst_day = aligned.index.tz_convert("Asia/Seoul").date
+    expected = np.where(kst_day == pd.Timestamp("2024-03-05").date(), 1320.0, 1310.0)
+    np.testing.assert_array_equal(aligned["usd_to_krw"].to_numpy(), expected)
+
+
+def test_default_tolerance_is_one_bar():
+    # 허용 오차를 따로 주지 않으면 자정 이후 한 칸만 환율이 붙음 (예전 동작)
+    rates = fx(["2024-03-04"], [1310.0])
+    aligned = align_series({
+        "close": candle_series(candles("2024-03-03 15:00", "1h", 3, 1.0)),
+        "usd_to_krw": daily_series(rates),
+    }, freq="1h", anchor=["close"])
+    np.testing.assert_array_equal(aligned["usd_to_krw"].to_numpy(), [1310.0, np.nan, np.nan])
+
+
+def test_daily_grid_unchanged():
+    aligned = premium_frame("1D", 2, "2024-03-03")
+    # 일봉은 UTC 00:00 = KST 09:00 → 그날 KST 환율
+    np.testing.assert_array_equal(aligned["usd_to_krw"].to_numpy(), [1300.0, 1310.0])
@@ -0,0 +1,45 @@
+import asyncio
+from types import SimpleNamespace
+from translation import TranslationCache, TranslationStage
+
+
+class FakeTranslator:
+    def __init__(self):
+        self.calls = []
+
+    def translate_text(self, texts, source_lang, target_lang):
+        self.calls.append(list(texts))
+        return [SimpleNamespace(text=f"{target_lang}:{text}") for text in texts]
+
+
+def make_stage(linger):
+    return TranslationStage(FakeTranslator(), cache=TranslationCache(path=None), linger=linger)
+
+
+def test_batches_pending_texts():
+    async def run():
+        stage = make_stage(0.05)
+        await stage.start()
+        results = await asyncio.gather(*(stage.translate(text) for text in ["가", "나", "가"]))
+        await stage.stop()
+        return stage, results
+
+    stage, results = asyncio.run(run())
+    assert results == ["ZH-HANT:가", "ZH-HANT:나", "ZH-HANT:가"]
+    assert stage.translator.calls == [["가", "나"]]
+
+
+def test_stop_during_linger_fails_collected_requests():
+    async def run():
+        stage = make_stage(60)
+        await stage.start()
+        pending = [asyncio.create_task(stage.translate(text)) for text in ["가", "나"]]
+        # 배처가 요청을 꺼내 모으는 중 (linger 60초)
+        while not stage.queue.empty():
+            await asyncio.sleep(0)
+        await asyncio.sleep(0.01)
+        await asyncio.wait_for(stage.stop(), 1)
+        return await asyncio.wait_for(asyncio.gather(*pending, return_exceptions=True), 1)
+
+    results = asyncio.run(run())
+    assert [str(result) for result in results] == ["번역 단계 종료", "번역 단계 종료"]
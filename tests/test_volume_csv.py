@@ -0,0 +1,89 @@
+from decimal import Decimal
+import numpy as np
+import pandas as pd
+import pytest
+from volume_csv import cache_path, load_volume_csv, parse_scaled, parse_snapped_at, parse_volume
+
+TIMES = [
+    "2024-02-18 00:00:00 +0000",
+    "2024-02-29 23:59:59 +0000",
+    "2024-03-01 09:00:00 +0900",
+    "2023-12-31 20:30:15 -0530",
+    "1970-01-01 00:00:00 +0000",
+    "1969-12-31 23:59:59 +0000",
+    "2000-02-29 12:00:00 +0100",
+    "2100-03-01 00:00:00 +0000",
+]
+
+
+def test_parse_snapped_at_matches_pandas():
+    expected = pd.DatetimeIndex(pd.to_datetime(TIMES, format="%Y-%m-%d %H:%M:%S %z", utc=True)).as_unit("ns")
+    assert parse_snapped_at(TIMES).equals(expected)
+
+
+def test_parse_snapped_at_falls_back_for_other_formats():
+    values = ["2024-02-18T00:00:00+09:00", "2024-02-19 00:00:00 +0000"]
+    expected = pd.DatetimeIndex(pd.to_datetime(values, format="ISO8601", utc=True)).as_unit("ns")
+    assert parse_snapped_at(values).equals(expected)
+
+
+def test_parse_snapped_at_empty():
+    assert len(parse_snapped_at([])) == 0
+
+
+VOLUMES = ["123.456", "-0.019", "+5", "7.", ".5", "0", "-12.3", "98765432109.123456789012345678901234"]
+
+
+@pytest.mark.parametrize("scale", [0, 2, 6])
+def test_parse_scaled_truncates_like_decimal(scale):
+    # 소수점 아래 scale자리 넘는 부분은 0 쪽으로 버림
+    expected = [int(Decimal(value).scaleb(scale)) for value in VOLUMES]
+    assert parse_scaled(VOLUMES, scale).tolist() == expected
+
+
+def test_parse_scaled_rejects_int64_overflow():
+    with pytest.raises(Exception):
+        parse_scaled(["98765432109876.5"], 6)
+
+
+def test_parse_volume_modes():
+    assert parse_volume(VOLUMES, "float").tolist() == [float(value) for value in VOLUMES]
+    assert parse_volume(VOLUMES, "decimal").tolist() == [Decimal(value) for value in VOLUMES]
+    with pytest.raises(Exception):
+        parse_volume(VOLUMES, "text")
+
+
+def write_csv(path, volumes):
+    rows = [f"{snapped_at},{volume}" for snapped_at, volume in zip(TIMES, volumes)]
+    path.write_text("snapped_at,volume\n" + "\n".join(rows) + "\n")
+
+
+@pytest.mark.parametrize("mode", ["float", "decimal", "scaled"])
+def test_load_volume_csv_cache_round_trip(tmp_path, mode):
+    path = tmp_path / "volume.csv"
+    write_csv(path, VOLUMES)
+    first = load_volume_csv(str(path), mode)
+    assert (tmp_path / cache_path("volume.csv", mode)).exists()
+    cached = load_volume_csv(str(path), mode)
+    pd.testing.assert_frame_equal(first, cached)
+    assert first["snapped_at"].tolist() == parse_snapped_at(TIMES).tolist()
+
+
+def test_load_volume_csv_invalidates_cache_when_csv_changes(tmp_path):
+    path = tmp_path / "volume.csv"
+    write_csv(path, VOLUMES)
+    load_volume_csv(str(path))
+    write_csv(path, ["10"] * len(VOLUMES))
+    assert load_volume_csv(str(path))["volume"].tolist() == [10.0] * len(VOLUMES)
+
+
+def test_load_volume_csv_ignores_corrupt_cache(tmp_path):
+    path = tmp_path / "volume.csv"
+    write_csv(path, VOLUMES)
+    expected = load_volume_csv(str(path))
+    sidecar = tmp_path / cache_path("volume.csv")
+    sidecar.write_bytes(b"not an npz file")
+    pd.testing.assert_frame_equal(load_volume_csv(str(path)), expected)
+    # 깨진 캐시는 다시 만들어짐
+    with np.load(sidecar) as data:
+        assert "__source__" in data
@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+import pytest
+from volume_periods import period_stats, volume_matrix
+
+
+@pytest.fixture
+def volumes():
+    # 두 거래소, 1년 + 며칠 (빈 날 포함)
+    rng = np.random.default_rng(0)
+    index = pd.date_range("2023-02-10", "2024-02-18", freq="D", tz="UTC", name="snapped_at")
+    frame = pd.DataFrame({"Upbit": rng.uniform(1e8, 5e9, len(index)),
+                          "Bithumb": rng.uniform(1e8, 2e9, len(index))}, index=index)
+    frame.iloc[40:45, 1] = np.nan
+    return frame
+
+
+# 예전 final.py 방식: 기간마다 [시작, 시작 + 한 달) 마스크로 평균
+def masked_means(volumes, starts, offset):
+    rows = []
+    for start in starts:
+        mask = (volumes.index >= start) & (volumes.index < start + offset)
+        rows.append(volumes[mask].mean())
+    return pd.DataFrame(rows, index=pd.DatetimeIndex(starts))
+
+
+def test_anchored_months_match_old_masks(volumes):
+    latest = volumes.index.max()
+    anchor = latest - pd.DateOffset(years=1)
+    stats = period_stats(volumes, "month", anchor=anchor, count=12)
+    starts = [anchor + pd.DateOffset(months=i) for i in range(12)]
+    expected = masked_means(volumes, starts, pd.DateOffset(months=1))
+    # 마지막 기간을 뺀 11개는 예전 결과와 같음
+    pd.testing.assert_frame_equal(stats["mean"].iloc[:11], expected.iloc[:11], check_names=False, check_freq=False)
+
+
+def test_anchored_last_period_includes_latest_day(volumes):
+    latest = volumes.index.max()
+    anchor = latest - pd.DateOffset(years=1)
+    stats = period_stats(volumes, "month", anchor=anchor, count=12)
+    last_start = anchor + pd.DateOffset(months=11)
+    # 예전 마스크는 [시작, 시작 + 한 달)이라 마지막 날(latest)이 빠졌음 - 이제는 데이터 끝까지 포함
+    expected = volumes[volumes.index >= last_start].mean()
+    np.testing.assert_allclose(stats["mean"].iloc[-1].to_numpy(), expected.to_numpy())
+    assert latest == last_start + pd.DateOffset(months=1)
+
+
+def test_calendar_months_match_groupby(volumes):
+    stats = period_stats(volumes, "month", count=4)
+    local = volumes.index.tz_localize(None).to_period("M")
+    expected_mean = volumes.groupby(local).mean().tail(4)
+    expected_sum = volumes.groupby(local).sum(min_count=1).tail(4)
+    np.testing.assert_allclose(stats["mean"].to_numpy(), expected_mean.to_numpy())
+    np.testing.assert_allclose(stats["sum"].to_numpy(), expected_sum.to_numpy())
+    assert list(stats.index.month) == [11, 12, 1, 2]
+
+
+def test_share_is_percent_of_mean(volumes):
+    stats = period_stats(volumes, "quarter")
+    share = stats["share"].to_numpy()
+    np.testing.assert_allclose(share.sum(axis=1), 100)
+    mean = stats["mean"].to_numpy()
+    np.testing.assert_allclose(share, mean / mean.sum(axis=1, keepdims=True) * 100)
+
+
+def test_rolling_window(volumes):
+    stats = period_stats(volumes, "7D")
+    expected = volumes.rolling("7D", min_periods=1).mean()
+    pd.testing.assert_frame_equal(stats["mean"], expected)
+
+
+def test_volume_matrix_columns_follow_frames():
+    index = pd.date_range("2024-01-01", periods=3, tz="UTC")
+    frames = {
+        "Upbit": pd.DataFrame({"snapped_at": index, "volume": [1.0, 2.0, 3.0]}),
+        "Coinone": pd.DataFrame({"snapped_at": index[1:], "volume": [5.0, 6.0]}),
+    }
+    matrix = volume_matrix(frames)
+    assert list(matrix.columns) == ["Upbit", "Coinone"]
+    assert matrix.index.name == "snapped_at"
+    assert np.isnan(matrix.iloc[0, 1])
+
+
+def test_anchored_count_stops_at_last_period():
+    # 1년치 데이터에서 3개월만 - 4월 이후 데이터는 3월에 섞이지 않음
+    index = pd.date_range("2024-01-01", "2024-12-31", freq="D", tz="UTC")
+    volumes = pd.DataFrame({"Upbit": np.where(index.month <= 3, 75.0, 300.0)}, index=index)
+    stats = period_stats(volumes, "month", anchor=pd.Timestamp("2024-01-01", tz="UTC"), count=3)
+    assert list(stats.index.month) == [1, 2, 3]
+    np.testing.assert_array_equal(stats["mean"]["Upbit"].to_numpy(), [75.0, 75.0, 75.0])
+    np.testing.assert_array_equal(stats["sum"]["Upbit"].to_numpy(), [75.0 * 31, 75.0 * 29, 75.0 * 31])
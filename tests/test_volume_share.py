@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+from volume_share import align_volumes, normalize_shares
+
+
+def frame(times, volumes, tz="UTC"):
+    return pd.DataFrame({"snapped_at": pd.to_datetime(times).tz_localize(tz), "volume": volumes})
+
+
+# 🔹 예전 방식: 거래소별로 시각 인덱스를 걸고 outer join (같은 시각은 마지막 값)
+def joined(frames):
+    columns = {name: f.drop_duplicates("snapped_at", keep="last").set_index("snapped_at")["volume"]
+               for name, f in frames.items()}
+    return pd.concat(columns, axis=1, join="outer", sort=True)
+
+
+def test_align_matches_outer_join():
+    frames = {
+        "Upbit": frame(["2024-01-03", "2024-01-01", "2024-01-02"], [3.0, 1.0, 2.0]),
+        "Bithumb": frame(["2024-01-02", "2024-01-04"], [20.0, 40.0]),
+        "Coinone": frame(["2024-01-05"], [500.0]),
+    }
+    index, names, matrix = align_volumes(frames)
+    expected = joined(frames)
+    assert names == ["Upbit", "Bithumb", "Coinone"]
+    pd.testing.assert_index_equal(index, expected.index.as_unit("ns"), check_names=False)
+    np.testing.assert_array_equal(matrix, expected.to_numpy())
+
+
+def test_align_duplicate_time_keeps_last():
+    frames = {"Upbit": frame(["2024-01-01", "2024-01-02", "2024-01-01"], [1.0, 2.0, 9.0])}
+    index, _, matrix = align_volumes(frames)
+    assert len(index) == 2
+    np.testing.assert_array_equal(matrix[:, 0], [9.0, 2.0])
+    np.testing.assert_array_equal(matrix, joined(frames).to_numpy())
+
+
+def test_align_keeps_timezone():
+    frames = {
+        "Upbit": frame(["2024-01-01 09:00", "2024-01-02 09:00"], [1.0, 2.0], tz="Asia/Seoul"),
+        "Bithumb": frame(["2024-01-02 09:00"], [3.0], tz="Asia/Seoul"),
+    }
+    index, _, matrix = align_volumes(frames)
+    assert str(index.tz) == "Asia/Seoul"
+    assert list(index.hour) == [9, 9]
+    np.testing.assert_array_equal(matrix[:, 1], [np.nan, 3.0])
+
+
+def test_align_empty_frame():
+    frames = {"Upbit": frame(["2024-01-01"], [1.0]), "Korbit": frame([], [])}
+    index, names, matrix = align_volumes(frames)
+    assert names == ["Upbit", "Korbit"]
+    assert matrix.shape == (1, 2)
+    assert np.isnan(matrix[0, 1])
+
+
+def test_shares_skip_nan_and_zero_rows():
+    matrix = np.array([[1.0, 3.0, np.nan],
+                       [0.0, 0.0, 0.0],
+                       [np.nan, np.nan, np.nan],
+                       [2.0, 2.0, 4.0]])
+    shares = normalize_shares(matrix)
+    expected = pd.DataFrame(matrix).pipe(lambda df: df.div(df.sum(axis=1).where(lambda s: s > 0), axis=0) * 100)
+    np.testing.assert_allclose(shares, expected.to_numpy())
+    np.testing.assert_allclose(shares[0, :2], [25, 75])
+    assert np.isnan(shares[1]).all() and np.isnan(shares[2]).all()
+    np.testing.assert_allclose(np.nansum(shares[[0, 3]], axis=1), 100)
@@ -0,0 +1,99 @@
+import numpy as np
+import pandas as pd
+
+# ✅ 차트 / 표에 보여줄 시간대 (업비트 기준)
+MARKET_TZ = "Asia/Seoul"
+# ✅ 격자 기준 시간대 - 업비트 / 바이낸스 일봉은 둘 다 UTC 00:00 (KST 09:00) 시작
+GRID_TZ = "UTC"
+
+# ✅ 빈칸 채우는 방식
+# none: 허용 오차 안에 값이 없으면 NaN / ffill: 직전 값 유지 / interpolate: 시간 비례 보간 / drop: NaN 있는 행 삭제
+FILL_POLICIES = ("none", "ffill", "interpolate", "drop")
+
+
+# ✅ 시각 → UTC (시간대 없는 시각은 tz 기준으로 봄, 캔들 저장소 timestamp는 UTC)
+def to_utc(timestamps, tz="UTC"):
+    index = pd.DatetimeIndex(timestamps)
+    if index.tz is None:
+        index = index.tz_localize(tz)
+    return index.tz_convert("UTC").as_unit("ms")
+
+
+# ✅ 캔들 표의 한 컬럼 → UTC 시각 인덱스 시리즈
+def candle_series(df, column="close", tz="UTC"):
+    return pd.Series(df[column].to_numpy(), index=to_utc(df['timestamp'], tz), name=column)
+
+
+# ✅ 날짜별 값(환율 등, index=datetime.date) → 그 날짜 tz 자정 시각 인덱스 시리즈
+def daily_series(series, tz=MARKET_TZ):
+    return pd.Series(series.to_numpy(), index=to_utc(pd.to_datetime(series.index), tz), name=series.name)
+
+
+# ✅ 공통 시간 격자 (UTC, grid_tz 기준 freq 경계에 맞춤)
+def time_grid(start, end, freq="1D", grid_tz=GRID_TZ):
+    start = pd.Timestamp(start).tz_convert(grid_tz).floor(freq)
+    end = pd.Timestamp(end).tz_convert(grid_tz)
+    return pd.date_range(start, end, freq=freq).tz_convert("UTC").as_unit("ms")
+
+
+# ✅ 여러 거래소 시리즈를 한 격자에 정렬
+# series: {이름: 시리즈(시각 인덱스)} / 격자 시각마다 그 시각 이전(direction) 가장 가까운 값을 merge_asof로 붙인다.
+# 정렬된 키끼리 한 번씩 훑으므로 시리즈 N개, 격자 G칸이면 O(N·(G + 길이)) - 1년치 1분봉도 바로 끝남.
+# tolerance: 이보다 오래된 값은 없는 것으로 봄 (기본 freq 한 칸) - 값 하나 또는 {이름: 값} (없는 이름은 기본값)
+#   일별 환율처럼 격자보다 드문 시리즈는 그 간격(1D)을 줘야 분봉/시간봉 격자 앞쪽까지 값이 붙음
+# fill: 정책 하나 또는 {이름: 정책}
+# anchor: 격자 범위를 정하는 시리즈 이름 (기본 전체, 환율처럼 길게 받아 둔 보조 시리즈는 빼면 됨)
+# how: union이면 anchor 시리즈 중 하나라도 있는 구간, intersection이면 모두 있는 구간
+# 반환: 격자 시각(tz) 인덱스, 시리즈 이름 컬럼
+def align_series(series, freq="1D", tz=MARKET_TZ, grid_tz=GRID_TZ, start=None, end=None,
+                 tolerance=None, fill="none", limit=None, direction="backward", how="union", anchor=None):
+    series = {name: s[~s.index.isna()].sort_index() for name, s in series.items()}
+    series = {name: s[~s.index.duplicated(keep="last")] for name, s in series.items()}
+    non_empty = [series[name] for name in (anchor or series) if len(series[name])]
+    if not non_empty:
+        return pd.DataFrame(columns=list(series), index=pd.DatetimeIndex([], tz=tz, name="timestamp"))
+    if how == "intersection":
+        # 모든 시리즈가 있는 구간만
+        start = start if start is not None else max(s.index[0] for s in non_empty)
+        end = end if end is not None else min(s.index[-1] for s in non_empty)
+    else:
+        start = start if start is not None else min(s.index[0] for s in non_empty)
+        end = end if end is not None else max(s.index[-1] for s in non_empty)
+    grid = time_grid(to_utc([start])[0], to_utc([end])[0], freq, grid_tz)
+    tolerances = tolerance if isinstance(tolerance, dict) else dict.fromkeys(series, tolerance)
+
+    left = pd.DataFrame({"timestamp": grid})
+    columns = {}
+    for name, s in series.items():
+        right = pd.DataFrame({"timestamp": s.index.as_unit("ms"), "value": s.to_numpy()})
+        joined = pd.merge_asof(left, right, on="timestamp", direction=direction,
+                               tolerance=_tolerance(tolerances.get(name), freq, direction))
+        columns[name] = joined['value'].to_numpy()
+
+    aligned = pd.DataFrame(columns, index=pd.DatetimeIndex(grid, name="timestamp").tz_convert(tz))
+    return fill_gaps(aligned, fill, limit)
+
+
+def _tolerance(tolerance, freq, direction):
+    tolerance = pd.Timedelta(tolerance) if tolerance is not None else pd.Timedelta(freq)
+    # 정확히 한 칸 전 값은 다음 칸에 넘기지 않도록 (같은 봉 안의 값만)
+    if direction == "backward":
+        tolerance -= pd.Timedelta(1, "ms")
+    return tolerance
+
+
+# ✅ 빈칸 채우기 (컬럼별 정책)
+def fill_gaps(aligned, fill="none", limit=None):
+    policies = fill if isinstance(fill, dict) else dict.fromkeys(aligned.columns, fill)
+    for name, policy in policies.items():
+        if policy not in FILL_POLICIES:
+            raise Exception(f"Unknown fill policy for {name}: {policy}")
+        if policy == "ffill":
+            aligned[name] = aligned[name].ffill(limit=limit)
+        elif policy == "interpolate":
+            # 양 끝은 채우지 않고 사이 빈칸만 시간 비례로
+            aligned[name] = aligned[name].interpolate(method="time", limit=limit, limit_area="inside")
+    drop = [name for name, policy in policies.items() if policy == "drop"]
+    if drop:
+        aligned = aligned[np.isfinite(aligned[drop].to_numpy(dtype="float64")).all(axis=1)]
+    return aligned
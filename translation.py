@@ -0,0 +1,208 @@
+import os
+import json
+import time
+import asyncio
+import logging
+from collections import OrderedDict
+from metrics import metrics
+
+
+# 🔹 캐시 키 정규화 (공백 차이만 있는 같은 공지는 같은 키)
+def normalize_text(text):
+    return " ".join(text.split())
+
+
+# 🔹 번역 캐시 (LRU + 파일 저장)
+class TranslationCache:
+    def __init__(self, path="translation_cache.json", max_size=5000, save_every=20):
+        self.path = path
+        self.max_size = max_size
+        self.save_every = save_every
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._unsaved = 0
+        self.load()
+
+    def _key(self, text, target_lang):
+        return f"{target_lang}\x00{normalize_text(text)}"
+
+    def load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+            # 파일에는 오래된 것 → 최근 것 순서로 저장됨
+            for key, value in data[-self.max_size:]:
+                self.entries[key] = value
+            logging.info(f"📚 번역 캐시 로드: {len(self.entries)}개")
+        except (OSError, ValueError) as e:
+            logging.warning(f"⚠️ 번역 캐시 로드 실패: {e}")
+
+    def save(self):
+        if self._write(list(self.entries.items())):
+            self._unsaved = 0
+
+    # 🔹 이벤트 루프 안에서 저장 (목록만 복사하고 파일 쓰기는 스레드에서)
+    async def save_async(self):
+        unsaved, self._unsaved = self._unsaved, 0
+        if not await asyncio.to_thread(self._write, list(self.entries.items())):
+            self._unsaved += unsaved
+
+    def save_due(self):
+        return self._unsaved >= self.save_every
+
+    def _write(self, items):
+        if not self.path:
+            return True
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(items, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+            return True
+        except OSError as e:
+            logging.warning(f"⚠️ 번역 캐시 저장 실패: {e}")
+            return False
+
+    def get(self, text, target_lang, count=True):
+        key = self._key(text, target_lang)
+        value = self.entries.get(key)
+        if value is None:
+            if count:
+                self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        if count:
+            self.hits += 1
+        return value
+
+    def put(self, text, target_lang, translated):
+        key = self._key(text, target_lang)
+        self.entries[key] = translated
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+        # 저장은 save_due()를 보고 호출한 쪽에서 (TranslationStage는 백그라운드로 저장)
+        self._unsaved += 1
+
+    def stats(self):
+        total = self.hits + self.misses
+        hit_rate = self.hits / total if total else 0.0
+        return {"size": len(self.entries), "hits": self.hits, "misses": self.misses, "hit_rate": round(hit_rate, 3)}
+
+
+# 🔹 DeepL 번역 단계
+# 캐시에 있으면 바로 반환하고, 없으면 대기열에 모아 한 번의 다중 텍스트 요청으로 번역한다.
+# DeepL 호출은 스레드에서 실행되므로 이벤트 루프를 막지 않는다.
+class TranslationStage:
+    def __init__(self, translator, source_lang="KO", target_lang="ZH-HANT", cache=None,
+                 max_batch=50, linger=0.05):
+        self.translator = translator
+        self.source_lang = source_lang
+        self.target_lang = target_lang
+        self.cache = cache if cache is not None else TranslationCache()
+        self.max_batch = max_batch
+        self.linger = linger
+        self.api_calls = 0
+        self.queue = asyncio.Queue()
+        self._task = None
+        self._save_task = None
+
+    async def start(self):
+        self._task = asyncio.create_task(self._batcher())
+
+    # 🔹 종료 (아직 번역되지 않은 요청은 예외로 끝냄 → 기다리던 쪽이 멈추지 않음)
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        while not self.queue.empty():
+            self._fail([self.queue.get_nowait()], Exception("번역 단계 종료"))
+        if self._save_task is not None:
+            await asyncio.gather(self._save_task, return_exceptions=True)
+            self._save_task = None
+        await self.cache.save_async()
+        logging.info(f"📚 번역 캐시 통계: {self.cache.stats()} / DeepL 호출 {self.api_calls}회")
+
+    # 🔹 번역 요청 (실패 시 예외 발생)
+    async def translate(self, text):
+        cached = self.cache.get(text, self.target_lang)
+        if cached is not None:
+            logging.info(f"📚 번역 캐시 적중: {cached}")
+            return cached
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((text, future))
+        return await future
+
+    async def _batcher(self):
+        while True:
+            batch = []
+            try:
+                batch.append(await self.queue.get())
+                # 짧게 기다리며 같이 보낼 텍스트를 모음
+                deadline = asyncio.get_running_loop().time() + self.linger
+                while len(batch) < self.max_batch:
+                    timeout = deadline - asyncio.get_running_loop().time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+                await self._translate_batch(batch)
+            finally:
+                # 모으는 중 / 번역 중에 취소되면 꺼낸 요청을 예외로 끝냄 (끝난 요청은 그대로)
+                self._fail(batch, Exception("번역 단계 종료"))
+
+    @staticmethod
+    def _fail(batch, error):
+        for _, future in batch:
+            if not future.done():
+                future.set_exception(error)
+
+    # 🔹 캐시 파일 저장은 백그라운드로 (디스크 쓰기 동안 이벤트 루프를 막지 않음, 한 번에 하나만)
+    def _schedule_save(self):
+        if self.cache.save_due() and (self._save_task is None or self._save_task.done()):
+            self._save_task = asyncio.create_task(self.cache.save_async())
+
+    async def _translate_batch(self, batch):
+        # 같은 배치 안의 중복 텍스트는 한 번만 번역
+        pending = OrderedDict()
+        for text, future in batch:
+            # 대기하는 동안 앞 배치에서 번역된 텍스트
+            cached = self.cache.get(text, self.target_lang, count=False)
+            if cached is not None:
+                if not future.done():
+                    future.set_result(cached)
+                continue
+            pending.setdefault(normalize_text(text), []).append((text, future))
+
+        if not pending:
+            return
+
+        texts = [items[0][0] for items in pending.values()]
+        request_start = time.perf_counter()
+        try:
+            self.api_calls += 1
+            metrics.inc("deepl_calls")
+            results = await asyncio.to_thread(
+                self.translator.translate_text, texts,
+                source_lang=self.source_lang, target_lang=self.target_lang
+            )
+            metrics.observe("deepl_request", time.perf_counter() - request_start)
+        except Exception as e:
+            metrics.inc("deepl_errors")
+            for items in pending.values():
+                self._fail(items, e)
+            return
+
+        logging.info(f"📜 DeepL 일괄 번역: {len(texts)}개 (대기 {len(batch)}개)")
+        for items, result in zip(pending.values(), results):
+            self.cache.put(items[0][0], self.target_lang, result.text)
+            for _, future in items:
+                if not future.done():
+                    future.set_result(result.text)
+        self._schedule_save()
@@ -1,57 +1,48 @@
-import requests
-import matplotlib.pyplot as plt
+import pandas as pd
 import matplotlib.dates as mdates
-from datetime import datetime
+from candle_store import get_candles
+from chart_render import figure_template, show_chart
+from candlestick import plot_candles
 
 def get_xrp_daily_candles():
-    # 업비트 API URL (일봉 데이터 요청)
-    url = "https://api.upbit.com/v1/candles/days"
-    
-    # 파라미터 설정 (리플(XRP)의 마켓 코드는 KRW-XRP, 최대 200개의 데이터 요청)
-    params = {
-        "market": "KRW-XRP",
-        "count": 200  # 최근 200일 데이터
-    }
-    
-    # API 요청
-    response = requests.get(url, params=params)
-    
-    # 응답 확인
-    if response.status_code == 200:
-        data = response.json()
-        return data
-    else:
-        print(f"Error: {response.status_code}")
+    # 로컬 캔들 저장소에서 읽기 (리플(XRP)의 마켓 코드는 KRW-XRP, 최근 200일, 새 봉만 업비트에서 받아옴)
+    try:
+        df = get_candles("upbit", "KRW-XRP", "1d", 200)
+    except Exception as e:
+        print(f"Error: {e}")
         return None
 
+    # 업비트 API 응답과 같은 형식으로 변환 (candle_date_time_kst = UTC 봉 시작 + 9시간)
+    dates = (df['timestamp'] + pd.Timedelta(hours=9)).dt.strftime("%Y-%m-%dT%H:%M:%S")
+    return [
+        {
+            "candle_date_time_kst": date,
+            "opening_price": opening_price,
+            "high_price": high_price,
+            "low_price": low_price,
+            "trade_price": trade_price,
+        }
+        for date, opening_price, high_price, low_price, trade_price
+        in zip(dates, df['open'], df['high'], df['low'], df['close'])
+    ]
+
 def plot_daily_candles(candles):
-    # 데이터 파싱
-    dates = [datetime.strptime(candle['candle_date_time_kst'], "%Y-%m-%dT%H:%M:%S") for candle in candles]
+    # 데이터 파싱 (배열로 한 번에)
+    dates = pd.to_datetime([candle['candle_date_time_kst'] for candle in candles], format="%Y-%m-%dT%H:%M:%S")
     opening_prices = [candle['opening_price'] for candle in candles]
     closing_prices = [candle['trade_price'] for candle in candles]
     high_prices = [candle['high_price'] for candle in candles]
     low_prices = [candle['low_price'] for candle in candles]
 
     # 차트 그리기
-    fig, ax = plt.subplots(figsize=(12, 6))
+    fig, ax = figure_template('candles', figsize=(12, 6))
     ax.set_title("XRP Daily Candlestick Chart (Upbit)")
     ax.set_xlabel("Date")
     ax.set_ylabel("Price (KRW)")
 
-    # 캔들스틱 그리기 (barplot으로 색상 적용)
-    for i in range(len(dates)):
-        # 양봉 (상승) - 초록색
-        if opening_prices[i] < closing_prices[i]:
-            ax.bar(dates[i], closing_prices[i] - opening_prices[i], bottom=opening_prices[i], width=0.8, color='#66FF66', alpha=0.7)
-        # 음봉 (하락) - 빨간색
-        elif opening_prices[i] > closing_prices[i]:
-            ax.bar(dates[i], opening_prices[i] - closing_prices[i], bottom=closing_prices[i], width=0.8, color='#FF6347', alpha=0.7)
-        # 보합 (시가와 종가가 같을 때) - 금색
-        else:
-            ax.bar(dates[i], closing_prices[i] - opening_prices[i], bottom=opening_prices[i], width=0.8, color='#FFD700', alpha=0.7)
-
-        # 캔들의 위아래 "꼬리"를 그리기 위해
-        ax.plot([dates[i], dates[i]], [low_prices[i], high_prices[i]], color='black', linewidth=1)
+    # 캔들스틱 그리기 (양봉 초록 / 음봉 빨강 / 보합 금색, 꼬리는 검정 - 몸통/꼬리 각각 collection 하나)
+    plot_candles(ax, dates, opening_prices, high_prices, low_prices, closing_prices, width=0.8,
+                 wick_color='black', alpha=0.7)
 
     # 날짜 형식 설정
     ax.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m-%d'))
@@ -59,7 +50,7 @@ def plot_daily_candles(candles):
     fig.autofmt_xdate()  # 날짜 레이블 회전
 
     ax.grid(True)
-    plt.show()
+    show_chart('upbit_xrp_candles', fig)
 
 # 일봉 데이터 가져오기
 candles = get_xrp_daily_candles()
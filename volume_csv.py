@@ -0,0 +1,143 @@
+import os
+import tempfile
+from decimal import Decimal
+import numpy as np
+import pandas as pd
+
+# ✅ 거래량 CSV 형식 (snapped_at,volume / "2024-02-18 00:00:00 +0000", 소수점 아래 20자리 넘는 거래량)
+TIME_COLUMN = "snapped_at"
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S %z"
+
+# ✅ 거래량 읽는 방식
+# float: float64 (차트용, 기본) / decimal: Decimal 그대로 (정확, 느림) / scaled: int64 정수 (값 x 10^scale, 나머지 버림)
+VOLUME_MODES = ("float", "decimal", "scaled")
+VOLUME_SCALE = 2
+
+# 파싱한 결과를 CSV 옆에 .npz로 저장해 두고, CSV가 바뀌지 않았으면 그대로 읽음
+VOLUME_CACHE = True
+
+
+# 고정 형식에서 구분자 위치 (YYYY-MM-DD HH:MM:SS +HHMM)
+TIME_SEPARATORS = {4: "-", 7: "-", 10: " ", 13: ":", 16: ":", 19: " "}
+
+
+# ✅ "2024-02-18 00:00:00 +0000" → UTC 시각
+# 형식이 고정이라 바이트 자리로 숫자를 꺼내 날짜 → 일수 공식으로 한 번에 계산 (문자열마다 strptime 하지 않음)
+def parse_snapped_at(values):
+    values = pd.Series(values, dtype=object)
+    if not len(values):
+        return pd.DatetimeIndex([], tz="UTC").as_unit("ns")
+    v = None
+    if values.str.len().eq(25).all() and values.str.isascii().all():
+        v = values.to_numpy(dtype=object).astype("S25").view(np.uint8).reshape(-1, 25)
+    if v is None or any((v[:, i] != ord(c)).any() for i, c in TIME_SEPARATORS.items()):
+        # 형식이 다른 줄이 있으면 일반 파서로
+        return pd.DatetimeIndex(pd.to_datetime(values, format="ISO8601", utc=True)).as_unit("ns")
+
+    def number(i):
+        return (v[:, i].astype(np.int64) - 48) * 10 + (v[:, i + 1].astype(np.int64) - 48)
+
+    year, month, day = number(0) * 100 + number(2), number(5), number(8)
+    # 1970-01-01부터 일수 (3월 시작 연도로 바꿔 윤년 처리)
+    year = year - (month <= 2)
+    era = year // 400
+    year_of_era = year - era * 400
+    day_of_year = (153 * (month + np.where(month > 2, -3, 9)) + 2) // 5 + day - 1
+    days = era * 146097 + year_of_era * 365 + year_of_era // 4 - year_of_era // 100 + day_of_year - 719468
+    seconds = days * 86400 + number(11) * 3600 + number(14) * 60 + number(17)
+    # 시간대 (+0900 → 9시간 빼서 UTC)
+    sign = np.where(v[:, 20] == ord("-"), -1, 1)
+    seconds -= sign * (number(21) * 3600 + number(23) * 60)
+    return pd.DatetimeIndex((seconds * 1_000_000_000).view("datetime64[ns]")).tz_localize("UTC")
+
+
+# ✅ 거래량 문자열 → 정수 (값 x 10^scale, 소수점 아래 scale자리 넘는 부분은 버림)
+def parse_scaled(values, scale=VOLUME_SCALE):
+    values = pd.Series(values, dtype="string").str.strip()
+    negative = values.str.startswith("-").to_numpy(dtype=bool)
+    parts = values.str.lstrip("+-").str.partition(".")
+    whole = parts[0].replace("", "0").astype("int64").to_numpy()
+    # int64에 안 들어가는 값은 조용히 넘치지 않도록 (scale을 줄이거나 decimal 모드로)
+    if (whole > np.iinfo("int64").max // 10 ** scale - 1).any():
+        raise Exception(f"Volume too large for scale {scale}: {values[np.argmax(whole)]}")
+    fraction = parts[2].str.slice(0, scale).str.pad(scale, side="right", fillchar="0") if scale else None
+    scaled = whole * 10 ** scale
+    if scale:
+        scaled = scaled + fraction.astype("int64").to_numpy()
+    return np.where(negative, -scaled, scaled)
+
+
+def parse_volume(values, mode="float", scale=VOLUME_SCALE):
+    if mode == "float":
+        return pd.Series(values, dtype="string").astype("float64").to_numpy()
+    if mode == "decimal":
+        return np.array([Decimal(value) for value in values], dtype=object)
+    if mode == "scaled":
+        return parse_scaled(values, scale)
+    raise Exception(f"Unknown volume mode: {mode}")
+
+
+def cache_path(path, mode="float", scale=VOLUME_SCALE):
+    return f"{path}.{mode}{scale if mode == 'scaled' else ''}.npz"
+
+
+# ✅ 거래량 CSV 읽기
+# 반환: snapped_at (UTC 시각) + 거래량 컬럼 (mode에 따라 float64 / Decimal / int64)
+def load_volume_csv(path, mode="float", scale=VOLUME_SCALE, cache=VOLUME_CACHE):
+    if mode not in VOLUME_MODES:
+        raise Exception(f"Unknown volume mode: {mode}")
+    sidecar = cache_path(path, mode, scale)
+    stat = os.stat(path)
+    source = np.array([stat.st_mtime_ns, stat.st_size], dtype="int64")
+    if cache and os.path.exists(sidecar):
+        df = _read_cache(sidecar, source, mode)
+        if df is not None:
+            return df
+
+    # 전부 문자열로 읽고 (자동 추론 없음) 컬럼별로 변환
+    raw = pd.read_csv(path, dtype=str, keep_default_na=False, engine="c")
+    arrays = {TIME_COLUMN: parse_snapped_at(raw[TIME_COLUMN]).asi8}
+    for column in raw.columns.drop(TIME_COLUMN):
+        if mode == "decimal":
+            # Decimal은 원래 문자열로 저장 (다시 읽을 때 텍스트 파싱 없이 Decimal만 만듦)
+            arrays[column] = raw[column].to_numpy(dtype=str)
+        else:
+            arrays[column] = parse_volume(raw[column], mode, scale)
+
+    if cache:
+        _write_cache(sidecar, source, arrays)
+    return _frame_from_arrays(arrays, mode)
+
+
+# 🔹 캐시 읽기 (CSV가 바뀌었거나 파일이 깨졌으면 None → CSV를 다시 파싱)
+def _read_cache(sidecar, source, mode):
+    try:
+        with np.load(sidecar, allow_pickle=False) as data:
+            if np.array_equal(data['__source__'], source):
+                return _frame_from_arrays(data, mode)
+    except Exception:
+        pass
+    return None
+
+
+# 🔹 캐시 쓰기 (프로세스마다 다른 임시 파일에 쓰고 바꿔 넣음, 실패해도 결과에는 영향 없음)
+def _write_cache(sidecar, source, arrays):
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(sidecar) or ".", prefix=os.path.basename(sidecar) + ".",
+                                    suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.savez(f, __source__=source, **arrays)
+        os.replace(tmp_path, sidecar)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _frame_from_arrays(arrays, mode):
+    df = pd.DataFrame({TIME_COLUMN: pd.DatetimeIndex(np.asarray(arrays[TIME_COLUMN]).view("datetime64[ns]")).tz_localize("UTC")})
+    for column in arrays:
+        if column in (TIME_COLUMN, "__source__"):
+            continue
+        values = np.asarray(arrays[column])
+        df[column] = parse_volume(values, mode) if mode == "decimal" else values
+    return df
@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+from volume_share import align_volumes, normalize_shares
+
+# ✅ 달력 기간 → resample 규칙 (기간 시작 시각으로 표시)
+PERIOD_FREQS = {
+    "day": "D",
+    "week": "W-MON",
+    "month": "MS",
+    "quarter": "QS",
+    "year": "YS",
+}
+# ✅ 기준일부터 세는 기간 (예: 1년 전 오늘부터 한 달씩)
+PERIOD_OFFSETS = {
+    "day": pd.DateOffset(days=1),
+    "week": pd.DateOffset(weeks=1),
+    "month": pd.DateOffset(months=1),
+    "quarter": pd.DateOffset(months=3),
+    "year": pd.DateOffset(years=1),
+}
+
+
+# ✅ 거래소별 거래량 표 → 시각 x 거래소 표 (없는 시각은 NaN, volume_share.align_volumes 행렬)
+# frames: {거래소 이름: DataFrame(time_column, column)}
+def volume_matrix(frames, column="volume", time_column="snapped_at"):
+    index, names, matrix = align_volumes(frames, column, time_column)
+    return pd.DataFrame(matrix, index=pd.DatetimeIndex(index, name=time_column), columns=names)
+
+
+# ✅ 기간별 거래소 평균 / 합계 / 점유율 (한 번 훑어서 계산)
+# period: day / week / month / quarter / year (달력 기준), 또는 "7D" 같은 길이 (이동 창, 시각마다 직전 N일)
+# anchor: 주면 달력 대신 anchor부터 period씩 끊음 (끝 시각이 데이터 마지막 시각이면 마지막 기간에 포함)
+# count: 최근 count개 기간만 (anchor가 있으면 anchor부터 count개)
+# share: 기간 평균 거래량 기준 점유율 (%) - 파이 차트 비율과 같음
+# 반환: 컬럼 (통계, 거래소), 인덱스 기간 시작 시각
+def period_stats(volumes, period="month", anchor=None, count=None):
+    volumes = volumes.astype("float64")
+    if period not in PERIOD_FREQS:
+        window = volumes.rolling(period, min_periods=1)
+        mean, total = window.mean(), window.sum()
+    elif anchor is not None:
+        mean, total = _anchored_stats(volumes, PERIOD_OFFSETS[period], pd.Timestamp(anchor), count)
+    else:
+        grouped = volumes.resample(PERIOD_FREQS[period], closed="left", label="left")
+        mean, total = grouped.mean(), grouped.sum(min_count=1)
+        if count:
+            mean, total = mean.tail(count), total.tail(count)
+    share = pd.DataFrame(normalize_shares(mean.to_numpy()), index=mean.index, columns=mean.columns)
+    return pd.concat({"mean": mean, "sum": total, "share": share}, axis=1)
+
+
+# 🔹 anchor부터 offset씩 끊은 기간 (구간 번호를 searchsorted로 한 번에 매기고 groupby)
+def _anchored_stats(volumes, offset, anchor, count):
+    if count is None:
+        count = 1
+        while anchor + offset * count <= volumes.index[-1]:
+            count += 1
+    starts = pd.DatetimeIndex([anchor + offset * i for i in range(count)])
+    end = starts[-1] + offset
+    codes = np.searchsorted(starts.as_unit(volumes.index.unit).asi8, volumes.index.asi8, side="right") - 1
+    # 기간은 [시작, 다음 시작) - count 뒤 데이터는 마지막 기간에 넣지 않음
+    # 예외: 마지막 기간 끝 시각이 데이터의 마지막 시각이면 포함 (anchor = 마지막 날 - 1년일 때 마지막 날이 빠지지 않도록,
+    #   예전 final.py / Piechart.py 마스크와 다른 점)
+    inside = (codes >= 0) & ((volumes.index < end) | (volumes.index == end) & (end == volumes.index[-1]))
+    grouped = volumes[inside].groupby(codes[inside])
+    mean = grouped.mean().reindex(range(count))
+    total = grouped.sum(min_count=1).reindex(range(count))
+    mean.index = total.index = starts
+    return mean, total
+
@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+
+# ✅ 거래소별 색 (차트마다 palette로 덮어쓸 수 있음, 목록에 없는 거래소는 DEFAULT_COLORS 순서대로)
+EXCHANGE_COLORS = {
+    "Upbit": "#e74c3c",
+    "Bithumb": "#3498db",
+    "Coinone": "#2ecc71",
+    "Korbit": "#9b59b6",
+    "Binance": "#f1c40f",
+}
+DEFAULT_COLORS = ["#e67e22", "#1abc9c", "#34495e", "#e84393", "#7f8c8d"]
+LINE_MARKERS = ["o", "s", "^", "D", "v", "P"]
+
+
+# ✅ 거래소 N개 거래량 → 공통 시각 인덱스 + (시각 x 거래소) 행렬
+# frames: {거래소 이름: DataFrame(time_column, column)} - 모두 같은 통화(예: USD)여야 함
+# 시각 합집합을 한 번 정렬하고 searchsorted로 자리를 찾아 넣음 (없는 칸은 NaN, 같은 시각이 여러 번이면 마지막 값)
+def align_volumes(frames, column="volume", time_column="snapped_at"):
+    names = list(frames)
+    times = [pd.DatetimeIndex(frames[name][time_column]).as_unit("ns") for name in names]
+    tz = next((t.tz for t in times if len(t)), None)
+    stamps = [t.asi8 for t in times]
+    index = np.sort(np.concatenate(stamps), kind="stable") if stamps else np.array([], dtype="int64")
+    index = index[np.concatenate(([True], index[1:] != index[:-1]))] if len(index) else index
+    matrix = np.full((len(index), len(names)), np.nan)
+    for j, (name, stamp) in enumerate(zip(names, stamps)):
+        matrix[np.searchsorted(index, stamp), j] = frames[name][column].to_numpy(dtype="float64")
+    index = pd.DatetimeIndex(index.view("datetime64[ns]"))
+    if tz is not None:
+        index = index.tz_localize("UTC").tz_convert(tz)
+    return index, names, matrix
+
+
+# ✅ 점유율 (%) - 행마다 합으로 한 번에 나눔 (NaN 칸은 빼고, 합이 0인 행은 NaN)
+def normalize_shares(matrix):
+    matrix = np.asarray(matrix, dtype="float64")
+    totals = np.nansum(matrix, axis=1, keepdims=True)
+    shares = np.full(matrix.shape, np.nan)
+    np.divide(matrix, totals, out=shares, where=totals > 0)
+    return shares * 100
+
+
+def exchange_colors(names, palette=None):
+    palette = {**EXCHANGE_COLORS, **(palette or {})}
+    extra = iter(DEFAULT_COLORS * (len(names) // len(DEFAULT_COLORS) + 1))
+    return [palette[name] if name in palette else next(extra) for name in names]
+
+
+# ✅ 거래량 선 그래프 (거래소마다 선 하나, 빈 칸은 건너뜀)
+def plot_volume_lines(ax, index, names, matrix, palette=None):
+    for j, (name, color) in enumerate(zip(names, exchange_colors(names, palette))):
+        valid = ~np.isnan(matrix[:, j])
+        ax.plot(index[valid], matrix[valid, j], marker=LINE_MARKERS[j % len(LINE_MARKERS)], markersize=3, linestyle='-',
+                linewidth=1.5, alpha=0.8, color=color, label=name)
+
+
+# ✅ 점유율 파이 (가장 큰 조각만 떼어 강조)
+def plot_share_pie(ax, sizes, names, title=None, palette=None, fontsize=13):
+    sizes = np.nan_to_num(np.asarray(sizes, dtype="float64"))
+    explode = np.where((sizes == sizes.max()) & (sizes > 0), 0.05, 0)
+    ax.pie(sizes, labels=names, autopct='%1.1f%%', colors=exchange_colors(names, palette), startangle=140,
+           explode=explode, shadow=True, wedgeprops={'edgecolor': 'black'})
+    if title:
+        ax.set_title(title, fontsize=fontsize, fontweight='bold')
@@ -1,6 +1,7 @@
 from flask import Flask, request, jsonify
 from flask_cors import CORS
 import logging
+from line_recipients import add_group_id
 
 app = Flask(__name__)
 CORS(app)  # CORS 활성화
@@ -26,7 +27,9 @@ def webhook():
             if "source" in event and "groupId" in event["source"]:
                 group_id = event["source"]["groupId"]
                 logging.info(f"🔹 감지된 그룹 ID: {group_id}")
-                # 추가적으로 groupId를 저장하거나 사용할 수 있습니다
+                # 릴레이(telegram.py)가 이 그룹에도 알림을 보내도록 저장
+                if add_group_id(group_id):
+                    logging.info(f"💾 새 그룹 ID 저장: {group_id}")
 
     return jsonify({"status": "ok"}), 200
 